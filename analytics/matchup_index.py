@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+
+# Head-to-head matchup index.
+# Every game is filed under the unordered pair of its two teams, so "every game between A and B",
+# their all-time record, point differential and scorelines come from that pair's own list of games
+# (O(games between them)) instead of a scan over the full games frame.
+#
+# The full history is grouped once with numpy (pair codes + a stable sort); after that append()
+# files new games one at a time and keeps the per-pair totals as running sums, so picking up a
+# load costs O(new games). Teams are keyed on the names as given: pass franchise names to merge
+# relocated and renamed teams.
+
+GAME_COLUMNS = ['game_id', 'season_year', 'round', 'home_team', 'away_team', 'home_score', 'away_score']
+
+# Per-pair running totals, from the point of view of the alphabetically first team
+GAMES, A_WINS, B_WINS, TIES, A_POINTS, B_POINTS = range(6)
+
+class MatchupIndex:
+    def __init__(self):
+        self.games = {column: [] for column in GAME_COLUMNS}  # columnar store, in the order games were added
+        self.positions = {}  # game_id -> row in self.games
+        self.pairs = {}      # (team_a, team_b) with team_a < team_b -> rows of their games
+        self.totals = {}     # (team_a, team_b) -> [games, a_wins, b_wins, ties, a_points, b_points]
+        self.opponents = {}  # team -> set of teams it has played
+
+    # Key of the unordered pair of two teams
+    @staticmethod
+    def pair_key(team, opponent):
+        return (team, opponent) if team <= opponent else (opponent, team)
+
+    # Build the index from a games DataFrame (GAME_COLUMNS; game_id and round optional).
+    # Games without a final score are skipped.
+    @classmethod
+    def from_games(cls, games_df):
+        index = cls()
+        valid = (games_df['home_score'].notna() & games_df['away_score'].notna()).to_numpy()
+        scored = games_df[valid]
+        order = np.argsort(scored['season_year'].to_numpy(), kind='stable')
+        scored = scored.iloc[order]
+
+        n = len(scored)
+        columns = {
+            'game_id': scored['game_id'].to_numpy() if 'game_id' in scored.columns else np.flatnonzero(valid)[order],
+            'season_year': scored['season_year'].to_numpy(dtype=np.int64),
+            'round': scored['round'].astype(str).to_numpy() if 'round' in scored.columns else np.full(n, None),
+            'home_team': scored['home_team'].astype(str).to_numpy(dtype=object),
+            'away_team': scored['away_team'].astype(str).to_numpy(dtype=object),
+            'home_score': scored['home_score'].to_numpy(dtype=np.int64),
+            'away_score': scored['away_score'].to_numpy(dtype=np.int64)
+        }
+        index.games = {name: values.tolist() for name, values in columns.items()}
+        index.positions = {game_id: row for row, game_id in enumerate(index.games['game_id'])}
+
+        # Code every game by its unordered team pair
+        teams, team_codes = np.unique(np.concatenate([columns['home_team'], columns['away_team']]),
+                                      return_inverse=True)
+        home_codes, away_codes = team_codes[:n], team_codes[n:]
+        low, high = np.minimum(home_codes, away_codes), np.maximum(home_codes, away_codes)
+        pair_codes, pair_index = np.unique(low * len(teams) + high, return_inverse=True)
+
+        # Scores from the point of view of the pair's first team, summed per pair
+        home_first = home_codes == low
+        a_points = np.where(home_first, columns['home_score'], columns['away_score'])
+        b_points = np.where(home_first, columns['away_score'], columns['home_score'])
+        n_pairs = len(pair_codes)
+        totals = np.stack([
+            np.bincount(pair_index, minlength=n_pairs),
+            np.bincount(pair_index, weights=a_points > b_points, minlength=n_pairs),
+            np.bincount(pair_index, weights=b_points > a_points, minlength=n_pairs),
+            np.bincount(pair_index, weights=a_points == b_points, minlength=n_pairs),
+            np.bincount(pair_index, weights=a_points, minlength=n_pairs),
+            np.bincount(pair_index, weights=b_points, minlength=n_pairs)
+        ], axis=1).astype(np.int64)
+
+        # Rows of each pair, kept in chronological order by the stable sort
+        rows = np.argsort(pair_index, kind='stable')
+        bounds = np.cumsum(totals[:, GAMES])[:-1]
+        for code, pair_rows, pair_totals in zip(pair_codes.tolist(), np.split(rows, bounds), totals.tolist()):
+            key = (teams[code // len(teams)], teams[code % len(teams)])
+            index.pairs[key] = pair_rows.tolist()
+            index.totals[key] = pair_totals
+            index.opponents.setdefault(key[0], set()).add(key[1])
+            index.opponents.setdefault(key[1], set()).add(key[0])
+        return index
+
+    # File new games. Games whose game_id is already indexed, or without a final score, are ignored.
+    # Returns the number of games added.
+    def append(self, game_ids, season_years, rounds, home_teams, away_teams, home_scores, away_scores):
+        added = 0
+        for game in zip(game_ids, season_years, rounds, home_teams, away_teams, home_scores, away_scores):
+            game_id, season_year, round_type, home_team, away_team, home_score, away_score = game
+            if game_id in self.positions or pd.isna(home_score) or pd.isna(away_score):
+                continue
+            home_team, away_team = str(home_team), str(away_team)
+            home_score, away_score = int(home_score), int(away_score)
+
+            row = len(self.games['game_id'])
+            for name, value in zip(GAME_COLUMNS, (game_id, int(season_year), round_type, home_team, away_team,
+                                                  home_score, away_score)):
+                self.games[name].append(value)
+            self.positions[game_id] = row
+
+            key = self.pair_key(home_team, away_team)
+            a_points, b_points = (home_score, away_score) if key[0] == home_team else (away_score, home_score)
+            self.pairs.setdefault(key, []).append(row)
+            totals = self.totals.setdefault(key, [0] * 6)
+            totals[GAMES] += 1
+            totals[A_WINS] += a_points > b_points
+            totals[B_WINS] += b_points > a_points
+            totals[TIES] += a_points == b_points
+            totals[A_POINTS] += a_points
+            totals[B_POINTS] += b_points
+            self.opponents.setdefault(home_team, set()).add(away_team)
+            self.opponents.setdefault(away_team, set()).add(home_team)
+            added += 1
+        return added
+
+    # File the games of a DataFrame (same columns as from_games)
+    def append_games(self, games_df):
+        rounds = games_df['round'].tolist() if 'round' in games_df.columns else [None] * len(games_df)
+        return self.append(games_df['game_id'].tolist(), games_df['season_year'].tolist(), rounds,
+                           games_df['home_team'].tolist(), games_df['away_team'].tolist(),
+                           games_df['home_score'].tolist(), games_df['away_score'].tolist())
+
+    # Highest game ID indexed so far (new database rows have larger IDs), or None
+    @property
+    def last_game_id(self):
+        return max(self.positions) if self.positions else None
+
+    # Every team that appears in the index
+    @property
+    def teams(self):
+        return sorted(self.opponents)
+
+    # All-time record of `team` against `opponent` (wins, losses, ties and points from team's side)
+    def record(self, team, opponent):
+        key = self.pair_key(team, opponent)
+        games, a_wins, b_wins, ties, a_points, b_points = self.totals.get(key, [0] * 6)
+        if team != key[0]:
+            a_wins, b_wins, a_points, b_points = b_wins, a_wins, b_points, a_points
+        return {
+            'games': games,
+            'wins': a_wins,
+            'losses': b_wins,
+            'ties': ties,
+            'points_for': a_points,
+            'points_against': b_points,
+            'point_differential': a_points - b_points
+        }
+
+    # Every game between two teams in chronological order, with the running record and point
+    # differential from `team`'s side
+    def games_between(self, team, opponent):
+        rows = self.pairs.get(self.pair_key(team, opponent), [])
+        games = pd.DataFrame({name: [self.games[name][row] for row in rows] for name in GAME_COLUMNS},
+                             columns=GAME_COLUMNS)
+        games = games.sort_values('season_year', kind='stable').reset_index(drop=True)
+
+        at_home = (games['home_team'] == team).to_numpy()
+        team_score = np.where(at_home, games['home_score'], games['away_score']).astype(np.int64)
+        opponent_score = np.where(at_home, games['away_score'], games['home_score']).astype(np.int64)
+        games['team_score'] = team_score
+        games['opponent_score'] = opponent_score
+        games['result'] = np.select([team_score > opponent_score, team_score < opponent_score], ['W', 'L'], 'T')
+        games['wins'] = np.cumsum(team_score > opponent_score)
+        games['losses'] = np.cumsum(team_score < opponent_score)
+        games['ties'] = np.cumsum(team_score == opponent_score)
+        games['point_differential'] = np.cumsum(team_score - opponent_score)
+        return games
+
+    # Final scores of the games between two teams (team's score first), most common first;
+    # ties are broken by the season the score first happened
+    def scorelines(self, team, opponent):
+        games = self.games_between(team, opponent)
+        return (games.groupby(['team_score', 'opponent_score'])
+                .agg(games=('game_id', 'size'), first_season=('season_year', 'min'),
+                     last_season=('season_year', 'max'))
+                .reset_index()
+                .sort_values(['games', 'first_season'], ascending=[False, True])
+                .reset_index(drop=True))
+
+    # Record of `team` against every opponent it has played, most frequent opponents first
+    def opponents_of(self, team):
+        records = [dict(opponent=opponent, **self.record(team, opponent))
+                   for opponent in self.opponents.get(team, ())]
+        table = pd.DataFrame(records, columns=['opponent', 'games', 'wins', 'losses', 'ties', 'points_for',
+                                               'points_against', 'point_differential'])
+        return table.sort_values(['games', 'opponent'], ascending=[False, True]).reset_index(drop=True)
@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import argparse
+import numpy as np
+import pandas as pd
+from scorigami_matrix import ScorigamiMatrix
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "pipeline"))
+
+# Batch scorigami checks for whole slates of scores (a week of live scores, a set of projected finals, ...).
+#
+# All pairs are answered with one ScorigamiMatrix.lookup_many() call: counts and first
+# occurrences are read straight out of the precomputed grid with numpy fancy indexing, so
+# checking thousands of pairs costs about as much as checking one.
+#
+# Usage:
+#   python analytics/scorigami_batch.py --snapshot nfl_snapshot --scores 27-20 51-48 3-0
+#   python analytics/scorigami_batch.py --input nfl_data_all_years.json --pairs slate.csv --output checked.csv
+#   cat slate.csv | python analytics/scorigami_batch.py --from-db --pairs - --normalized --format json
+
+RESULT_COLUMNS = ["home_score", "away_score", "count", "is_scorigami", "first_game_id", "first_season_year",
+                  "first_home_team", "first_away_team", "first_home_score", "first_away_score"]
+
+# Function to check many (home, away) score pairs against the games at once.
+# games_df needs season_year, home_team, away_team, home_score and away_score (game_id optional)
+# in chronological order; pass a prebuilt matrix (same normalized view) to reuse it across calls.
+# Returns one row per pair, in input order.
+def check_scorelines(games_df, home_scores, away_scores, normalized=False, matrix=None):
+    if matrix is None:
+        matrix = ScorigamiMatrix.from_games(games_df, normalized=normalized)
+    home_scores = np.asarray(home_scores, dtype=np.int64)
+    away_scores = np.asarray(away_scores, dtype=np.int64)
+    counts, first, _ = matrix.lookup_many(home_scores, away_scores)
+
+    # Details of the first game, gathered with one positional take (row 0 stands in for misses)
+    seen = first >= 0
+    first_rows = games_df.iloc[matrix.rows[np.where(seen, first, 0)]] if len(matrix.rows) else None
+
+    def first_column(name):
+        if first_rows is None:
+            return pd.Series([None] * len(first), dtype=object)
+        values = pd.Series(first_rows[name].to_numpy(), dtype=object)
+        return values.where(seen, None)
+
+    return pd.DataFrame({
+        "home_score": home_scores,
+        "away_score": away_scores,
+        "count": counts,
+        "is_scorigami": counts == 0,
+        "first_game_id": first_column("game_id") if "game_id" in games_df.columns else None,
+        "first_season_year": first_column("season_year"),
+        "first_home_team": first_column("home_team"),
+        "first_away_team": first_column("away_team"),
+        "first_home_score": first_column("home_score"),
+        "first_away_score": first_column("away_score")
+    }, columns=RESULT_COLUMNS)
+
+# Function to load the games DataFrame from a snapshot, an extract.py JSON/NDJSON output or PostgreSQL
+def load_games(snapshot=None, input_file=None, from_db=False):
+    if snapshot:
+        from snapshot import load_snapshot, snapshot_to_frame
+        columns, meta = load_snapshot(snapshot)
+        games_df = snapshot_to_frame(columns, meta)
+    elif from_db:
+        from load import get_db_connection
+        from snapshot import iter_games_from_db
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            games_df = pd.DataFrame(list(iter_games_from_db(cursor)))
+        finally:
+            cursor.close()
+            conn.close()
+    elif os.path.isdir(input_file):
+        from load import iter_games_from_ndjson
+        games_df = pd.DataFrame(list(iter_games_from_ndjson(input_file)))
+    else:
+        from load import load_data_from_json
+        games_df = pd.DataFrame(load_data_from_json(input_file)["games"])
+
+    if "game_id" not in games_df.columns:
+        games_df["game_id"] = np.arange(len(games_df))
+    games_df["season_year"] = games_df["season_year"].astype(np.int64)
+    games_df["home_score"] = pd.to_numeric(games_df["home_score"], errors="coerce")
+    games_df["away_score"] = pd.to_numeric(games_df["away_score"], errors="coerce")
+
+    # "First occurrence" follows row order, so keep seasons in order (stable within a season)
+    return games_df.sort_values("season_year", kind="stable").reset_index(drop=True)
+
+# Function to read score pairs from a CSV ("home,away" per line, optional header) or "-" for stdin
+def read_pairs(path):
+    source = sys.stdin if path == "-" else path
+    pairs = pd.read_csv(source, header=None, names=["home", "away"], usecols=[0, 1], comment="#",
+                        skipinitialspace=True, dtype=str)
+    pairs = pairs[pd.to_numeric(pairs["home"], errors="coerce").notna()]
+    return pairs["home"].astype(np.int64).to_numpy(), pairs["away"].astype(np.int64).to_numpy()
+
+# Function to parse "27-20" style scores given on the command line
+def parse_scores(scores):
+    pairs = [score.split("-") for score in scores]
+    return np.array([int(home) for home, _ in pairs]), np.array([int(away) for _, away in pairs])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check many scorelines for scorigami at once")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--snapshot", help="Snapshot directory written by pipeline/snapshot.py")
+    source.add_argument("--input", default="nfl_data_all_years.json",
+                        help="JSON file or directory of per-season NDJSON files written by extract.py")
+    source.add_argument("--from-db", action="store_true", help="Read games from PostgreSQL")
+    parser.add_argument("--pairs", help="CSV of home,away scores (use - for stdin)")
+    parser.add_argument("--scores", nargs="+", default=[], help="Scores as HOME-AWAY, e.g. 27-20")
+    parser.add_argument("--normalized", action="store_true",
+                        help="Compare winning/losing scores and ignore which side was home")
+    parser.add_argument("--format", choices=["csv", "json"], default="csv", help="Output format")
+    parser.add_argument("--output", help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    if not args.pairs and not args.scores:
+        parser.error("give score pairs with --pairs and/or --scores")
+
+    home_scores, away_scores = parse_scores(args.scores)
+    if args.pairs:
+        file_home, file_away = read_pairs(args.pairs)
+        home_scores = np.concatenate([home_scores, file_home])
+        away_scores = np.concatenate([away_scores, file_away])
+
+    games_df = load_games(args.snapshot, args.input, args.from_db)
+    results = check_scorelines(games_df, home_scores, away_scores, normalized=args.normalized)
+    print(f"Checked {len(results)} scorelines against {len(games_df)} games: "
+          f"{int(results['is_scorigami'].sum())} scorigami", file=sys.stderr)
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            json.dump(results.to_dict(orient="records"), output, indent=2, default=int)
+            output.write("\n")
+        else:
+            results.to_csv(output, index=False)
+    finally:
+        if args.output:
+            output.close()
@@ -0,0 +1,145 @@
+import numpy as np
+
+# Precomputed scorigami lookup engine.
+# Games are bucketed into a dense (score_a, score_b) grid once; afterwards "has X-Y happened?",
+# "how often?", "first/last time?" and the top-N scorelines are plain array reads.
+#
+# Two views are supported:
+#   normalized=False  -> cells are (home_score, away_score)
+#   normalized=True   -> cells are (winning_score, losing_score), ignoring home/away
+
+class ScorigamiMatrix:
+    def __init__(self, home_scores, away_scores, game_ids=None, normalized=False, max_score=None, rows=None):
+        home_scores = np.asarray(home_scores, dtype=np.int64)
+        away_scores = np.asarray(away_scores, dtype=np.int64)
+        if game_ids is None:
+            game_ids = np.arange(len(home_scores))
+        game_ids = np.asarray(game_ids)
+
+        # Row numbers of the games in the source frame (differs from 0..n-1 if rows were dropped)
+        self.rows = np.arange(len(home_scores)) if rows is None else np.asarray(rows)
+
+        if normalized:
+            score_a = np.maximum(home_scores, away_scores)
+            score_b = np.minimum(home_scores, away_scores)
+        else:
+            score_a = home_scores
+            score_b = away_scores
+
+        top_score = int(max(score_a.max(initial=0), score_b.max(initial=0)))
+        self.size = max(top_score, max_score or 0) + 1
+        self.normalized = normalized
+        self.game_ids = game_ids
+        self.total_games = len(game_ids)
+
+        # Flatten (a, b) into a single cell number
+        cells = score_a * self.size + score_b
+        cell_count = self.size * self.size
+
+        # Per-cell game index (CSR layout): positions of each cell's games are contiguous
+        # in `positions`, between offsets[cell] and offsets[cell + 1]. The stable sort keeps
+        # games in their input (chronological) order inside each cell.
+        self.positions = np.argsort(cells, kind="stable")
+        counts_flat = np.bincount(cells, minlength=cell_count)
+        self.offsets = np.zeros(cell_count + 1, dtype=np.int64)
+        np.cumsum(counts_flat, out=self.offsets[1:])
+
+        self.counts = counts_flat.reshape(self.size, self.size)
+
+        # First and last occurring game per cell (-1 where the score never happened)
+        occupied = counts_flat > 0
+        first = np.full(cell_count, -1, dtype=np.int64)
+        last = np.full(cell_count, -1, dtype=np.int64)
+        first[occupied] = self.positions[self.offsets[:-1][occupied]]
+        last[occupied] = self.positions[self.offsets[1:][occupied] - 1]
+        self.first_position = first.reshape(self.size, self.size)
+        self.last_position = last.reshape(self.size, self.size)
+
+        # Scorelines ranked by frequency (ties broken by the order they first occurred)
+        occupied_cells = np.flatnonzero(occupied)
+        order = np.lexsort((first[occupied_cells], -counts_flat[occupied_cells]))
+        self.ranked_cells = occupied_cells[order]
+        self.unique_scorelines = len(occupied_cells)
+
+    # Build the matrix from a games DataFrame (expects home_score, away_score and optionally game_id)
+    @classmethod
+    def from_games(cls, games_df, normalized=False):
+        # Games without a final score (NULL scores) are left out
+        valid = (games_df['home_score'].notna() & games_df['away_score'].notna()).to_numpy()
+        scored = games_df[valid]
+        game_ids = scored['game_id'].to_numpy() if 'game_id' in scored.columns else None
+        return cls(scored['home_score'].to_numpy(), scored['away_score'].to_numpy(), game_ids, normalized,
+                   rows=np.flatnonzero(valid))
+
+    # Map a requested score pair onto this view's cell
+    def cell(self, home_score, away_score):
+        if self.normalized:
+            return max(home_score, away_score), min(home_score, away_score)
+        return home_score, away_score
+
+    def in_range(self, a, b):
+        return 0 <= a < self.size and 0 <= b < self.size
+
+    # Number of games that ended with this score
+    def count(self, home_score, away_score):
+        a, b = self.cell(home_score, away_score)
+        return int(self.counts[a, b]) if self.in_range(a, b) else 0
+
+    # True if the score has never happened (a scorigami)
+    def is_scorigami(self, home_score, away_score):
+        return self.count(home_score, away_score) == 0
+
+    # Positions (into the score arrays the matrix was built from) of every game with this score
+    def positions_for(self, home_score, away_score):
+        a, b = self.cell(home_score, away_score)
+        if not self.in_range(a, b):
+            return self.positions[:0]
+        cell = a * self.size + b
+        return self.positions[self.offsets[cell]:self.offsets[cell + 1]]
+
+    # Row numbers (into the frame the matrix was built from) of every game with this score
+    def rows_for(self, home_score, away_score):
+        return self.rows[self.positions_for(home_score, away_score)]
+
+    # Game IDs of every game with this score, in chronological order
+    def game_ids_for(self, home_score, away_score):
+        return self.game_ids[self.positions_for(home_score, away_score)]
+
+    # Game ID of the first game with this score, or None
+    def first_game(self, home_score, away_score):
+        a, b = self.cell(home_score, away_score)
+        if not self.in_range(a, b) or self.first_position[a, b] < 0:
+            return None
+        return self.game_ids[self.first_position[a, b]]
+
+    # Game ID of the most recent game with this score, or None
+    def last_game(self, home_score, away_score):
+        a, b = self.cell(home_score, away_score)
+        if not self.in_range(a, b) or self.last_position[a, b] < 0:
+            return None
+        return self.game_ids[self.last_position[a, b]]
+
+    # Batch lookup for many score pairs at once (array reads, no per-pair filtering).
+    # Returns (counts, first_positions, last_positions) arrays aligned with the input;
+    # positions are -1 for scores that never happened.
+    def lookup_many(self, home_scores, away_scores):
+        home_scores = np.asarray(home_scores, dtype=np.int64)
+        away_scores = np.asarray(away_scores, dtype=np.int64)
+        if self.normalized:
+            a, b = np.maximum(home_scores, away_scores), np.minimum(home_scores, away_scores)
+        else:
+            a, b = home_scores, away_scores
+
+        inside = (a >= 0) & (a < self.size) & (b >= 0) & (b < self.size)
+        counts = np.zeros(len(a), dtype=np.int64)
+        first = np.full(len(a), -1, dtype=np.int64)
+        last = np.full(len(a), -1, dtype=np.int64)
+        counts[inside] = self.counts[a[inside], b[inside]]
+        first[inside] = self.first_position[a[inside], b[inside]]
+        last[inside] = self.last_position[a[inside], b[inside]]
+        return counts, first, last
+
+    # The n most common scorelines as (score_a, score_b, count) tuples
+    def top_scorelines(self, n=5):
+        cells = self.ranked_cells[:n]
+        return [(int(cell // self.size), int(cell % self.size), int(self.counts.flat[cell])) for cell in cells]
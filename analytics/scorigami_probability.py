@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+
+# Scorigami probability model.
+# Estimates how likely a final score is from empirical scoring distributions instead of
+# exact-match lookups, so never-seen scores get a probability too.
+#
+# On construction every game is bucketed once into points histograms with np.bincount:
+#   league_home / league_away    [era, points]        points scored by home / away teams
+#   points_for / points_against  [team, era, points]  points a team scored / allowed
+# and turned into smoothed distributions (thin team-era histograms are shrunk towards the
+# league distribution of the era, which is itself shrunk towards the all-time distribution).
+#
+# A matchup's final-score grid is the outer product of the home and away points distributions
+# (scores treated as independent), so the whole (0..N) x (0..N) grid -- or a stack of grids for
+# many matchups at once -- comes out of a single vectorized product, never a per-cell loop.
+# Independence would make ties far too common, so each grid's diagonal is rescaled to the
+# era's observed tie rate.
+#
+# Eras are blocks of `era_length` seasons aligned to multiples of it (1990-1999, 2000-2009, ...).
+
+class ScorigamiProbability:
+    def __init__(self, season_years, home_teams, away_teams, home_scores, away_scores, era_length=10,
+                 max_score=None, prior_weight=20.0):
+        season_years = np.asarray(season_years, dtype=np.int64)
+        home_scores = np.asarray(home_scores, dtype=np.float64)
+        away_scores = np.asarray(away_scores, dtype=np.float64)
+        home_teams = np.asarray(home_teams, dtype=object)
+        away_teams = np.asarray(away_teams, dtype=object)
+
+        # Games without a final score are left out
+        scored = ~(np.isnan(home_scores) | np.isnan(away_scores))
+        season_years, home_teams, away_teams = season_years[scored], home_teams[scored], away_teams[scored]
+        home_scores = home_scores[scored].astype(np.int64)
+        away_scores = away_scores[scored].astype(np.int64)
+
+        top_score = int(max(home_scores.max(initial=0), away_scores.max(initial=0)))
+        self.size = max(top_score, max_score or 0) + 1
+        self.era_length = era_length
+        self.prior_weight = prior_weight
+
+        self.eras, era_index = np.unique(season_years // era_length * era_length, return_inverse=True)
+        team_names, team_index = np.unique(np.concatenate([home_teams, away_teams]), return_inverse=True)
+        self.teams = list(team_names)
+        self.team_positions = {team: i for i, team in enumerate(self.teams)}
+        n_eras, n_teams, n_games = len(self.eras), len(self.teams), len(home_scores)
+
+        # Histogram of `scores` per key, as a (n_keys, size) array
+        def histogram(keys, scores, n_keys):
+            return np.bincount(keys * self.size + scores, minlength=n_keys * self.size).reshape(n_keys, self.size)
+
+        self.league_home = histogram(era_index, home_scores, n_eras)
+        self.league_away = histogram(era_index, away_scores, n_eras)
+
+        team_era = team_index * n_eras + np.concatenate([era_index, era_index])
+        self.points_for = histogram(team_era, np.concatenate([home_scores, away_scores]),
+                                    n_teams * n_eras).reshape(n_teams, n_eras, self.size)
+        self.points_against = histogram(team_era, np.concatenate([away_scores, home_scores]),
+                                        n_teams * n_eras).reshape(n_teams, n_eras, self.size)
+        self.total_games = n_games
+
+        # Smoothed distributions: all-time -> league per era -> team per era
+        all_time = self.league_home.sum(axis=0) + self.league_away.sum(axis=0)
+        all_time_p = all_time / max(all_time.sum(), 1)
+        league_points = self.league_home + self.league_away
+        self.league_points_p = self.smooth(league_points, all_time_p)
+        self.league_home_p = self.smooth(self.league_home, all_time_p)
+        self.league_away_p = self.smooth(self.league_away, all_time_p)
+        self.points_for_p = self.smooth(self.points_for, self.league_points_p[np.newaxis])
+        self.points_against_p = self.smooth(self.points_against, self.league_points_p[np.newaxis])
+
+        # Share of tied games per era (smoothed towards the all-time rate)
+        ties = np.bincount(era_index, weights=home_scores == away_scores, minlength=n_eras)
+        games_per_era = np.bincount(era_index, minlength=n_eras)
+        all_time_tie_rate = ties.sum() / max(n_games, 1)
+        self.tie_rate = (ties + self.prior_weight * all_time_tie_rate) / (games_per_era + self.prior_weight)
+
+    # Additive smoothing of histograms (last axis = points) towards a prior distribution
+    def smooth(self, counts, prior):
+        totals = counts.sum(axis=-1, keepdims=True)
+        return (counts + self.prior_weight * prior) / (totals + self.prior_weight)
+
+    # Build the model from a games DataFrame (season_year, home_team, away_team, home_score, away_score).
+    # Pass franchise names as home_team / away_team to merge relocated and renamed teams.
+    @classmethod
+    def from_games(cls, games_df, **kwargs):
+        return cls(
+            games_df['season_year'].to_numpy(),
+            games_df['home_team'].to_numpy(),
+            games_df['away_team'].to_numpy(),
+            pd.to_numeric(games_df['home_score']).to_numpy(),
+            pd.to_numeric(games_df['away_score']).to_numpy(),
+            **kwargs
+        )
+
+    # Index of the era containing a season (the latest era when season_year is None)
+    def era_index(self, season_year=None):
+        if season_year is None:
+            return len(self.eras) - 1
+        era = season_year // self.era_length * self.era_length
+        index = int(np.searchsorted(self.eras, era))
+        if index == len(self.eras) or self.eras[index] != era:
+            raise KeyError(f"No games in the {era}s era")
+        return index
+
+    # Points distributions of the home and away side, stacked for a batch of matchups.
+    # A side without a team uses the league distribution for home / away teams in the era;
+    # a team's side averages its own scoring with what the opponent allows.
+    def side_distributions(self, home_teams, away_teams, season_year=None):
+        era = self.era_index(season_year)
+        home = np.tile(self.league_home_p[era], (len(home_teams), 1))
+        away = np.tile(self.league_away_p[era], (len(away_teams), 1))
+
+        for i, (home_team, away_team) in enumerate(zip(home_teams, away_teams)):
+            home_index = self.team_positions[home_team] if home_team is not None else None
+            away_index = self.team_positions[away_team] if away_team is not None else None
+            if home_index is not None and away_index is not None:
+                home[i] = (self.points_for_p[home_index, era] + self.points_against_p[away_index, era]) / 2
+                away[i] = (self.points_for_p[away_index, era] + self.points_against_p[home_index, era]) / 2
+            elif home_index is not None:
+                home[i] = self.points_for_p[home_index, era]
+            elif away_index is not None:
+                away[i] = self.points_for_p[away_index, era]
+        return home, away
+
+    # Fold (home, away) grids onto (winning, losing) cells: P(a, b) = P(a, b) + P(b, a) for a > b
+    def fold(self, grids):
+        folded = np.tril(grids + np.swapaxes(grids, -1, -2))
+        diagonal = np.arange(self.size)
+        folded[..., diagonal, diagonal] = grids[..., diagonal, diagonal]
+        return folded
+
+    # Final-score probability grids for many matchups at once: shape (matchups, size, size),
+    # indexed [..., home_score, away_score] (or [..., winning, losing] when normalized=True).
+    # Use None for a side to get the league-wide distribution of that side.
+    def grids(self, home_teams, away_teams, season_year=None, normalized=False):
+        home, away = self.side_distributions(list(home_teams), list(away_teams), season_year)
+        grids = np.einsum('mi,mj->mij', home, away)
+
+        # Give the diagonal (ties) the era's tie rate and scale the rest so each grid still sums to 1
+        tie_rate = self.tie_rate[self.era_index(season_year)]
+        diagonal = np.arange(self.size)
+        model_ties = grids[:, diagonal, diagonal].sum(axis=1)[:, np.newaxis, np.newaxis]
+        grids *= (1 - tie_rate) / (1 - model_ties)
+        grids[:, diagonal, diagonal] *= tie_rate * (1 - model_ties[:, :, 0]) / ((1 - tie_rate) * model_ties[:, :, 0])
+        return self.fold(grids) if normalized else grids
+
+    # Final-score probability grid for one matchup (league-wide when no teams are given)
+    def grid(self, home_team=None, away_team=None, season_year=None, normalized=False):
+        return self.grids([home_team], [away_team], season_year, normalized)[0]
+
+    # Probability of one final score
+    def probability(self, home_score, away_score, home_team=None, away_team=None, season_year=None,
+                    normalized=False):
+        if normalized:
+            home_score, away_score = max(home_score, away_score), min(home_score, away_score)
+        if not (0 <= home_score < self.size and 0 <= away_score < self.size):
+            return 0.0
+        return float(self.grid(home_team, away_team, season_year, normalized)[home_score, away_score])
+
+    # Boolean (size, size) mask of the cells a ScorigamiMatrix has never seen
+    def unseen_mask(self, matrix):
+        seen = np.zeros((self.size, self.size), dtype=bool)
+        k = min(self.size, matrix.size)
+        seen[:k, :k] = matrix.counts[:k, :k] > 0
+        return ~seen
+
+    # Probability that a game ends in a never-seen score, for one grid or a stack of grids.
+    # The matrix must use the same view (normalized or not) as the grids.
+    def scorigami_chance(self, grids, matrix):
+        return (grids * self.unseen_mask(matrix)).sum(axis=(-2, -1))
+
+    # The n most likely never-seen scores of a grid as (score_a, score_b, probability)
+    def likely_scorigamis(self, grid, matrix, n=5):
+        masked = np.where(self.unseen_mask(matrix), grid, 0.0).ravel()
+        cells = np.argsort(masked)[::-1][:n]
+        return [(int(cell // self.size), int(cell % self.size), float(masked[cell])) for cell in cells
+                if masked[cell] > 0]
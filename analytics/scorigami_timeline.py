@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+
+# Scorigami timeline engine.
+# Replays games in chronological order and records, for every game, whether its final score
+# had ever happened before (i.e. whether the game was a scorigami at that point in history),
+# plus per-season counts of games, scorigamis and the cumulative number of unique scorelines.
+#
+# The full history is replayed once with vectorized numpy (the first occurrence of each cell is
+# a scorigami); after that append() only looks at the new games, so adding a week of results
+# costs O(new games). Games must be appended in chronological order.
+#
+# Like ScorigamiMatrix, normalized=True compares (winning, losing) scores and ignores home/away.
+
+class ScorigamiTimeline:
+    def __init__(self, normalized=False):
+        self.normalized = normalized
+
+        # Per-game replay, in chronological order
+        self.game_ids = []
+        self.season_years = []
+        self.scorigami_flags = []
+        self.positions = {}  # game_id -> index in the lists above
+
+        # (score_a, score_b) -> game_id of the first game with that scoreline
+        self.first_games = {}
+
+        # season_year -> [games, scorigamis], kept in season order
+        self.seasons = {}
+
+    # Map a score pair onto this view's cell
+    def cell(self, home_score, away_score):
+        if self.normalized:
+            return max(home_score, away_score), min(home_score, away_score)
+        return home_score, away_score
+
+    # Build the timeline from a games DataFrame in chronological order
+    # (season_year, home_score, away_score and optionally game_id). Games without a final score are skipped.
+    @classmethod
+    def from_games(cls, games_df, normalized=False):
+        timeline = cls(normalized)
+        valid = (games_df['home_score'].notna() & games_df['away_score'].notna()).to_numpy()
+        scored = games_df[valid]
+        game_ids = scored['game_id'].to_numpy() if 'game_id' in scored.columns else np.flatnonzero(valid)
+
+        # Within a season the input order is kept (stable sort)
+        order = np.argsort(scored['season_year'].to_numpy(), kind='stable')
+        scored, game_ids = scored.iloc[order], game_ids[order]
+        timeline.replay(
+            scored['season_year'].to_numpy(dtype=np.int64),
+            scored['home_score'].to_numpy(dtype=np.int64),
+            scored['away_score'].to_numpy(dtype=np.int64),
+            game_ids
+        )
+        return timeline
+
+    # Vectorized replay of a block of games onto an empty timeline
+    def replay(self, season_years, home_scores, away_scores, game_ids):
+        if self.game_ids:
+            raise ValueError("replay() builds a new timeline; use append() to add games")
+        if len(season_years) and np.any(np.diff(season_years) < 0):
+            raise ValueError("Games must be in chronological (season) order")
+
+        if self.normalized:
+            score_a = np.maximum(home_scores, away_scores)
+            score_b = np.minimum(home_scores, away_scores)
+        else:
+            score_a, score_b = home_scores, away_scores
+
+        # The first game in each cell is the scorigami; np.unique returns the first index per cell
+        size = int(max(score_a.max(initial=0), score_b.max(initial=0))) + 1
+        cells = score_a * size + score_b
+        _, first_index = np.unique(cells, return_index=True)
+        flags = np.zeros(len(cells), dtype=bool)
+        flags[first_index] = True
+
+        self.game_ids = game_ids.tolist()
+        self.season_years = season_years.tolist()
+        self.scorigami_flags = flags.tolist()
+        self.positions = {game_id: i for i, game_id in enumerate(self.game_ids)}
+        self.first_games = {(int(score_a[i]), int(score_b[i])): self.game_ids[i] for i in first_index}
+
+        # Per-season games and scorigamis (season_years is sorted, so seasons stay ordered)
+        years, season_index = np.unique(season_years, return_inverse=True)
+        games = np.bincount(season_index, minlength=len(years))
+        scorigamis = np.bincount(season_index, weights=flags, minlength=len(years)).astype(np.int64)
+        self.seasons = {int(year): [int(g), int(s)] for year, g, s in zip(years, games, scorigamis)}
+
+    # Append games played after everything already in the timeline, in chronological order.
+    # Games whose game_id is already in the timeline are ignored, so re-appending is harmless.
+    # Returns the game IDs of the new games that were scorigamis.
+    def append(self, season_years, home_scores, away_scores, game_ids):
+        latest = self.season_years[-1] if self.season_years else None
+        new_scorigamis = []
+
+        for year, home_score, away_score, game_id in zip(season_years, home_scores, away_scores, game_ids):
+            if game_id in self.positions:
+                continue
+            year = int(year)
+            if latest is not None and year < latest:
+                raise ValueError(f"Season {year} is older than the timeline's latest season {latest}; rebuild instead")
+            latest = year
+
+            cell = self.cell(int(home_score), int(away_score))
+            is_scorigami = cell not in self.first_games
+            if is_scorigami:
+                self.first_games[cell] = game_id
+                new_scorigamis.append(game_id)
+
+            self.positions[game_id] = len(self.game_ids)
+            self.game_ids.append(game_id)
+            self.season_years.append(year)
+            self.scorigami_flags.append(is_scorigami)
+
+            season = self.seasons.setdefault(year, [0, 0])
+            season[0] += 1
+            season[1] += is_scorigami
+
+        return new_scorigamis
+
+    # Append the games of a DataFrame (same columns as from_games)
+    def append_games(self, games_df):
+        scored = games_df[games_df['home_score'].notna() & games_df['away_score'].notna()]
+        return self.append(scored['season_year'].tolist(), scored['home_score'].tolist(),
+                           scored['away_score'].tolist(), scored['game_id'].tolist())
+
+    # Number of distinct scorelines so far
+    @property
+    def unique_scorelines(self):
+        return len(self.first_games)
+
+    # Highest game ID replayed so far (new database rows have larger IDs), or None
+    @property
+    def last_game_id(self):
+        return max(self.positions) if self.positions else None
+
+    # True if the score has never happened so far
+    def is_scorigami(self, home_score, away_score):
+        return self.cell(home_score, away_score) not in self.first_games
+
+    # Game ID of the first game with this score, or None
+    def first_game(self, home_score, away_score):
+        return self.first_games.get(self.cell(home_score, away_score))
+
+    # True if the game was a scorigami when it was played (KeyError for unknown games)
+    def was_scorigami(self, game_id):
+        return self.scorigami_flags[self.positions[game_id]]
+
+    # Game IDs of the scorigamis of one season, in the order they happened
+    def scorigamis_in(self, season_year):
+        return [game_id for game_id, year, flag in zip(self.game_ids, self.season_years, self.scorigami_flags)
+                if flag and year == season_year]
+
+    # Per-game replay as a DataFrame (game_id, season_year, is_scorigami)
+    def games(self):
+        return pd.DataFrame({
+            'game_id': self.game_ids,
+            'season_year': self.season_years,
+            'is_scorigami': self.scorigami_flags
+        })
+
+    # Per-season table: games, scorigamis and unique scorelines at the end of the season
+    def season_table(self):
+        years = sorted(self.seasons)
+        games = [self.seasons[year][0] for year in years]
+        scorigamis = [self.seasons[year][1] for year in years]
+        return pd.DataFrame({
+            'season_year': years,
+            'games': games,
+            'scorigamis': scorigamis,
+            'cumulative_unique_scorelines': np.cumsum(scorigamis, dtype=np.int64)
+        }).set_index('season_year')
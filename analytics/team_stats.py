@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+
+# Vectorized team statistics engine.
+# Every game is turned into two team-perspective rows (home and away) and all per-franchise,
+# per-season totals are produced with a handful of np.bincount calls over a combined
+# (franchise, season) key -- no per-row Python and no per-team filtering. The resulting table
+# is indexed by (franchise_id, season_year), so looking up a franchise is a slice, not a recompute.
+# Teams are keyed on the integer franchise_id (see pipeline/franchises.py), so relocated and
+# renamed teams are already merged and no names are compared.
+# With a database the same table comes straight from the franchise_season_records and
+# franchise_playoff_records views (from_records), so no per-game rows are transferred.
+
+PLAYOFF_ROUNDS = ['Wild Card Round', 'Divisional Round', 'Championship Round', 'Super Bowl']
+
+# Columns of the per-season table (indexed by franchise_id and season_year)
+TABLE_COLUMNS = ['games', 'wins', 'losses', 'ties', 'points_for', 'points_against', 'win_percentage',
+                 'regular_season_wins', 'playoff_wins', 'playoff_losses', 'super_bowl_appearance', 'super_bowl_win']
+
+class TeamStats:
+    # Wrap a per-season table (TABLE_COLUMNS, indexed by franchise_id and season_year, sorted)
+    def __init__(self, table):
+        self.table = table
+        self.franchise_ids = [int(franchise_id) for franchise_id in table.index.get_level_values('franchise_id').unique()]
+
+        # One summary row per franchise
+        summary = self.table.groupby(level='franchise_id').agg(
+            games=('games', 'sum'),
+            wins=('wins', 'sum'),
+            losses=('losses', 'sum'),
+            ties=('ties', 'sum'),
+            points_for=('points_for', 'sum'),
+            points_against=('points_against', 'sum'),
+            playoff_wins=('playoff_wins', 'sum'),
+            playoff_losses=('playoff_losses', 'sum'),
+            super_bowl_appearances=('super_bowl_appearance', 'sum'),
+            super_bowl_wins=('super_bowl_win', 'sum')
+        )
+        best = self.table['regular_season_wins'].groupby(level='franchise_id').idxmax()
+        summary['best_season'] = [key[1] for key in best]
+        summary['best_season_wins'] = self.table['regular_season_wins'].loc[best.tolist()].to_numpy()
+        self.summary = summary
+
+    # Build the stats from per-game arrays
+    @classmethod
+    def from_arrays(cls, season_years, home_franchise_ids, away_franchise_ids, home_scores, away_scores, rounds):
+        season_years = np.asarray(season_years, dtype=np.int64)
+        home_scores = np.asarray(home_scores, dtype=np.float64)
+        away_scores = np.asarray(away_scores, dtype=np.float64)
+        rounds = np.asarray(rounds, dtype=object)
+
+        # Team-perspective arrays: first all home rows, then all away rows
+        franchises = np.concatenate([np.asarray(home_franchise_ids, dtype=np.int64),
+                                     np.asarray(away_franchise_ids, dtype=np.int64)])
+        years = np.concatenate([season_years, season_years])
+        points_for = np.concatenate([home_scores, away_scores])
+        points_against = np.concatenate([away_scores, home_scores])
+        game_rounds = np.concatenate([rounds, rounds])
+
+        # Games without a final score don't count towards records
+        scored = ~(np.isnan(points_for) | np.isnan(points_against))
+        franchises, years = franchises[scored], years[scored]
+        points_for, points_against, game_rounds = points_for[scored], points_against[scored], game_rounds[scored]
+
+        win = points_for > points_against
+        loss = points_for < points_against
+        tie = points_for == points_against
+        regular = game_rounds == 'Regular Season'
+        playoff = np.isin(game_rounds, PLAYOFF_ROUNDS)
+        super_bowl = game_rounds == 'Super Bowl'
+
+        # Combined (franchise, season) key
+        franchise_list, franchise_index = np.unique(franchises, return_inverse=True)
+        season_list, season_index = np.unique(years, return_inverse=True)
+        keys = franchise_index * len(season_list) + season_index
+        unique_keys, key_index = np.unique(keys, return_inverse=True)
+
+        def total(weights):
+            return np.bincount(key_index, weights=weights, minlength=len(unique_keys))
+
+        games = total(None).astype(np.int64)
+        wins = total(win).astype(np.int64)
+        table = pd.DataFrame({
+            'franchise_id': franchise_list[unique_keys // len(season_list)],
+            'season_year': season_list[unique_keys % len(season_list)],
+            'games': games,
+            'wins': wins,
+            'losses': total(loss).astype(np.int64),
+            'ties': total(tie).astype(np.int64),
+            'points_for': total(points_for).astype(np.int64),
+            'points_against': total(points_against).astype(np.int64),
+            'win_percentage': wins / games,
+            'regular_season_wins': total(regular & win).astype(np.int64),
+            'playoff_wins': total(playoff & win).astype(np.int64),
+            'playoff_losses': total(playoff & loss).astype(np.int64),
+            'super_bowl_appearance': total(super_bowl) > 0,
+            'super_bowl_win': total(super_bowl & win) > 0
+        })
+
+        # Keys are sorted by franchise then season, so the index is already lexsorted
+        return cls(table.set_index(['franchise_id', 'season_year']))
+
+    # Build the stats from the database aggregates: season_records has one row per franchise, season
+    # and season type (franchise_id, season_year, season_type, games, wins, losses, ties, points_for,
+    # points_against), playoff_records one row per franchise (franchise_id, super_bowl_years,
+    # super_bowl_win_years)
+    @classmethod
+    def from_records(cls, season_records, playoff_records):
+        key = ['franchise_id', 'season_year']
+        totals = ['games', 'wins', 'losses', 'ties', 'points_for', 'points_against']
+        table = season_records.groupby(key)[totals].sum().astype(np.int64)
+
+        regular = season_records['season_type'] == 'regular-season'
+        by_type = {name: records.set_index(key) for name, records in
+                   (('regular', season_records[regular]), ('playoff', season_records[~regular]))}
+        table['win_percentage'] = table['wins'] / table['games']
+        table['regular_season_wins'] = by_type['regular']['wins'].reindex(table.index, fill_value=0)
+        table['playoff_wins'] = by_type['playoff']['wins'].reindex(table.index, fill_value=0)
+        table['playoff_losses'] = by_type['playoff']['losses'].reindex(table.index, fill_value=0)
+
+        # Super Bowl seasons come as a list of years per franchise
+        for flag, column in (('super_bowl_appearance', 'super_bowl_years'), ('super_bowl_win', 'super_bowl_win_years')):
+            years = playoff_records[['franchise_id', column]].explode(column).dropna()
+            seasons = pd.MultiIndex.from_arrays([years['franchise_id'].astype(np.int64),
+                                                 years[column].astype(np.int64)], names=key)
+            table[flag] = table.index.isin(seasons)
+
+        for column in ('regular_season_wins', 'playoff_wins', 'playoff_losses'):
+            table[column] = table[column].astype(np.int64)
+        return cls(table[TABLE_COLUMNS].sort_index())
+
+    # Build the stats from a games DataFrame (season_year, home_franchise_id, away_franchise_id,
+    # home_score, away_score, round), e.g. the dashboard's game facts
+    @classmethod
+    def from_games(cls, games_df):
+        return cls.from_arrays(
+            games_df['season_year'].to_numpy(),
+            games_df['home_franchise_id'].to_numpy(),
+            games_df['away_franchise_id'].to_numpy(),
+            pd.to_numeric(games_df['home_score']).to_numpy(),
+            pd.to_numeric(games_df['away_score']).to_numpy(),
+            games_df['round'].to_numpy()
+        )
+
+    # Per-season rows for one franchise
+    def seasons_for(self, franchise_id):
+        return self.table.loc[franchise_id]
+
+    # Summary row for one franchise
+    def summary_for(self, franchise_id):
+        return self.summary.loc[franchise_id]
+
+    # Seasons in which the franchise reached / won the Super Bowl
+    def super_bowl_years(self, franchise_id, wins_only=False):
+        seasons = self.seasons_for(franchise_id)
+        column = 'super_bowl_win' if wins_only else 'super_bowl_appearance'
+        return [int(year) for year in seasons.index[seasons[column].to_numpy()]]
@@ -0,0 +1,95 @@
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+# Micro-benchmark: decode + parse of scoreboard payloads with each available decoder.
+# "json" is the current path (what response.json() does); "msgspec"/"orjson" are the fast paths.
+#
+#   python bench_decode.py                      # synthetic detailed payloads
+#   python bench_decode.py --payloads DIR       # recorded payloads (scoreboard_*.json or a cache objects/ dir)
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "pipeline"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests"))
+from fast_decode import DECODERS
+from espn_parser import parse_events
+from stub_scoreboard_server import generate_payload
+
+# Function to load the payload bodies to decode, as (year, bytes) pairs
+def load_payloads(payload_dir=None, years=range(1995, 2025)):
+    if payload_dir is None:
+        return [(year, json.dumps(generate_payload(year, detailed=True)).encode()) for year in years]
+
+    payloads = []
+    for name in sorted(os.listdir(payload_dir)):
+        path = os.path.join(payload_dir, name)
+        if os.path.isdir(path) or name.endswith(".tmp"):
+            continue
+        with open(path, "rb") as f:
+            body = f.read()
+        # Recorded fixtures are named scoreboard_{year}.json; cache objects carry no year
+        digits = "".join(ch for ch in name if ch.isdigit())
+        year = int(digits[:4]) if name.startswith("scoreboard_") and len(digits) >= 4 else None
+        payloads.append((year, body))
+    return payloads
+
+# Function to decode and parse every payload once, returning the parsed records
+def decode_and_parse(decode, payloads):
+    records = []
+    for year, body in payloads:
+        data = decode(body)
+        if year is None:
+            events = data.get("events", [])
+            year = events[0]["season"]["year"] if events else 0
+        records.extend(parse_events(data, year))
+    return records
+
+def run_benchmark(payloads, repeat=5):
+    total_bytes = sum(len(body) for _, body in payloads)
+    results = {}
+    reference = None
+
+    for name, decode in DECODERS.items():
+        if decode is None:
+            continue
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            records = decode_and_parse(decode, payloads)
+            timings.append(time.perf_counter() - start)
+
+        # Every decoder must produce exactly the same records
+        if reference is None:
+            reference = records
+        elif records != reference:
+            raise AssertionError(f"{name} decoder produced different records")
+
+        best = min(timings)
+        results[name] = {
+            "best_seconds": round(best, 4),
+            "median_seconds": round(statistics.median(timings), 4),
+            "mb_per_second": round(total_bytes / best / 1e6, 1),
+            "records": len(records)
+        }
+
+    return {"payloads": len(payloads), "bytes": total_bytes, "decoders": results}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark scoreboard payload decoding")
+    parser.add_argument("--payloads", default=None, help="Directory of recorded payloads")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    args = parser.parse_args()
+
+    report = run_benchmark(load_payloads(args.payloads), args.repeat)
+
+    if args.json:
+        print(json.dumps(report, indent=4))
+    else:
+        print(f"{report['payloads']} payloads, {report['bytes'] / 1e6:.1f} MB")
+        baseline = report["decoders"]["json"]["best_seconds"]
+        for name, result in report["decoders"].items():
+            print(f"  {name:8s} best {result['best_seconds']:.3f}s  median {result['median_seconds']:.3f}s  "
+                  f"{result['mb_per_second']:6.1f} MB/s  x{baseline / result['best_seconds']:.1f}")
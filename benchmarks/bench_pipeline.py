@@ -0,0 +1,280 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+# End-to-end pipeline benchmark.
+#
+# Replays recorded (or synthetic) ESPN scoreboard payloads from a local stand-in server through
+# fetch_and_process_games, optionally loads the result into PostgreSQL, and times the dashboard's
+# data path. Every stage reports throughput, latency percentiles and peak Python memory, and the
+# whole report is written as JSON so runs from two commits can be diffed with --compare.
+#
+#   python bench_pipeline.py --output before.json
+#   python bench_pipeline.py --output after.json --compare before.json
+#   python bench_pipeline.py --fixtures fixtures/ --db      # recorded payloads + real load
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BENCH_DIR, "..", "pipeline"))
+sys.path.append(os.path.join(BENCH_DIR, "..", "analytics"))
+sys.path.append(os.path.join(BENCH_DIR, "..", "tests"))
+
+from stub_scoreboard_server import start_server
+from franchises import franchise_for
+
+# Function to summarize a list of per-item latencies (seconds) in milliseconds
+def latency_summary(latencies):
+    values = np.asarray(latencies) * 1000
+    return {
+        "count": int(len(values)),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p90_ms": round(float(np.percentile(values, 90)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+        "max_ms": round(float(values.max()), 3)
+    }
+
+# Function to run a stage: once under tracemalloc for peak memory, then `repeat` times for timing.
+# The stage function returns (items_processed, per_item_latencies, extra_metrics).
+def measure(stage, repeat=3):
+    tracemalloc.start()
+    stage()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items, latencies, extra = stage()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best[0]:
+            best = (elapsed, items, latencies, extra)
+
+    elapsed, items, latencies, extra = best
+    result = {
+        "seconds": round(elapsed, 4),
+        "items": items,
+        "items_per_second": round(items / elapsed, 1) if elapsed > 0 else None,
+        "peak_memory_mb": round(peak / 1e6, 2)
+    }
+    if latencies:
+        result["latency"] = latency_summary(latencies)
+    result.update(extra)
+    return result
+
+# Stage: fetch + decode + parse every season from the stand-in server, serially
+def extract_stage(extract, years):
+    def stage():
+        session = extract.create_session()
+        latencies = []
+        games = 0
+        for year in years:
+            start = time.perf_counter()
+            _, _, season_games = extract.fetch_and_process_games(year, session=session)
+            latencies.append(time.perf_counter() - start)
+            games += len(season_games)
+        session.close()
+        return games, latencies, {"seasons": len(years)}
+    return stage
+
+# Stage: the same fetch through the concurrent fetcher
+def extract_concurrent_stage(extract, years, workers):
+    def stage():
+        games = sum(len(season_games) for _, _, _, season_games in
+                    extract.fetch_years_concurrent(years, max_workers=workers))
+        return games, [], {"workers": workers}
+    return stage
+
+# Stage: client-side row building for the loader (no database needed)
+def load_prepare_stage(load, games):
+    team_ids = {}
+    season_ids = {}
+    for game in games:
+        team_ids.setdefault(game['home_team'], len(team_ids) + 1)
+        team_ids.setdefault(game['away_team'], len(team_ids) + 1)
+        season_ids.setdefault((int(game['season_year']), game['season_type']), len(season_ids) + 1)
+
+    def stage():
+        rows = [load.build_game_row(game, season_ids, team_ids) for game in games]
+        return len(rows), [], {}
+    return stage
+
+# Stage: load the extracted JSON into PostgreSQL (only with --db; writes to the configured database)
+def load_db_stage(load, input_file):
+    def stage():
+        start = time.perf_counter()
+        load.load_data_to_db(input_file)
+        return 1, [time.perf_counter() - start], {}
+    return stage
+
+# Function to build the frames the dashboard gets from the database out of extracted games
+def build_dashboard_frames(games):
+    teams = sorted({game['home_team'] for game in games} | {game['away_team'] for game in games})
+    team_ids = {name: i + 1 for i, name in enumerate(teams)}
+    seasons = sorted({(int(game['season_year']), game['season_type']) for game in games})
+    season_ids = {season: i + 1 for i, season in enumerate(seasons)}
+
+    games_df = pd.DataFrame({
+        'game_id': np.arange(1, len(games) + 1),
+        'season_id': [season_ids[(int(game['season_year']), game['season_type'])] for game in games],
+        'home_team_id': [team_ids[game['home_team']] for game in games],
+        'away_team_id': [team_ids[game['away_team']] for game in games],
+        'home_score': [int(game['home_score']) for game in games],
+        'away_score': [int(game['away_score']) for game in games],
+        'round': [game['round_type'] for game in games]
+    })
+    teams_df = pd.DataFrame({'team_id': list(team_ids.values()), 'name': list(team_ids.keys())})
+    teams_df['franchise_id'] = teams_df['name'].map(franchise_for).astype('category').cat.codes.astype(int) + 1
+    seasons_df = pd.DataFrame({'season_id': list(season_ids.values()),
+                               'year': [year for year, _ in season_ids],
+                               'type': [season_type for _, season_type in season_ids]})
+    return games_df, teams_df, seasons_df
+
+# Stage: the original dashboard path -- merge seasons and team names, then groupby + boolean-mask lookups
+def dashboard_merge_stage(games_df, teams_df, seasons_df, lookups):
+    def stage():
+        df = games_df.merge(seasons_df[['season_id', 'year']], on='season_id', how='left')
+        df['season_year'] = df['year']
+        df = df.merge(teams_df[['team_id', 'name']], left_on='home_team_id', right_on='team_id', how='left')
+        df = df.rename(columns={'name': 'home_team'})
+        df = df.merge(teams_df[['team_id', 'name']], left_on='away_team_id', right_on='team_id', how='left')
+        df = df.rename(columns={'name': 'away_team'})
+        df.groupby(['home_score', 'away_score']).size().reset_index(name='count')
+
+        latencies = []
+        for home_score, away_score in lookups:
+            start = time.perf_counter()
+            df[(df['home_score'] == home_score) & (df['away_score'] == away_score)]
+            latencies.append(time.perf_counter() - start)
+        return len(lookups), latencies, {}
+    return stage
+
+# Stage: the precomputed engines -- build once, then constant-time lookups
+def dashboard_engine_stage(games_df, teams_df, seasons_df, lookups):
+    from scorigami_matrix import ScorigamiMatrix
+    from team_stats import TeamStats
+
+    facts = games_df.merge(seasons_df[['season_id', 'year']], on='season_id').rename(columns={'year': 'season_year'})
+    franchise_ids = teams_df.set_index('team_id')['franchise_id']
+    facts['home_franchise_id'] = facts['home_team_id'].map(franchise_ids)
+    facts['away_franchise_id'] = facts['away_team_id'].map(franchise_ids)
+
+    def stage():
+        start = time.perf_counter()
+        matrix = ScorigamiMatrix.from_games(facts)
+        build_seconds = time.perf_counter() - start
+        TeamStats.from_games(facts)
+        stats_seconds = time.perf_counter() - start - build_seconds
+
+        latencies = []
+        for home_score, away_score in lookups:
+            start = time.perf_counter()
+            matrix.count(home_score, away_score)
+            matrix.rows_for(home_score, away_score)
+            latencies.append(time.perf_counter() - start)
+        matrix.top_scorelines(5)
+        return len(lookups), latencies, {"matrix_build_seconds": round(build_seconds, 4),
+                                         "team_stats_build_seconds": round(stats_seconds, 4)}
+    return stage
+
+# Function to get the current commit for the report
+def current_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# Function to print the relative change of every numeric metric against an earlier report
+def compare_reports(old, new, prefix=""):
+    for key, value in new.items():
+        old_value = old.get(key) if isinstance(old, dict) else None
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            compare_reports(old_value or {}, value, name + ".")
+        elif isinstance(value, (int, float)) and isinstance(old_value, (int, float)) and old_value:
+            change = (value - old_value) / old_value * 100
+            print(f"{name:60s} {old_value:>12} -> {value:>12}  ({change:+.1f}%)")
+
+def run_benchmarks(years, fixtures=None, repeat=3, workers=8, with_db=False, latency=0.0):
+    server, url = start_server(fixtures_dir=fixtures, latency=latency, detailed=fixtures is None)
+    os.environ["ESPN_SCOREBOARD_URL"] = url
+
+    # Import after pointing the pipeline at the stand-in server
+    import extract
+    extract.SCOREBOARD_URL = url
+
+    report = {
+        "commit": current_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {"years": [years[0], years[-1]], "fixtures": fixtures, "repeat": repeat,
+                   "workers": workers, "server_latency": latency},
+        "stages": {}
+    }
+    stages = report["stages"]
+
+    print("Benchmarking extract...")
+    stages["extract"] = measure(extract_stage(extract, years), repeat)
+    stages["extract_concurrent"] = measure(extract_concurrent_stage(extract, years, workers), repeat)
+
+    # Collect the games once for the later stages
+    games = [game for _, _, _, season_games in extract.fetch_years_concurrent(years, workers) for game in season_games]
+
+    print("Benchmarking load...")
+    if with_db:
+        import load  # Needs the database driver, so only imported when loading
+        stages["load_prepare"] = measure(load_prepare_stage(load, games), repeat)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            input_file = os.path.join(tmp_dir, "nfl_data_all_years.json")
+            teams = {game['home_team'] for game in games} | {game['away_team'] for game in games}
+            seasons = {(game['season_year'], game['season_type']) for game in games}
+            extract.save_to_single_json(teams, seasons, games, input_file)
+            stages["load_db"] = measure(load_db_stage(load, input_file), repeat)
+            stages["load_db"]["games"] = len(games)
+    else:
+        stages["load_prepare"] = stages["load_db"] = {
+            "skipped": "pass --db to load into the configured PostgreSQL database"
+        }
+
+    print("Benchmarking dashboard...")
+    games_df, teams_df, seasons_df = build_dashboard_frames(games)
+    rng = random.Random(0)
+    lookups = [(rng.randint(0, 50), rng.randint(0, 50)) for _ in range(1000)]
+    stages["dashboard_merge_groupby"] = measure(dashboard_merge_stage(games_df, teams_df, seasons_df, lookups), repeat)
+    stages["dashboard_engines"] = measure(dashboard_engine_stage(games_df, teams_df, seasons_df, lookups), repeat)
+
+    server.shutdown()
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the extract, load and dashboard stages")
+    parser.add_argument("--start", type=int, default=2000, help="First season")
+    parser.add_argument("--end", type=int, default=2023, help="Last season (inclusive)")
+    parser.add_argument("--fixtures", default=None, help="Directory of recorded scoreboard_{year}.json payloads")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage (best is reported)")
+    parser.add_argument("--workers", type=int, default=8, help="Workers for the concurrent extract stage")
+    parser.add_argument("--server-latency", type=float, default=0.0, help="Artificial per-request latency")
+    parser.add_argument("--db", action="store_true", help="Also run load_data_to_db against the .env database")
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    parser.add_argument("--compare", default=None, help="Earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    report = run_benchmarks(list(range(args.start, args.end + 1)), args.fixtures, args.repeat,
+                            args.workers, args.db, args.server_latency)
+
+    output = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        print(f"Report written to {args.output}")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            compare_reports(json.load(f)["stages"], report["stages"])
@@ -0,0 +1,33 @@
+import os
+import sys
+import argparse
+
+# Record real ESPN scoreboard payloads as benchmark fixtures (scoreboard_{year}.json).
+# The stub server and the benchmarks replay them with --fixtures DIR.
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "pipeline"))
+from extract import build_scoreboard_url, fetch_url
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Function to download each year's scoreboard payload into the fixtures directory
+def record_fixtures(years, output_dir=FIXTURES_DIR):
+    os.makedirs(output_dir, exist_ok=True)
+    for year in years:
+        response = fetch_url(build_scoreboard_url(year))
+        if response.status_code != 200:
+            print(f"Skipping {year}: {response.status_code}")
+            continue
+        path = os.path.join(output_dir, f"scoreboard_{year}.json")
+        with open(path, "wb") as f:
+            f.write(response.content)
+        print(f"Recorded {path} ({len(response.content) / 1e6:.1f} MB)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record ESPN scoreboard payloads as benchmark fixtures")
+    parser.add_argument("--start", type=int, default=2015)
+    parser.add_argument("--end", type=int, default=2025, help="Last calendar year (inclusive)")
+    parser.add_argument("--output", default=FIXTURES_DIR)
+    args = parser.parse_args()
+
+    record_fixtures(range(args.start, args.end + 1), args.output)
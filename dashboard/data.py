@@ -0,0 +1,432 @@
+import streamlit as st
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+# Shared data-access layer for the dashboard pages.
+# Connections come from one pool per server process and query results are cached
+# in-process, keyed on the data version stamp that pipeline/load.py bumps after each load.
+# Widget interactions therefore re-use the cached frames instead of querying PostgreSQL.
+# When DASHBOARD_SNAPSHOT points at a columnar snapshot (pipeline/snapshot.py), every
+# loader reads the memory-mapped snapshot instead and no database is needed at all.
+#
+# Importing this module is cheap: pandas, psycopg2, python-dotenv, the analytics engines and
+# the snapshot reader are imported by the loaders that need them, so a page can draw its
+# widgets before any heavy import or query runs (see dashboard/startup_timing.py).
+
+# Analytics engines shared with the command-line tools, and the snapshot reader shared with the pipeline
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "analytics"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "pipeline"))
+
+# How often (in seconds) to check whether the loader has published new data
+VERSION_CHECK_SECONDS = int(os.getenv("DASHBOARD_VERSION_CHECK_SECONDS", 60))
+
+# Chronological order of games: season, regular season before playoffs, week (unknown last), then
+# game_id. game_id alone is not chronological: the bulk loader assigns IDs in merge order.
+GAME_ORDER = "s.year, CASE s.type WHEN 'regular-season' THEN 0 ELSE 1 END, g.week NULLS LAST, g.game_id"
+
+# Settings from the environment and the .env file, read once on first use
+@lru_cache(maxsize=None)
+def get_settings():
+    from dotenv import load_dotenv
+    load_dotenv()
+    return {
+        "db_host": os.getenv("DB_HOST"),
+        "db_name": os.getenv("DB_NAME"),
+        "db_user": os.getenv("DB_USER"),
+        "db_password": os.getenv("DB_PASSWORD"),
+        # Read-only snapshot directory to serve from instead of PostgreSQL (unset = use the database)
+        "snapshot_path": os.getenv("DASHBOARD_SNAPSHOT")
+    }
+
+# Snapshot directory the dashboard serves from, or None when it reads PostgreSQL
+def snapshot_path():
+    return get_settings()["snapshot_path"]
+
+# One connection pool shared by every session and page
+@st.cache_resource
+def get_connection_pool():
+    from psycopg2.pool import ThreadedConnectionPool
+    settings = get_settings()
+    return ThreadedConnectionPool(
+        1, 5,
+        host=settings["db_host"],
+        dbname=settings["db_name"],
+        user=settings["db_user"],
+        password=settings["db_password"]
+    )
+
+# Borrow a connection from the pool and give it back afterwards
+@contextmanager
+def get_db_connection():
+    pool = get_connection_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+    finally:
+        # Leave the connection clean for the next borrower
+        conn.rollback()
+        pool.putconn(conn)
+
+# Run a query and return the result as a DataFrame
+def run_query(query, params=None):
+    import pandas as pd
+    with get_db_connection() as conn:
+        return pd.read_sql(query, conn, params=params)
+
+# Current data version stamp with the loader's change markers (re-checked at most every
+# VERSION_CHECK_SECONDS): rebuild_version is the last version that changed existing rows and
+# max_game_id the highest game ID at that point (see database/schema.sql)
+@st.cache_data(ttl=VERSION_CHECK_SECONDS)
+def get_data_stamp():
+    if snapshot_path():
+        # Every snapshot is written from scratch, so each new one needs a rebuild
+        from snapshot import load_snapshot
+        version = load_snapshot(snapshot_path())[1]["version"]
+        return {"version": version, "rebuild_version": version, "max_game_id": None}
+    df = run_query("SELECT version, rebuild_version, max_game_id FROM data_version")
+    if df.empty:
+        return {"version": 0, "rebuild_version": 0, "max_game_id": None}
+    import pandas as pd
+    row = df.iloc[0]
+    return {"version": int(row['version']), "rebuild_version": int(row['rebuild_version']),
+            "max_game_id": None if pd.isna(row['max_game_id']) else int(row['max_game_id'])}
+
+# Current data version stamp
+def get_data_version():
+    return get_data_stamp()["version"]
+
+# Whether a structure built at `version` whose last game is `last_game_id` can catch up with `stamp`
+# by appending the games after last_game_id: only when every load since then was insert-only.
+# Updated scores, re-linked teams, a reload with reset IDs (max_game_id shrank) or a recreated
+# data_version table (version went back) all need a rebuild.
+def can_append(version, last_game_id, stamp):
+    return (last_game_id is not None and stamp["max_game_id"] is not None
+            and stamp["version"] >= version and stamp["rebuild_version"] <= version
+            and stamp["max_game_id"] >= last_game_id)
+
+# All games from the memory-mapped snapshot, shared by every session
+@st.cache_resource(max_entries=2)
+def load_snapshot_games(version):
+    import pandas as pd
+    from snapshot import load_snapshot, snapshot_to_frame
+    columns, meta = load_snapshot(snapshot_path())
+    games = snapshot_to_frame(columns, meta)
+    teams = pd.DataFrame({'team_id': range(len(meta['teams'])), 'name': meta['teams']})
+
+    # Snapshots written before franchises existed don't carry the mapping; resolve it here instead
+    if 'team_franchises' in meta:
+        teams['franchise'] = [meta['franchises'][code] for code in meta['team_franchises']]
+    else:
+        from franchises import franchise_for
+        teams['franchise'] = teams['name'].map(franchise_for)
+    teams['franchise_id'] = teams['franchise'].astype('category').cat.codes.astype(int)
+
+    franchise_ids = teams['franchise_id'].to_numpy()
+    games['home_franchise_id'] = franchise_ids[games['home_team_id'].to_numpy()]
+    games['away_franchise_id'] = franchise_ids[games['away_team_id'].to_numpy()]
+    return games, teams
+
+# Display columns for game listings built from the snapshot
+def snapshot_listing(games, columns=('season_year', 'home_team', 'home_score', 'away_score', 'away_team')):
+    listing = games[list(columns)].copy()
+    for column in ('home_team', 'away_team', 'round'):
+        if column in listing.columns:
+            listing[column] = listing[column].astype(str)
+    return listing.reset_index(drop=True)
+
+# Per-game facts of the games added after a given game ID (new database rows get larger IDs)
+def load_game_facts_after(version, game_id):
+    if snapshot_path():
+        facts = load_game_facts(version)
+        return facts[facts['game_id'] > game_id]
+    return run_query(f"""
+        SELECT g.game_id, s.year AS season_year, g.round,
+               g.home_team_id, g.away_team_id, ht.franchise_id AS home_franchise_id,
+               at.franchise_id AS away_franchise_id, g.home_score, g.away_score
+        FROM games g
+        JOIN seasons s ON s.season_id = g.season_id
+        JOIN teams ht ON ht.team_id = g.home_team_id
+        JOIN teams at ON at.team_id = g.away_team_id
+        WHERE g.game_id > %(game_id)s
+        ORDER BY {GAME_ORDER}
+    """, {"game_id": int(game_id)})
+
+# Narrow per-game facts used to build the in-memory engines: integer IDs and scores only,
+# no names or dates, so the transfer stays small as the table grows
+@st.cache_data
+def load_game_facts(version):
+    if snapshot_path():
+        games = load_snapshot_games(version)[0]
+        facts = games[['game_id', 'season_year', 'round', 'home_team_id', 'away_team_id', 'home_franchise_id',
+                       'away_franchise_id', 'home_score', 'away_score']].copy()
+        facts['round'] = facts['round'].astype(str)
+        return facts
+    return run_query(f"""
+        SELECT g.game_id, s.year AS season_year, g.round,
+               g.home_team_id, g.away_team_id, ht.franchise_id AS home_franchise_id,
+               at.franchise_id AS away_franchise_id, g.home_score, g.away_score
+        FROM games g
+        JOIN seasons s ON s.season_id = g.season_id
+        JOIN teams ht ON ht.team_id = g.home_team_id
+        JOIN teams at ON at.team_id = g.away_team_id
+        ORDER BY {GAME_ORDER}
+    """)
+
+# Games with one final score (uses games_score_idx), cached per data version and score pair
+@st.cache_data(max_entries=256)
+def load_games_by_score(version, home_score, away_score, normalized):
+    if snapshot_path():
+        games = load_snapshot_games(version)[0]
+        match = (games['home_score'] == home_score) & (games['away_score'] == away_score)
+        if normalized:
+            match |= (games['home_score'] == away_score) & (games['away_score'] == home_score)
+        return snapshot_listing(games[match])
+    if normalized:
+        condition = "(g.home_score = %(a)s AND g.away_score = %(b)s) OR (g.home_score = %(b)s AND g.away_score = %(a)s)"
+    else:
+        condition = "g.home_score = %(a)s AND g.away_score = %(b)s"
+    return run_query(f"""
+        SELECT s.year AS season_year, ht.name AS home_team, g.home_score, g.away_score, at.name AS away_team
+        FROM games g
+        JOIN seasons s ON s.season_id = g.season_id
+        JOIN teams ht ON ht.team_id = g.home_team_id
+        JOIN teams at ON at.team_id = g.away_team_id
+        WHERE {condition}
+        ORDER BY {GAME_ORDER}
+    """, {"a": int(home_score), "b": int(away_score)})
+
+# Every game played by a set of team IDs (uses games_home_team_idx / games_away_team_idx)
+@st.cache_data(max_entries=64)
+def load_team_games(version, team_ids):
+    if snapshot_path():
+        games = load_snapshot_games(version)[0]
+        match = games['home_team_id'].isin(team_ids) | games['away_team_id'].isin(team_ids)
+        return snapshot_listing(games[match], ('season_year', 'week', 'round', 'home_team', 'home_score',
+                                               'away_score', 'away_team'))
+    return run_query(f"""
+        SELECT s.year AS season_year, g.week, g.round,
+               ht.name AS home_team, g.home_score, g.away_score, at.name AS away_team
+        FROM games g
+        JOIN seasons s ON s.season_id = g.season_id
+        JOIN teams ht ON ht.team_id = g.home_team_id
+        JOIN teams at ON at.team_id = g.away_team_id
+        WHERE g.home_team_id = ANY(%(ids)s) OR g.away_team_id = ANY(%(ids)s)
+        ORDER BY {GAME_ORDER}
+    """, {"ids": list(team_ids)})
+
+# Super Bowl games, optionally only those involving a set of team IDs (uses games_super_bowl_idx)
+@st.cache_data(max_entries=64)
+def load_super_bowl_games(version, team_ids):
+    if snapshot_path():
+        games = load_snapshot_games(version)[0]
+        match = games['round'] == 'Super Bowl'
+        if team_ids:
+            match &= games['home_team_id'].isin(team_ids) | games['away_team_id'].isin(team_ids)
+        return snapshot_listing(games[match])
+    team_filter = "AND (g.home_team_id = ANY(%(ids)s) OR g.away_team_id = ANY(%(ids)s))" if team_ids else ""
+    return run_query(f"""
+        SELECT s.year AS season_year, ht.name AS home_team, g.home_score, g.away_score, at.name AS away_team
+        FROM games g
+        JOIN seasons s ON s.season_id = g.season_id
+        JOIN teams ht ON ht.team_id = g.home_team_id
+        JOIN teams at ON at.team_id = g.away_team_id
+        WHERE g.round = 'Super Bowl' {team_filter}
+        ORDER BY s.year
+    """, {"ids": list(team_ids or [])})
+
+# Teams with their franchise (team_id, name, franchise_id, franchise), cached per data version
+@st.cache_data
+def load_teams(version):
+    if snapshot_path():
+        return load_snapshot_games(version)[1].sort_values(['franchise', 'name']).reset_index(drop=True)
+    return run_query("""
+        SELECT t.team_id, t.name, t.franchise_id, f.name AS franchise
+        FROM teams t
+        JOIN franchises f ON f.franchise_id = t.franchise_id
+        ORDER BY f.name, t.name
+    """)
+
+# Seasons, cached per data version
+@st.cache_data
+def load_seasons(version):
+    if snapshot_path():
+        games = load_snapshot_games(version)[0]
+        seasons = games[['season_year', 'season_type']].drop_duplicates().sort_values(['season_year', 'season_type'])
+        seasons = seasons.rename(columns={'season_year': 'year', 'season_type': 'type'}).reset_index(drop=True)
+        seasons['type'] = seasons['type'].astype(str)
+        seasons.insert(0, 'season_id', range(len(seasons)))
+        return seasons
+    return run_query("SELECT season_id, year, type FROM seasons ORDER BY year, type")
+
+# Add the franchise names of both sides to game facts as home_team / away_team (an integer ID lookup)
+def with_franchise_names(facts, version):
+    franchises = load_teams(version).drop_duplicates('franchise_id').set_index('franchise_id')['franchise']
+    return facts.assign(home_team=facts['home_franchise_id'].map(franchises),
+                        away_team=facts['away_franchise_id'].map(franchises))
+
+# Game facts with the franchise names of both sides as home_team / away_team
+def load_named_game_facts(version):
+    return with_franchise_names(load_game_facts(version), version)
+
+# Stats for every franchise and season (keyed on franchise_id), cached per data version. With a
+# database they come from the franchise_season_records / franchise_playoff_records views (a few rows
+# per franchise and season); from a snapshot they are computed in one vectorized pass over the games.
+@st.cache_resource(max_entries=4)
+def load_team_stats(version):
+    from team_stats import TeamStats
+    if snapshot_path():
+        return TeamStats.from_games(load_game_facts(version))
+    season_records = run_query("""
+        SELECT franchise_id, year AS season_year, season_type, games, wins, losses, ties, points_for, points_against
+        FROM franchise_season_records
+    """)
+    playoff_records = run_query("""
+        SELECT franchise_id, super_bowl_years, super_bowl_win_years
+        FROM franchise_playoff_records
+    """)
+    return TeamStats.from_records(season_records, playoff_records)
+
+# Scorigami probability model (per-team, per-era points histograms), built once per data version
+@st.cache_resource(max_entries=2)
+def load_scorigami_probability(version):
+    from scorigami_probability import ScorigamiProbability
+    return ScorigamiProbability.from_games(load_named_game_facts(version))
+
+# Scorigami lookup matrix, built once per data version and shared by all sessions
+@st.cache_resource(max_entries=4)
+def load_scorigami_matrix(version, normalized):
+    from scorigami_matrix import ScorigamiMatrix
+    return ScorigamiMatrix.from_games(load_game_facts(version), normalized=normalized)
+
+# Mutable holder for the scorigami timeline; it outlives data versions so it can be extended in place
+@st.cache_resource
+def scorigami_timeline_state(normalized):
+    return {"timeline": None, "version": None, "lock": threading.Lock()}
+
+# Mutable holder for the head-to-head matchup index (extended in place like the timeline)
+@st.cache_resource
+def matchup_index_state():
+    return {"index": None, "version": None, "lock": threading.Lock()}
+
+# Most common scorelines as [(score_a, score_b, count)], ties broken by first occurrence.
+# With a database this reads the small scoreline_counts view instead of building the matrix.
+@st.cache_data(max_entries=8)
+def load_top_scorelines(version, n, normalized):
+    if snapshot_path():
+        return load_scorigami_matrix(version, normalized).top_scorelines(n)
+    if normalized:
+        score_a, score_b = "GREATEST(sc.home_score, sc.away_score)", "LEAST(sc.home_score, sc.away_score)"
+    else:
+        score_a, score_b = "sc.home_score", "sc.away_score"
+    df = run_query(f"""
+        SELECT {score_a} AS score_a, {score_b} AS score_b, SUM(sc.games) AS games
+        FROM scoreline_counts sc
+        JOIN games g ON g.game_id = sc.first_game_id
+        JOIN seasons s ON s.season_id = g.season_id
+        GROUP BY 1, 2
+        ORDER BY games DESC, MIN(ARRAY[s.year, CASE s.type WHEN 'regular-season' THEN 0 ELSE 1 END,
+                                       COALESCE(g.week, 2147483647), g.game_id])
+        LIMIT %(n)s
+    """, {"n": int(n)})
+    return [(int(row.score_a), int(row.score_b), int(row.games)) for row in df.itertuples()]
+
+# Get the games that ended with a given score (either orientation when normalized=True)
+def get_games_by_score(home_score, away_score, normalized=False):
+    return load_games_by_score(get_data_version(), home_score, away_score, normalized)
+
+# Get every game played by the given team IDs
+def get_team_games(team_ids):
+    return load_team_games(get_data_version(), tuple(sorted(team_ids)))
+
+# Get the Super Bowl games, optionally only for the given team IDs
+def get_super_bowl_games(team_ids=None):
+    return load_super_bowl_games(get_data_version(), tuple(sorted(team_ids)) if team_ids else None)
+
+# Load team data
+def get_teams():
+    return load_teams(get_data_version())
+
+# Load season data
+def get_seasons():
+    return load_seasons(get_data_version())
+
+# Get the team stats engine
+def get_team_stats():
+    return load_team_stats(get_data_version())
+
+# Get the n most common scorelines (home/away ordered, or winner/loser when normalized=True)
+def get_top_scorelines(n=5, normalized=False):
+    return load_top_scorelines(get_data_version(), n, normalized)
+
+# Get the scorigami timeline. It is replayed from the full history once per server process;
+# when the loader publishes an insert-only data version only the games added since are appended,
+# otherwise (see can_append) the history is replayed again.
+def get_scorigami_timeline(normalized=False):
+    from scorigami_timeline import ScorigamiTimeline
+    stamp = get_data_stamp()
+    version = stamp["version"]
+    state = scorigami_timeline_state(normalized)
+    with state["lock"]:
+        timeline = state["timeline"]
+        if timeline is not None and state["version"] != version:
+            try:
+                if can_append(state["version"], timeline.last_game_id, stamp):
+                    timeline.append_games(load_game_facts_after(version, timeline.last_game_id))
+                else:
+                    timeline = None
+            except ValueError:
+                # New games from an older season (e.g. a backfill): replay the history instead
+                timeline = None
+        if timeline is None:
+            timeline = ScorigamiTimeline.from_games(load_game_facts(version), normalized=normalized)
+        state["timeline"], state["version"] = timeline, version
+    return timeline
+
+# Get the head-to-head matchup index (keyed on franchise pairs). It is built from the full history
+# once per server process; when the loader publishes an insert-only data version only the new games
+# are filed, otherwise (see can_append) the index is rebuilt.
+def get_matchup_index():
+    from matchup_index import MatchupIndex
+    stamp = get_data_stamp()
+    version = stamp["version"]
+    state = matchup_index_state()
+    with state["lock"]:
+        index = state["index"]
+        if index is not None and state["version"] != version:
+            if can_append(state["version"], index.last_game_id, stamp):
+                index.append_games(with_franchise_names(load_game_facts_after(version, index.last_game_id),
+                                                        version))
+            else:
+                index = None
+        if index is None:
+            index = MatchupIndex.from_games(load_named_game_facts(version))
+        state["index"], state["version"] = index, version
+    return index
+
+# Get the scorigami probability model
+def get_scorigami_probability():
+    return load_scorigami_probability(get_data_version())
+
+# Get the scorigami matrix (home/away ordered, or winner/loser when normalized=True)
+def get_scorigami_matrix(normalized=False):
+    return load_scorigami_matrix(get_data_version(), normalized)
+
+# Drop every cached frame so the next access reloads from the database
+def invalidate():
+    get_data_stamp.clear()
+    load_snapshot_games.clear()
+    load_game_facts.clear()
+    load_games_by_score.clear()
+    load_team_games.clear()
+    load_super_bowl_games.clear()
+    load_teams.clear()
+    load_seasons.clear()
+    load_team_stats.clear()
+    load_scorigami_probability.clear()
+    load_scorigami_matrix.clear()
+    load_top_scorelines.clear()
+    scorigami_timeline_state.clear()
+    matchup_index_state.clear()
@@ -0,0 +1,63 @@
+import streamlit as st
+from data import get_teams, get_matchup_index
+
+# Team-vs-team history. The selectors only need the team list; the games, record and scorelines
+# of a pair come from the precomputed matchup index (built once per server process and extended
+# when new games are loaded), so a lookup only touches the games between the two franchises.
+
+def head_to_head_page():
+    st.title("Head to Head")
+    st.write("Pick two franchises to see every game between them.")
+
+    # Franchises (relocated and renamed teams are grouped under their current name)
+    franchises = list(get_teams()['franchise'].unique())
+
+    col1, col2 = st.columns(2)
+    with col1:
+        team = st.selectbox("Team", franchises, key="h2h_team")
+    with col2:
+        opponents = [franchise for franchise in franchises if franchise != team]
+        opponent = st.selectbox("Opponent", opponents, key="h2h_opponent")
+
+    # Nothing to compare until there are at least two franchises
+    if opponent is None:
+        st.info("At least two franchises are needed for a head-to-head comparison.")
+        return
+
+    with st.spinner("Loading matchups..."):
+        index = get_matchup_index()
+    record = index.record(team, opponent)
+
+    if record['games'] == 0:
+        st.write(f"{team} and {opponent} have never played each other.")
+        return
+
+    # All-time record from the first team's side
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Games", record['games'])
+    col2.metric(f"{team} record", f"{record['wins']}-{record['losses']}-{record['ties']}")
+    col3.metric("Point differential", f"{record['point_differential']:+d}")
+
+    games = index.games_between(team, opponent)
+
+    # Running record over time
+    st.write("### Series over Time")
+    import plotly.express as px  # Plotly for charts (imported here, it is slow to import)
+    fig = px.line(games, x=games.index + 1, y='point_differential', hover_data=['season_year', 'result'],
+                  labels={'x': 'Game', 'point_differential': f'{team} cumulative point differential'},
+                  title=f"{team} vs {opponent}")
+    st.plotly_chart(fig)
+
+    # Most common final scores between the two
+    st.write("### Scorelines")
+    scorelines = index.scorelines(team, opponent).rename(columns={'team_score': team, 'opponent_score': opponent})
+    st.dataframe(scorelines, hide_index=True)
+
+    # Full game list
+    st.write("### All Games")
+    st.dataframe(games[['season_year', 'round', 'home_team', 'home_score', 'away_score', 'away_team', 'result',
+                        'wins', 'losses', 'ties', 'point_differential']], hide_index=True)
+
+
+# Call the function to display the Head to Head page
+head_to_head_page()
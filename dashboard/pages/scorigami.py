@@ -1,72 +1,16 @@
 import streamlit as st
-import psycopg2
-import pandas as pd
-import numpy as np
-import os
-from dotenv import load_dotenv
+from data import (get_games_by_score, get_scorigami_matrix, get_top_scorelines, get_scorigami_timeline,
+                  get_scorigami_probability)
 
-
-# Set up the connection to PostgreSQL
-load_dotenv()
-
-# Database connection settings from .env file
-DB_HOST = os.getenv("DB_HOST")
-DB_NAME = os.getenv("DB_NAME")
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-
-def get_db_connection():
-    conn = psycopg2.connect(
-        host=DB_HOST,
-        dbname=DB_NAME,
-        user=DB_USER,
-        password=DB_PASSWORD
-    )
-    return conn
-
-# Load the game data from the database
-def get_games():
-    conn = get_db_connection()
-    query = "SELECT * FROM games"
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df
-
-# Load team data from the database
-def get_teams():
-    conn = get_db_connection()
-    query = "SELECT * FROM teams"
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df
-
-# Load season data from the database
-def get_seasons():
-    conn = get_db_connection()
-    query = "SELECT * FROM seasons"
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df
+# The widgets are drawn before any data is loaded; the matrix (a full read of the games)
+# is only built once a score is actually checked.
 
 def scorigami_page():
     st.title("Scorigami Finder")
     st.write("Enter the score of a game (Home Team Score - Away Team Score) to check if it has ever happened in the NFL in this century.")
     
-    # Get the games data from the database
-    games_df = get_games()
-
-    # Check if 'season_year' exists, if not merge with seasons table
-    if 'season_year' not in games_df.columns:
-        seasons_df = get_seasons()
-        games_df = games_df.merge(seasons_df[['season_id', 'year']], left_on='season_id', right_on='season_id', how='left')
-        games_df['season_year'] = games_df['year']
-
-    # Get teams data and merge it to get team names based on IDs
-    teams_df = get_teams()  # This function should return a DataFrame with team_id and name
-    games_df = games_df.merge(teams_df[['team_id', 'name']], left_on='home_team_id', right_on='team_id', how='left')
-    games_df = games_df.rename(columns={'name': 'home_team'})
-    games_df = games_df.merge(teams_df[['team_id', 'name']], left_on='away_team_id', right_on='team_id', how='left')
-    games_df = games_df.rename(columns={'name': 'away_team'})
+    # Optionally ignore home/away and compare winner - loser scores
+    normalized = st.checkbox("Ignore home/away (compare winning score - losing score)")
 
     # User input for Home and Away Team scores
     col1, col2, col3 = st.columns([2, 1, 2])
@@ -79,33 +23,73 @@ def scorigami_page():
 
     # Button to check for scorigami
     if st.button("Check Scorigami"):
-        # Filter the games where the score matches the user input
-        matching_games = games_df[(games_df['home_score'] == home_score) & (games_df['away_score'] == away_score)]
-        
-        if matching_games.empty:
+        # Precomputed scorigami matrix (cached per data version)
+        matrix = get_scorigami_matrix(normalized=normalized)
+
+        # Check the matrix first and only query the matching games when there are any
+        if matrix.is_scorigami(home_score, away_score):
             st.markdown(f'<h3 style="color: red;">{home_score} - {away_score} has never happened in the NFL in this century!</h3>', unsafe_allow_html=True)
+
+            # How likely it is to happen, from the league's current-era scoring distributions
+            probability = get_scorigami_probability().probability(home_score, away_score, normalized=normalized)
+            if probability > 0:
+                st.write(f"Estimated chance of this final in a game today: {probability:.4%} (about 1 in {round(1 / probability):,} games)")
+            else:
+                st.write("That score never appears for one of the sides in the scoring data, so the chance can't be estimated.")
         else:
             st.markdown(f'<h3 style="color: green;">The following games match {home_score} - {away_score}:</h3>', unsafe_allow_html=True)
+            matching_games = get_games_by_score(home_score, away_score, normalized=normalized)
             
             for index, row in matching_games.iterrows():
                 st.markdown(f"""
                     <div style="padding: 10px; border: 2px solid #ccc; margin-bottom: 15px; border-radius: 8px;">
-                        <strong>{row['season_year']}:</strong> {row['home_team']} {home_score} - {away_score} {row['away_team']}
+                        <strong>{row['season_year']}:</strong> {row['home_team']} {row['home_score']} - {row['away_score']} {row['away_team']}
                     </div>
                 """, unsafe_allow_html=True)
 
     st.write("### 5 Most Common Scorelines in the NFL:")
 
-    # Get the most common scorelines (home_score - away_score)
-    scorelines = games_df.groupby(['home_score', 'away_score']).size().reset_index(name='count')
-    common_scorelines = scorelines.sort_values(by='count', ascending=False).head(5)
+    # Get the most common scorelines (from the scoreline_counts aggregate, or the matrix for snapshots)
+    common_scorelines = get_top_scorelines(5, normalized=normalized)
 
     # Display the most common scorelines and the number of times they occurred
-    for _, row in common_scorelines.iterrows():
+    for score_a, score_b, count in common_scorelines:
         st.markdown(f"""
             <div style="padding: 10px; border: 2px solid #ccc; margin-bottom: 15px; border-radius: 8px;">
-                <strong>{row['home_score']} - {row['away_score']}</strong>: {row['count']} occurrences
+                <strong>{score_a} - {score_b}</strong>: {count} occurrences
             </div>
         """, unsafe_allow_html=True)
 
+    # Probability model for a specific matchup (only loaded on request)
+    with st.expander("Scorigami Odds for a Matchup"):
+        if st.checkbox("Load scorigami odds", key="load_scorigami_odds"):
+            model = get_scorigami_probability()
+            options = ["Any team"] + model.teams
+            col1, col2 = st.columns(2)
+            with col1:
+                home_team = st.selectbox("Home Team", options, key="odds_home_team")
+            with col2:
+                away_team = st.selectbox("Away Team", options, key="odds_away_team")
+            home_team = None if home_team == "Any team" else home_team
+            away_team = None if away_team == "Any team" else away_team
+
+            # The whole score grid for the matchup in one vectorized product
+            grid = model.grid(home_team, away_team, normalized=normalized)
+            matrix = get_scorigami_matrix(normalized=normalized)
+            st.write(f"**Chance this game ends in a scorigami:** {model.scorigami_chance(grid, matrix):.2%}")
+            st.write("Most likely scorigamis:")
+            for score_a, score_b, probability in model.likely_scorigamis(grid, matrix, 5):
+                st.write(f"{score_a} - {score_b}: {probability:.3%}")
+
+    # Replay of history: how many new scorelines each season produced (only loaded on request)
+    with st.expander("Scorigami History"):
+        if st.checkbox("Load scorigami history", key="load_scorigami_history"):
+            timeline = get_scorigami_timeline(normalized=normalized)
+            seasons = timeline.season_table()
+            st.write(f"**Unique scorelines so far:** {timeline.unique_scorelines}")
+            st.write("Scorigamis per season")
+            st.bar_chart(seasons['scorigamis'])
+            st.write("Unique scorelines over time")
+            st.line_chart(seasons['cumulative_unique_scorelines'])
+
 scorigami_page()
@@ -1,132 +1,51 @@
 import streamlit as st
-import psycopg2
-import pandas as pd
-import os
-from dotenv import load_dotenv
-import plotly.express as px  # Plotly for advanced charts
-
-# Set up the connection to PostgreSQL
-load_dotenv()
-
-# Database connection settings from .env file
-DB_HOST = os.getenv("DB_HOST")
-DB_NAME = os.getenv("DB_NAME")
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-
-def get_db_connection():
-    conn = psycopg2.connect(
-        host=DB_HOST,
-        dbname=DB_NAME,
-        user=DB_USER,
-        password=DB_PASSWORD
-    )
-    return conn
-
-# Load the game data from the database
-def get_games():
-    conn = get_db_connection()
-    query = "SELECT * FROM games"
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df
-
-# Load team data from the database
-def get_teams():
-    conn = get_db_connection()
-    query = "SELECT * FROM teams"
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df
-
-# Load season data from the database
-def get_seasons():
-    conn = get_db_connection()
-    query = "SELECT * FROM seasons"
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df
+from data import get_teams, get_team_stats, get_team_games, get_super_bowl_games
+
+# Only the team list is needed to draw the selector; the stats engine and plotly are
+# loaded after it, so the page shows up before the heavy work starts.
 
 def team_info_page():
     st.title("Team Information")
     st.write("Select a team to view detailed stats.")
 
-    # Get the teams data
+    # Get the teams data (every team name with the franchise it belongs to)
     teams_df = get_teams()
 
-    # Normalize team names for relocated teams
-    team_mapping = {
-        'San Diego Chargers': 'Los Angeles Chargers',
-        'St Louis Rams': 'Los Angeles Rams',
-        'Oakland Raiders': 'Las Vegas Raiders',
-        'Washington Redskins': 'Washington Commanders',
-        'Washington': 'Washington Commanders'
-    }
-
-    # Replace team names based on the mapping
-    teams_df['normalized_name'] = teams_df['name'].replace(team_mapping)
-
-    # Let the user select a team (normalized name)
-    team_names = teams_df['normalized_name'].unique()
+    # Let the user select a franchise (relocated and renamed teams are grouped under their current name)
+    team_names = teams_df['franchise'].unique()
     team_name = st.selectbox("Select Team", team_names)
 
-    # Fetch stats for the selected team
-    selected_team = teams_df[teams_df['normalized_name'] == team_name].iloc[0]
+    # Team names the selected franchise has played under
+    franchise_teams = teams_df[teams_df['franchise'] == team_name]
+    franchise_id = int(franchise_teams['franchise_id'].iloc[0])
+    former_names = [name for name in franchise_teams['name'] if name != team_name]
 
     # Show basic team info
-    st.write(f"**Team:** {selected_team['name']}")
-
-    # Get games data and filter for all years
-    games_df = get_games()
-    
-    # Check if 'season_year' exists, if not merge with seasons table
-    if 'season_year' not in games_df.columns:
-        seasons_df = get_seasons()
-        games_df = games_df.merge(seasons_df[['season_id', 'year']], left_on='season_id', right_on='season_id', how='left')
-        games_df['season_year'] = games_df['year']
-
-    # Merge team names based on IDs to get 'home_team' and 'away_team' columns
-    games_df = games_df.merge(teams_df[['team_id', 'name']], left_on='home_team_id', right_on='team_id', how='left')
-    games_df = games_df.rename(columns={'name': 'home_team'})
-    games_df = games_df.merge(teams_df[['team_id', 'name']], left_on='away_team_id', right_on='team_id', how='left')
-    games_df = games_df.rename(columns={'name': 'away_team'})
-
-    # Normalize the 'home_team' and 'away_team' columns
-    games_df['home_team'] = games_df['home_team'].replace(team_mapping)
-    games_df['away_team'] = games_df['away_team'].replace(team_mapping)
-
-    # Filter games involving the selected team (by normalized name)
-    team_games = games_df[(games_df['home_team'] == team_name) | (games_df['away_team'] == team_name)]
-
-    # Calculate total number of games played by the team
-    total_games = team_games.shape[0]
-
-    # Calculate the number of wins (consider home and away)
-    team_games['win'] = team_games.apply(lambda row: 1 if (row['home_team'] == team_name and row['home_score'] > row['away_score']) or 
-                                         (row['away_team'] == team_name and row['away_score'] > row['home_score']) else 0, axis=1)
-    total_wins = team_games['win'].sum()
-
-    # Find the season with the most regular season wins
-    team_games['year'] = team_games['season_year']
-    regular_season_games = team_games[team_games['round'] == 'Regular Season']
-    team_wins = regular_season_games.groupby('year')['win'].sum().reset_index()
-    best_season = team_wins.loc[team_wins['win'].idxmax()]
-
-    # Calculate the number of playoff wins
-    playoff_games = team_games[team_games['round'] == 'Playoffs']
-
-    # Get Super Bowl Appearances with the years
-    super_bowl_appearances_df = games_df[(games_df['round'] == 'Super Bowl') & 
-                                         ((games_df['home_team'] == team_name) | (games_df['away_team'] == team_name))]
-    super_bowl_appearances_years = super_bowl_appearances_df['season_year'].tolist()
-    super_bowl_appearances = len(super_bowl_appearances_years)
+    st.write(f"**Team:** {team_name}")
+    if former_names:
+        st.write(f"**Also played as:** {', '.join(former_names)}")
+
+    # Look up the precomputed stats for the selected franchise
+    with st.spinner("Loading team stats..."):
+        team_stats = get_team_stats()
+    summary = team_stats.summary_for(franchise_id)
+    team_seasons = team_stats.seasons_for(franchise_id).reset_index()
+
+    # Totals (regular + playoffs)
+    total_games = int(summary['games'])
+    total_wins = int(summary['wins'])
 
-    # Get Super Bowl Wins with the years
-    super_bowl_wins_df = games_df[((games_df['home_team'] == team_name) & (games_df['home_score'] > games_df['away_score']) & 
-                                   (games_df['round'] == 'Super Bowl')) | 
-                                  ((games_df['away_team'] == team_name) & (games_df['away_score'] > games_df['home_score']) & 
-                                   (games_df['round'] == 'Super Bowl'))]
-    super_bowl_wins_years = super_bowl_wins_df['season_year'].tolist()
+    # Season with the most regular season wins
+    best_season = {'year': int(summary['best_season']), 'win': int(summary['best_season_wins'])}
+
+    # Playoff record
+    playoff_wins = int(summary['playoff_wins'])
+    playoff_losses = int(summary['playoff_losses'])
+
+    # Get Super Bowl Appearances and Wins with the years
+    super_bowl_appearances_years = team_stats.super_bowl_years(franchise_id)
+    super_bowl_appearances = len(super_bowl_appearances_years)
+    super_bowl_wins_years = team_stats.super_bowl_years(franchise_id, wins_only=True)
     super_bowl_wins = len(super_bowl_wins_years)
 
     # Display Team Information in a white curved box
@@ -136,26 +55,37 @@ def team_info_page():
             <p><strong>Games Played:</strong> {}</p>
             <p><strong>Total Wins (Regular + Playoffs):</strong> {}</p>
             <p><strong>Season with Most Regular Season Wins:</strong> {} ({}) wins</p>
+            <p><strong>Playoff Record:</strong> {}-{}</p>
             <p><strong>Super Bowl Appearances:</strong> {} ({})</p>
             <p><strong>Super Bowl Wins:</strong> {} ({}) 🏆</p>
         </div>
-    """.format(total_games, total_wins, best_season['year'], best_season['win'], 
+    """.format(total_games, total_wins, best_season['year'], best_season['win'], playoff_wins, playoff_losses,
                super_bowl_appearances, ', '.join(map(str, super_bowl_appearances_years)), 
                super_bowl_wins, ', '.join(map(str, super_bowl_wins_years))), unsafe_allow_html=True)
 
+    # Super Bowl games involving the team (queried with the team filter pushed down to SQL)
+    team_ids = franchise_teams['team_id'].tolist()
+    super_bowl_games = get_super_bowl_games(team_ids)
+    if not super_bowl_games.empty:
+        st.write("### Super Bowl Games")
+        for _, row in super_bowl_games.iterrows():
+            st.markdown(f"**{row['season_year']}:** {row['home_team']} {row['home_score']} - {row['away_score']} {row['away_team']}")
+
+    # Full game log, only fetched when expanded
+    with st.expander("All Games"):
+        if st.checkbox("Load game log", key="load_game_log"):
+            st.dataframe(get_team_games(team_ids), hide_index=True)
+
     # Visualizations
     st.write("### Team Performance over Time")
+    import plotly.express as px  # Plotly for advanced charts (imported here, it is slow to import)
 
-    # Winning percentage per season
-    team_games['win_percentage'] = team_games['win'].groupby(team_games['season_year']).transform('mean')
-    win_percentage = team_games.groupby('season_year')['win_percentage'].first().reset_index()
-
-    # Plotting the winning percentage over the years
-    fig = px.line(win_percentage, x='season_year', y='win_percentage', title=f"{team_name} Winning Percentage Over Time")
+    # Plotting the winning percentage over the years (regular season and playoffs combined)
+    fig = px.line(team_seasons, x='season_year', y='win_percentage', title=f"{team_name} Winning Percentage Over Time")
     st.plotly_chart(fig)
 
     # Plot number of wins per season
-    team_wins_fig = px.bar(team_wins, x='year', y='win', title=f"{team_name} Wins Per Season")
+    team_wins_fig = px.bar(team_seasons, x='season_year', y='regular_season_wins', title=f"{team_name} Wins Per Season")
     st.plotly_chart(team_wins_fig)
 
 
@@ -0,0 +1,98 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+# Cold-start / rerun timing report for the dashboard pages.
+#
+# Every page is run in a fresh Python process (so nothing is imported or cached yet) with
+# streamlit's AppTest harness: the report shows how long importing the data layer takes, how
+# long the first run of the page takes, how long a rerun with warm caches takes, and which
+# heavy modules the page ended up importing.
+#
+#   python startup_timing.py --snapshot ../nfl_snapshot     # no database needed
+#   python startup_timing.py --output startup.json           # against the .env database
+
+DASHBOARD_DIR = os.path.dirname(os.path.abspath(__file__))
+PAGES = ["app.py", "pages/scorigami.py", "pages/team_info.py", "pages/head_to_head.py"]
+HEAVY_MODULES = ["pandas", "numpy", "psycopg2", "plotly", "dotenv", "scorigami_matrix", "team_stats", "snapshot"]
+
+# Function to time one page in the current (fresh) process
+def time_page(page, timeout=60):
+    sys.path.insert(0, DASHBOARD_DIR)
+
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    streamlit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    import data  # noqa: F401
+    import_seconds = time.perf_counter() - start
+    loaded_after_import = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    app = AppTest.from_file(os.path.join(DASHBOARD_DIR, page), default_timeout=timeout)
+    start = time.perf_counter()
+    app.run()
+    first_run_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    app.run()
+    rerun_seconds = time.perf_counter() - start
+
+    return {
+        "page": page,
+        "streamlit_import_seconds": round(streamlit_seconds, 3),
+        "data_import_seconds": round(import_seconds, 3),
+        "first_run_seconds": round(first_run_seconds, 3),
+        "rerun_seconds": round(rerun_seconds, 3),
+        "exceptions": [str(exception.value) for exception in app.exception],
+        "heavy_modules_after_import": loaded_after_import,
+        "heavy_modules_after_run": [name for name in HEAVY_MODULES if name in sys.modules]
+    }
+
+# Function to time every page, each in its own interpreter
+def run_report(pages=PAGES, snapshot=None, timeout=60):
+    env = dict(os.environ)
+    if snapshot:
+        env["DASHBOARD_SNAPSHOT"] = os.path.abspath(snapshot)
+
+    results = []
+    for page in pages:
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", page, "--timeout", str(timeout)],
+            env=env, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        result["process_seconds"] = round(time.perf_counter() - start, 3)
+        results.append(result)
+        print(f"{page:22s} cold {result['first_run_seconds']:6.3f}s  rerun {result['rerun_seconds']:6.3f}s  "
+              f"data import {result['data_import_seconds']:6.3f}s  process {result['process_seconds']:6.3f}s")
+        for exception in result["exceptions"]:
+            print(f"  exception: {exception}")
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "snapshot": snapshot,
+        "pages": results
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure dashboard cold-start and rerun times per page")
+    parser.add_argument("--snapshot", default=None, help="Serve from this snapshot directory instead of PostgreSQL")
+    parser.add_argument("--pages", nargs="+", default=PAGES, help="Pages to time (relative to dashboard/)")
+    parser.add_argument("--timeout", type=int, default=60, help="Seconds allowed per page run")
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(time_page(args.child, args.timeout)))
+    else:
+        report = run_report(args.pages, args.snapshot, args.timeout)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=4)
+            print(f"Report written to {args.output}")
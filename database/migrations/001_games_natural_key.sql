@@ -0,0 +1,17 @@
+-- Adds the games natural key to an existing database without a full reset.
+-- Run with: psql -U new_user -d nfl_db -f migrations/001_games_natural_key.sql
+
+BEGIN;
+
+-- Remove duplicates left behind by earlier re-runs of load.py (keep the oldest row)
+DELETE FROM games a
+USING games b
+WHERE a.game_id > b.game_id
+  AND a.season_id = b.season_id
+  AND COALESCE(a.week, -1) = COALESCE(b.week, -1)
+  AND a.home_team_id = b.home_team_id
+  AND a.away_team_id = b.away_team_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS games_natural_key ON games (season_id, COALESCE(week, -1), home_team_id, away_team_id);
+
+COMMIT;
@@ -0,0 +1,15 @@
+-- Adds the data version stamp used by the dashboard caches to an existing database.
+-- max_game_id and rebuild_version tell the dashboard whether a new version only appended games
+-- (extend the incremental structures) or changed existing rows (rebuild them).
+-- Run with: psql -U new_user -d nfl_db -f migrations/002_data_version.sql
+
+CREATE TABLE IF NOT EXISTS data_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),  -- Single-row table
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    max_game_id INTEGER,                              -- Highest game_id when the version was bumped
+    rebuild_version INTEGER NOT NULL DEFAULT 0,       -- Last version whose load changed existing rows
+    rows_changed BOOLEAN NOT NULL DEFAULT FALSE       -- Existing rows changed since the last bump
+);
+
+INSERT INTO data_version (max_game_id) SELECT MAX(game_id) FROM games ON CONFLICT (id) DO NOTHING;
@@ -0,0 +1,26 @@
+-- Adds the aggregate views maintained by pipeline/load.py to an existing database
+-- (the per-franchise aggregates are added by 005_franchises.sql).
+-- Run with: psql -U new_user -d nfl_db -f migrations/003_aggregate_views.sql
+
+BEGIN;
+
+-- Refreshed by pipeline/load.py after each load.
+-- The unique index allows REFRESH MATERIALIZED VIEW CONCURRENTLY, so dashboard reads never block.
+
+-- Number of games per final scoreline, with the first and most recent game (in season, season type
+-- and week order: game_id alone is not chronological)
+CREATE MATERIALIZED VIEW scoreline_counts AS
+SELECT g.home_score, g.away_score,
+       COUNT(*) AS games,
+       (ARRAY_AGG(g.game_id ORDER BY s.year, CASE s.type WHEN 'regular-season' THEN 0 ELSE 1 END,
+                                     g.week NULLS LAST, g.game_id))[1] AS first_game_id,
+       (ARRAY_AGG(g.game_id ORDER BY s.year DESC, CASE s.type WHEN 'regular-season' THEN 0 ELSE 1 END DESC,
+                                     g.week DESC NULLS FIRST, g.game_id DESC))[1] AS last_game_id
+FROM games g
+JOIN seasons s ON s.season_id = g.season_id
+WHERE g.home_score IS NOT NULL AND g.away_score IS NOT NULL
+GROUP BY g.home_score, g.away_score;
+
+CREATE UNIQUE INDEX scoreline_counts_key ON scoreline_counts (home_score, away_score);
+
+COMMIT;
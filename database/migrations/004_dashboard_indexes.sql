@@ -0,0 +1,8 @@
+-- Adds the indexes behind the dashboard's targeted queries to an existing database.
+-- Run with: psql -U new_user -d nfl_db -f migrations/004_dashboard_indexes.sql
+
+-- Indexes for the dashboard's targeted lookups (season_id lookups use games_natural_key)
+CREATE INDEX IF NOT EXISTS games_score_idx ON games (home_score, away_score);
+CREATE INDEX IF NOT EXISTS games_home_team_idx ON games (home_team_id, season_id);
+CREATE INDEX IF NOT EXISTS games_away_team_idx ON games (away_team_id, season_id);
+CREATE INDEX IF NOT EXISTS games_super_bowl_idx ON games (season_id) WHERE round = 'Super Bowl';
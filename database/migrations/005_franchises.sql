@@ -0,0 +1,89 @@
+-- Adds franchises, the team -> franchise link and the per-franchise aggregates to an existing
+-- database. The team -> franchise mapping lives only in pipeline/franchises.py: here every
+-- existing team starts out as its own franchise, and the loader then links relocated and renamed
+-- teams to their franchise (it keeps the link up to date on every load):
+--   psql -U new_user -d nfl_db -f migrations/005_franchises.sql
+--   python pipeline/load.py --link-franchises
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS franchises (
+    franchise_id SERIAL PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL
+);
+
+ALTER TABLE teams ADD COLUMN IF NOT EXISTS franchise_id INTEGER REFERENCES franchises(franchise_id);
+CREATE INDEX IF NOT EXISTS teams_franchise_idx ON teams (franchise_id);
+
+INSERT INTO franchises (name)
+SELECT name FROM teams
+ON CONFLICT (name) DO NOTHING;
+
+UPDATE teams t
+SET franchise_id = f.franchise_id
+FROM franchises f
+WHERE f.name = t.name AND t.franchise_id IS NULL;
+
+ALTER TABLE teams ALTER COLUMN franchise_id SET NOT NULL;
+
+-- The per-team aggregates created by earlier versions of 003_aggregate_views.sql are replaced by
+-- the per-franchise ones below
+DROP MATERIALIZED VIEW IF EXISTS team_season_records, team_playoff_records;
+DROP VIEW IF EXISTS team_games;
+
+-- Every game from each team's point of view (two rows per game), with both sides' franchises
+CREATE VIEW team_games AS
+SELECT g.game_id, g.season_id, s.year, s.type AS season_type, g.week, g.round,
+       g.home_team_id AS team_id, g.away_team_id AS opponent_id,
+       ht.franchise_id, at.franchise_id AS opponent_franchise_id,
+       g.home_score AS points_for, g.away_score AS points_against, TRUE AS is_home
+FROM games g
+JOIN seasons s ON s.season_id = g.season_id
+JOIN teams ht ON ht.team_id = g.home_team_id
+JOIN teams at ON at.team_id = g.away_team_id
+UNION ALL
+SELECT g.game_id, g.season_id, s.year, s.type AS season_type, g.week, g.round,
+       g.away_team_id AS team_id, g.home_team_id AS opponent_id,
+       at.franchise_id, ht.franchise_id AS opponent_franchise_id,
+       g.away_score AS points_for, g.home_score AS points_against, FALSE AS is_home
+FROM games g
+JOIN seasons s ON s.season_id = g.season_id
+JOIN teams ht ON ht.team_id = g.home_team_id
+JOIN teams at ON at.team_id = g.away_team_id;
+
+-- Aggregates below are refreshed by pipeline/load.py after each load. Games without a final score
+-- don't count towards the records; the dashboard's team stats are read from these views.
+-- The unique indexes allow REFRESH MATERIALIZED VIEW CONCURRENTLY, so dashboard reads never block.
+
+-- Win/loss/tie record per franchise per season (regular season and post-season separately)
+CREATE MATERIALIZED VIEW franchise_season_records AS
+SELECT franchise_id, year, season_type,
+       COUNT(*) AS games,
+       COUNT(*) FILTER (WHERE points_for > points_against) AS wins,
+       COUNT(*) FILTER (WHERE points_for < points_against) AS losses,
+       COUNT(*) FILTER (WHERE points_for = points_against) AS ties,
+       SUM(points_for) AS points_for,
+       SUM(points_against) AS points_against
+FROM team_games
+WHERE points_for IS NOT NULL AND points_against IS NOT NULL
+GROUP BY franchise_id, year, season_type;
+
+CREATE UNIQUE INDEX franchise_season_records_key ON franchise_season_records (franchise_id, year, season_type);
+
+-- Playoff record and Super Bowl history per franchise
+CREATE MATERIALIZED VIEW franchise_playoff_records AS
+SELECT franchise_id,
+       COUNT(*) AS playoff_games,
+       COUNT(*) FILTER (WHERE points_for > points_against) AS playoff_wins,
+       COUNT(*) FILTER (WHERE points_for < points_against) AS playoff_losses,
+       COUNT(*) FILTER (WHERE round = 'Super Bowl') AS super_bowl_appearances,
+       COUNT(*) FILTER (WHERE round = 'Super Bowl' AND points_for > points_against) AS super_bowl_wins,
+       COALESCE(ARRAY_AGG(year ORDER BY year) FILTER (WHERE round = 'Super Bowl'), '{}') AS super_bowl_years,
+       COALESCE(ARRAY_AGG(year ORDER BY year) FILTER (WHERE round = 'Super Bowl' AND points_for > points_against), '{}') AS super_bowl_win_years
+FROM team_games
+WHERE round NOT IN ('Regular Season', 'Pro Bowl') AND points_for IS NOT NULL AND points_against IS NOT NULL
+GROUP BY franchise_id;
+
+CREATE UNIQUE INDEX franchise_playoff_records_key ON franchise_playoff_records (franchise_id);
+
+COMMIT;
@@ -1,5 +1,9 @@
--- Drop existing tables if they exist
-DROP TABLE IF EXISTS games, teams, seasons;
+-- Drop existing views and tables if they exist (team_season_records / team_playoff_records were
+-- replaced by the franchise aggregates; CASCADE also drops whatever still depends on team_games)
+DROP MATERIALIZED VIEW IF EXISTS franchise_season_records, scoreline_counts, franchise_playoff_records,
+    team_season_records, team_playoff_records CASCADE;
+DROP VIEW IF EXISTS team_games CASCADE;
+DROP TABLE IF EXISTS games, teams, franchises, seasons, data_version;
 
 -- Seasons Table
 CREATE TABLE seasons (
@@ -9,12 +13,21 @@ CREATE TABLE seasons (
     CONSTRAINT unique_season UNIQUE (year, type)  -- Add unique constraint for year and type
 );
 
--- Teams Table
+-- Franchises Table (one row per franchise, named after its current team name)
+CREATE TABLE franchises (
+    franchise_id SERIAL PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL
+);
+
+-- Teams Table (every name a franchise has played under, see pipeline/franchises.py)
 CREATE TABLE teams (
     team_id SERIAL PRIMARY KEY,
-    name TEXT UNIQUE NOT NULL  -- Ensure 'name' is unique
+    name TEXT UNIQUE NOT NULL,  -- Ensure 'name' is unique
+    franchise_id INTEGER NOT NULL REFERENCES franchises(franchise_id)
 );
 
+CREATE INDEX teams_franchise_idx ON teams (franchise_id);
+
 -- Games Table
 CREATE TABLE games (
     game_id SERIAL PRIMARY KEY,
@@ -30,3 +43,98 @@ CREATE TABLE games (
     FOREIGN KEY (home_team_id) REFERENCES teams(team_id) ON DELETE CASCADE,
     FOREIGN KEY (away_team_id) REFERENCES teams(team_id) ON DELETE CASCADE
 );
+
+-- Natural key for games so reloads upsert instead of duplicating (unknown weeks are stored as NULL)
+CREATE UNIQUE INDEX games_natural_key ON games (season_id, COALESCE(week, -1), home_team_id, away_team_id);
+
+-- Indexes for the dashboard's targeted lookups (season_id lookups use games_natural_key)
+CREATE INDEX games_score_idx ON games (home_score, away_score);
+CREATE INDEX games_home_team_idx ON games (home_team_id, season_id);
+CREATE INDEX games_away_team_idx ON games (away_team_id, season_id);
+CREATE INDEX games_super_bowl_idx ON games (season_id) WHERE round = 'Super Bowl';
+
+
+-- Every game from each team's point of view (two rows per game), with both sides' franchises
+CREATE VIEW team_games AS
+SELECT g.game_id, g.season_id, s.year, s.type AS season_type, g.week, g.round,
+       g.home_team_id AS team_id, g.away_team_id AS opponent_id,
+       ht.franchise_id, at.franchise_id AS opponent_franchise_id,
+       g.home_score AS points_for, g.away_score AS points_against, TRUE AS is_home
+FROM games g
+JOIN seasons s ON s.season_id = g.season_id
+JOIN teams ht ON ht.team_id = g.home_team_id
+JOIN teams at ON at.team_id = g.away_team_id
+UNION ALL
+SELECT g.game_id, g.season_id, s.year, s.type AS season_type, g.week, g.round,
+       g.away_team_id AS team_id, g.home_team_id AS opponent_id,
+       at.franchise_id, ht.franchise_id AS opponent_franchise_id,
+       g.away_score AS points_for, g.home_score AS points_against, FALSE AS is_home
+FROM games g
+JOIN seasons s ON s.season_id = g.season_id
+JOIN teams ht ON ht.team_id = g.home_team_id
+JOIN teams at ON at.team_id = g.away_team_id;
+
+-- Aggregates below are refreshed by pipeline/load.py after each load. Games without a final score
+-- don't count towards the records; the dashboard's team stats are read from these views.
+-- The unique indexes allow REFRESH MATERIALIZED VIEW CONCURRENTLY, so dashboard reads never block.
+
+-- Win/loss/tie record per franchise per season (regular season and post-season separately)
+CREATE MATERIALIZED VIEW franchise_season_records AS
+SELECT franchise_id, year, season_type,
+       COUNT(*) AS games,
+       COUNT(*) FILTER (WHERE points_for > points_against) AS wins,
+       COUNT(*) FILTER (WHERE points_for < points_against) AS losses,
+       COUNT(*) FILTER (WHERE points_for = points_against) AS ties,
+       SUM(points_for) AS points_for,
+       SUM(points_against) AS points_against
+FROM team_games
+WHERE points_for IS NOT NULL AND points_against IS NOT NULL
+GROUP BY franchise_id, year, season_type;
+
+CREATE UNIQUE INDEX franchise_season_records_key ON franchise_season_records (franchise_id, year, season_type);
+
+-- Number of games per final scoreline, with the first and most recent game (in season, season type
+-- and week order: game_id alone is not chronological)
+CREATE MATERIALIZED VIEW scoreline_counts AS
+SELECT g.home_score, g.away_score,
+       COUNT(*) AS games,
+       (ARRAY_AGG(g.game_id ORDER BY s.year, CASE s.type WHEN 'regular-season' THEN 0 ELSE 1 END,
+                                     g.week NULLS LAST, g.game_id))[1] AS first_game_id,
+       (ARRAY_AGG(g.game_id ORDER BY s.year DESC, CASE s.type WHEN 'regular-season' THEN 0 ELSE 1 END DESC,
+                                     g.week DESC NULLS FIRST, g.game_id DESC))[1] AS last_game_id
+FROM games g
+JOIN seasons s ON s.season_id = g.season_id
+WHERE g.home_score IS NOT NULL AND g.away_score IS NOT NULL
+GROUP BY g.home_score, g.away_score;
+
+CREATE UNIQUE INDEX scoreline_counts_key ON scoreline_counts (home_score, away_score);
+
+-- Playoff record and Super Bowl history per franchise
+CREATE MATERIALIZED VIEW franchise_playoff_records AS
+SELECT franchise_id,
+       COUNT(*) AS playoff_games,
+       COUNT(*) FILTER (WHERE points_for > points_against) AS playoff_wins,
+       COUNT(*) FILTER (WHERE points_for < points_against) AS playoff_losses,
+       COUNT(*) FILTER (WHERE round = 'Super Bowl') AS super_bowl_appearances,
+       COUNT(*) FILTER (WHERE round = 'Super Bowl' AND points_for > points_against) AS super_bowl_wins,
+       COALESCE(ARRAY_AGG(year ORDER BY year) FILTER (WHERE round = 'Super Bowl'), '{}') AS super_bowl_years,
+       COALESCE(ARRAY_AGG(year ORDER BY year) FILTER (WHERE round = 'Super Bowl' AND points_for > points_against), '{}') AS super_bowl_win_years
+FROM team_games
+WHERE round NOT IN ('Regular Season', 'Pro Bowl') AND points_for IS NOT NULL AND points_against IS NOT NULL
+GROUP BY franchise_id;
+
+CREATE UNIQUE INDEX franchise_playoff_records_key ON franchise_playoff_records (franchise_id);
+
+-- Data version stamp, bumped by pipeline/load.py after every load so the dashboard knows when to refresh its caches.
+-- The dashboard extends its incremental structures with the games after their last game_id only while
+-- every load since was insert-only; rebuild_version and max_game_id tell it when to rebuild instead.
+CREATE TABLE data_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),  -- Single-row table
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    max_game_id INTEGER,                              -- Highest game_id when the version was bumped
+    rebuild_version INTEGER NOT NULL DEFAULT 0,       -- Last version whose load changed existing rows
+    rows_changed BOOLEAN NOT NULL DEFAULT FALSE       -- Existing rows changed since the last bump
+);
+
+INSERT INTO data_version DEFAULT VALUES;
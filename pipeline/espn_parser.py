@@ -0,0 +1,141 @@
+from collections import namedtuple
+
+# Single parser for ESPN scoreboard payloads, shared by extract.py (database export)
+# and results/season_results.py (per-week results report).
+#
+# parse_events walks a payload once and yields compact GameRecord tuples; every output
+# is then built from those records, so a payload is never parsed twice.
+
+# One parsed game (namedtuple, so no per-instance __dict__)
+GameRecord = namedtuple('GameRecord', [
+    'season_year',   # str, e.g. '2023'
+    'season_type',   # 'regular-season' or 'post-season'
+    'week',          # int, or 'Unknown Week'
+    'home_team',
+    'away_team',
+    'home_score',    # str, as delivered by ESPN
+    'away_score',
+    'round_type'     # 'Regular Season', 'Wild Card Round', ..., 'Super Bowl' or 'Pro Bowl'
+])
+
+# One game of a live payload: ESPN event id, game date (YYYY-MM-DD), status state
+# ('pre', 'in' or 'post'), whether the result is final, and the parsed GameRecord
+LiveGame = namedtuple('LiveGame', ['event_id', 'date', 'state', 'completed', 'record'])
+
+SEASON_TYPES = ('regular-season', 'post-season')
+
+# Version of the round classification rules. Bump it whenever classify_round changes: extract.py
+# records it in its manifest and re-parses every season (final ones included) when it differs, so
+# games extracted under the old rules are rewritten, and the next load updates their stored round.
+PARSER_VERSION = 1
+
+# Function to classify the round of a game.
+# Event notes ("Super Bowl", "Conference Championship") win; otherwise post-season games are
+# classified by week. The Pro Bowl is played the week after the Super Bowl up to 2008 and the
+# week before it from 2009 on.
+def classify_round(year, season_slug, playoff_week, competition):
+    round_type = 'Regular Season'
+
+    # Check if any notes are present for event headlines like "Super Bowl" or "Conference Championship"
+    for note in competition.get('notes', []):
+        if note.get('type') == 'event' and 'headline' in note:
+            headline = note['headline'].lower()  # Convert headline to lowercase for case-insensitive matching
+
+            if 'super bowl' in headline:
+                round_type = 'Super Bowl'
+            elif 'conference championship' in headline:
+                round_type = 'Championship Round'
+
+    if season_slug != 'post-season':
+        return round_type
+
+    # Override round_type if it's a playoff game that isn't explicitly marked by the event notes
+    if playoff_week == 1 and round_type == 'Regular Season':
+        return 'Wild Card Round'
+    if playoff_week == 2 and round_type == 'Regular Season':
+        return 'Divisional Round'
+    if playoff_week == 3 and round_type == 'Regular Season':
+        return 'Championship Round'
+    if (year >= 2009 and playoff_week == 4) or (year <= 2008 and playoff_week == 5):
+        return 'Pro Bowl'
+    if playoff_week == 4 or playoff_week == 5:
+        return 'Super Bowl'
+    return round_type
+
+# Generator yielding a GameRecord for every regular or post-season game of `year` in a payload.
+# If a `skipped` dict is given, dropped events are counted in it by reason.
+def parse_events(data, year, skipped=None):
+    year = int(year)
+    wanted_year = str(year)
+
+    for game in data.get('events', []):
+        season = game.get('season', {})
+        season_year = str(season.get('year'))
+        season_slug = season.get('slug')
+
+        # Only include the game if the season year matches the year we want
+        # and it is a regular season or post-season game (exclude preseason)
+        if season_year != wanted_year or season_slug not in SEASON_TYPES:
+            if skipped is not None:
+                reason = 'other_season' if season_year != wanted_year else (season_slug or 'unknown')
+                skipped[reason] = skipped.get(reason, 0) + 1
+            continue
+
+        yield event_record(game, year, season_year, season_slug)
+
+# Function to build the GameRecord of one event (already known to be a regular or post-season game of `year`)
+def event_record(game, year, season_year, season_slug):
+    # Extract the week number from the game data, if available
+    week = game.get('week')
+    week_number = week['number'] if week and 'number' in week else 'Unknown Week'
+
+    # Home and away teams with their scores
+    competition = game['competitions'][0]
+    home, away = competition['competitors'][0], competition['competitors'][1]
+
+    playoff_week = week_number if week_number != 'Unknown Week' else None
+    return GameRecord(
+        season_year,
+        season_slug,
+        week_number,
+        home['team']['displayName'],
+        away['team']['displayName'],
+        home['score'],
+        away['score'],
+        classify_round(year, season_slug, playoff_week, competition)
+    )
+
+# Generator yielding a LiveGame for every regular or post-season event of a live (current week) payload,
+# whatever its season. Games that have not started yet have state 'pre'.
+def parse_live_events(data):
+    for game in data.get('events', []):
+        season = game.get('season', {})
+        season_slug = season.get('slug')
+        if season_slug not in SEASON_TYPES or season.get('year') is None:
+            continue
+
+        status = (game.get('status') or {}).get('type') or {}
+        yield LiveGame(
+            str(game.get('id')),
+            (game.get('date') or '')[:10],
+            status.get('state', 'pre'),
+            bool(status.get('completed', False)),
+            event_record(game, int(season['year']), str(season['year']), season_slug)
+        )
+
+# Function to convert a record to the game dict stored in nfl_data_all_years.json
+def game_to_dict(record):
+    return {
+        'season_year': record.season_year,
+        'season_type': record.season_type,
+        'home_team': record.home_team,
+        'away_team': record.away_team,
+        'home_score': record.home_score,
+        'away_score': record.away_score,
+        'week': record.week,
+        'round_type': record.round_type,
+    }
+
+# Function to format a record as "Home Team Score - Away Team Score"
+def result_string(record):
+    return f"{record.home_team} {record.home_score} - {record.away_score} {record.away_team}"
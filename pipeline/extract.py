@@ -1,142 +1,215 @@
 import requests
 import json
+import os
+import time
+import threading
+import argparse
+from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+import run_metrics
+from response_cache import ResponseCache, is_final_dates
+from espn_parser import PARSER_VERSION, parse_events, game_to_dict
+from fast_decode import decode_scoreboard
+from week_report import save_week_report
 
-# Function to fetch and process the games for a given year
-def fetch_and_process_games(year):
-    # Initialize dictionaries to store results by week and playoff rounds
+# Base URL for the ESPN scoreboard endpoint (override to point at a local stand-in)
+SCOREBOARD_URL = os.getenv(
+    "ESPN_SCOREBOARD_URL",
+    "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
+)
+
+# Default output files
+OUTPUT_FILE = "nfl_data_all_years.json"
+MANIFEST_FILE = "nfl_data_manifest.json"
+DATA_DIR = "nfl_data"  # One newline-delimited JSON file per season when streaming
+
+# Status codes that are worth retrying
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Function to build the scoreboard URL for a calendar year
+def build_scoreboard_url(dates):
+    return f"{SCOREBOARD_URL}?limit=1000&dates={dates}"
+
+# Function to create a pooled HTTP session shared by all fetches
+def create_session(pool_size=10):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# Simple thread-safe limiter that spaces requests out to a maximum rate
+class RateLimiter:
+    def __init__(self, requests_per_second=None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.lock = threading.Lock()
+        self.next_time = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            wait_time = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+# Function to GET a URL with retries, exponential backoff and per-request timing.
+# If a `stats` dict is given, requests, retries and downloaded bytes are added to it.
+def fetch_url(url, session=None, retries=3, backoff=0.5, timeout=30, rate_limiter=None, headers=None, stats=None):
+    http = session or requests
+    attempt = 0
+    while True:
+        if rate_limiter:
+            rate_limiter.wait()
+        if stats is not None:
+            stats["requests"] = stats.get("requests", 0) + 1
+            stats["retries"] = stats.get("retries", 0) + (1 if attempt else 0)
+        start = time.perf_counter()
+        try:
+            response = http.get(url, timeout=timeout, headers=headers)
+        except requests.RequestException as e:
+            elapsed = time.perf_counter() - start
+            print(f"GET {url} failed after {elapsed:.2f}s: {e}")
+            run_metrics.active.log("http_request", url=url, error=str(e), seconds=round(elapsed, 4), attempt=attempt)
+            if attempt >= retries:
+                raise
+        else:
+            elapsed = time.perf_counter() - start
+            print(f"GET {url} -> {response.status_code} in {elapsed:.2f}s")
+            run_metrics.active.log("http_request", url=url, status=response.status_code, seconds=round(elapsed, 4),
+                                   bytes=len(response.content), attempt=attempt)
+            if stats is not None:
+                stats["bytes"] = stats.get("bytes", 0) + len(response.content)
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= retries:
+                return response
+
+        # Back off before the next attempt (0.5s, 1s, 2s, ...)
+        time.sleep(backoff * (2 ** attempt))
+        attempt += 1
+
+# Function to fetch the scoreboard payload for a calendar year, going through the cache if one is given.
+# Returns (status_code, data) where data is None unless the status is 200.
+def fetch_scoreboard(dates, session=None, rate_limiter=None, cache=None, stats=None):
+    url = build_scoreboard_url(dates)
+
+    if cache is None:
+        response = fetch_url(url, session=session, rate_limiter=rate_limiter, stats=stats)
+        return response.status_code, (decode_scoreboard(response.content) if response.status_code == 200 else None)
+
+    def fetcher(url, headers):
+        return fetch_url(url, session=session, rate_limiter=rate_limiter, headers=headers, stats=stats)
+
+    status, body = cache.fetch(url, fetcher, final=is_final_dates(dates))
+    return status, (decode_scoreboard(body) if body is not None else None)
+
+# Function to get when the payload just returned for a calendar year was downloaded (epoch seconds).
+# A copy served from the cache (including a stale one served after an upstream error) keeps its
+# original download time.
+def payload_fetched_at(dates, cache=None):
+    if cache is None:
+        return time.time()
+    entry = cache.read_entry(build_scoreboard_url(dates))
+    return entry["fetched_at"] if entry is not None else time.time()
+
+# Function to fetch both payloads covering a season (the season's calendar year and the
+# following year, which holds its playoffs) and parse them once into GameRecords.
+# Returns None if the season's own payload could not be fetched.
+# If a `stats` dict is given, fetch and parse counters for the season are filled in.
+def fetch_season_records(year, session=None, rate_limiter=None, cache=None, stats=None):
+    stats = {} if stats is None else stats
+    skipped = stats.setdefault("skipped", {})
+    start = time.perf_counter()
+    status, data = fetch_scoreboard(year, session=session, rate_limiter=rate_limiter, cache=cache, stats=stats)
+    stats["status"] = status
+    stats["fetched_at"] = payload_fetched_at(year, cache)
+
+    if status != 200:
+        stats["fetch_seconds"] = round(time.perf_counter() - start, 4)
+        print(f"Error fetching data for {year}: {status}")
+        return None
+
+    stats["events"] = len(data.get('events', []))
+    records = list(parse_events(data, year, skipped))
+
+    # Process the next year (playoffs are played in the following calendar year)
+    status, data = fetch_scoreboard(year + 1, session=session, rate_limiter=rate_limiter, cache=cache, stats=stats)
+    stats["next_year_status"] = status
+    stats["next_year_fetched_at"] = payload_fetched_at(year + 1, cache)
+
+    if status == 200:
+        stats["events"] += len(data.get('events', []))
+        records.extend(parse_events(data, year, skipped))
+    else:
+        print(f"Error fetching the {year} playoffs ({year + 1} payload): {status}")
+
+    stats["fetch_seconds"] = round(time.perf_counter() - start, 4)
+    stats["parsed"] = len(records)
+    print(f"Data fetched for {year}")
+    return records
+
+# Function to fetch and process the games for a given year.
+# If report_dir is given, the per-week results report is written from the same parsed records.
+# If a `season_stats` dict is given, the season's fetch stats are stored in it under the year.
+def fetch_and_process_games(year, session=None, rate_limiter=None, cache=None, report_dir=None, season_stats=None):
     teams = set()  # Set to collect unique team names
     seasons = set()  # Set to collect unique season-year pairs
     games = []  # List to store game data
 
-    # Base URL for fetching data for the given year
-    url = f"https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard?limit=1000&dates={year}"
-
-    # Function to process data and append to the dictionary
-    def process_game_data(data):
-        nonlocal teams, seasons, games
-
-        # Iterate over the games data
-        for game in data.get('events', []):
-            # Extract the basic game information
-            season = game.get('season', {})
-            season_year = str(season.get('year'))
-            season_slug = season.get('slug')
-
-            # Only include the game if the season year matches the year we want
-            if season_year != str(year):
-                continue  # Skip if the season year does not match the current year
-
-            # Check if the game is regular season or post-season (exclude preseason)
-            if season_slug not in ['regular-season', 'post-season']:
-                continue  # Skip if it's not a regular season or post-season game
-            
-            # Extract the week number from the game data, if available
-            week_number = 'Unknown Week'  # Default value if 'week' or 'number' is missing
-            if 'week' in game and 'number' in game['week']:
-                week_number = game['week']['number']
-
-            # Home and away teams
-            competition = game['competitions'][0]
-            home_team = competition['competitors'][0]['team']['displayName']
-            away_team = competition['competitors'][1]['team']['displayName']
-            
-            # Scores for both teams
-            home_score = competition['competitors'][0]['score']
-            away_score = competition['competitors'][1]['score']
-            
-            # Round of the game (default to 'Regular Season')
-            round_type = 'Regular Season'
-
-            # Check if any notes are present for event headlines like "Super Bowl" or "Conference Championship"
-            if 'notes' in competition:
-                for note in competition['notes']:
-                    if note.get('type') == 'event' and 'headline' in note:
-                        headline = note['headline'].lower()  # Convert headline to lowercase for case-insensitive matching
-                        
-                        if 'super bowl' in headline:
-                            round_type = "Super Bowl"
-                        elif 'conference championship' in headline:
-                            round_type = "Conference Championship"
-
-            # If it's a playoff game, check for normal playoff week numbers
-            if season_slug == 'post-season':
-                playoff_week = game['week']['number'] if 'week' in game and 'number' in game['week'] else None
-                
-                # Override round_type if it’s a playoff game that isn't explicitly marked by the event notes
-                if playoff_week == 1 and round_type == 'Regular Season':
-                    round_type = "Wild Card Round"
-                elif playoff_week == 2 and round_type == 'Regular Season':
-                    round_type = "Divisional Round"
-                elif playoff_week == 3 and round_type == 'Regular Season':
-                    round_type = "Championship Round"
-                elif (year >= 2009 and playoff_week == 4):  # Pro Bowl occurs before Super Bowl after 2008
-                    continue  # Skip Pro Bowl games after 2008 (week 4)
-                elif (year <= 2008 and playoff_week == 5):  # Pro Bowl occurs after Super Bowl before 2008
-                    continue  # Skip Pro Bowl games before 2008 (week 5)
-                elif playoff_week == 4 or playoff_week == 5:  # This is the Super Bowl for years 2008 and after
-                    round_type = "Super Bowl"
-
-            # Add teams and season to respective sets
-            teams.add(home_team)
-            teams.add(away_team)
-            seasons.add((season_year, season_slug))
-
-            # Append the game data
-            game_info = {
-                'season_year': season_year,
-                'season_type': season_slug,
-                'home_team': home_team,
-                'away_team': away_team,
-                'home_score': home_score,
-                'away_score': away_score,
-                'week': week_number,
-                'round_type': round_type,
-            }
-            games.append(game_info)
-
-    response = requests.get(url)
-
-    if response.status_code == 200:
-        data = response.json()
-        process_game_data(data)
-
-        # Process the next year
-        next_year = str(year + 1)
-        next_url = f"https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard?limit=1000&dates={next_year}"
-
-        response = requests.get(next_url)
-
-        if response.status_code == 200:
-            data = response.json()
-            process_game_data(data)
-
-        print(f"Data fetched for {year}")
-    else:
-        print(f"Error fetching data for {year}: {response.status_code}")
+    stats = {}
+    if season_stats is not None:
+        season_stats[year] = stats
+    records = fetch_season_records(year, session=session, rate_limiter=rate_limiter, cache=cache, stats=stats)
+    if records is None:
+        run_metrics.active.error(f"Could not fetch season {year}", year=year, status=stats.get("status"))
+        run_metrics.active.record_year(year, **stats)
+        return teams, seasons, games
+    if stats.get("next_year_status") != 200:
+        # The regular season is kept, but the run must not look complete without the playoffs
+        run_metrics.active.error(f"Could not fetch the playoffs of season {year}", year=year,
+                                 status=stats.get("next_year_status"))
 
+    if report_dir is not None:
+        save_week_report(year, records, report_dir)
+
+    for record in records:
+        # Pro Bowl games are not stored in the database
+        if record.round_type == 'Pro Bowl':
+            stats["skipped"]["pro_bowl"] = stats["skipped"].get("pro_bowl", 0) + 1
+            continue
+
+        teams.add(record.home_team)
+        teams.add(record.away_team)
+        seasons.add((record.season_year, record.season_type))
+        games.append(game_to_dict(record))
+
+    stats["kept"] = len(games)
+    run_metrics.active.record_year(year, **stats)
     return teams, seasons, games
 
 # Function to save all data into a single JSON file
-def save_to_single_json(all_teams, all_seasons, all_games):
+def save_to_single_json(all_teams, all_seasons, all_games, output_file=OUTPUT_FILE):
     data = {
         "teams": list(all_teams),
         "seasons": [{"year": season[0], "type": season[1]} for season in all_seasons],
         "games": all_games
     }
 
-    with open("nfl_data_all_years.json", "w") as f:
+    with open(output_file, "w") as f:
         json.dump(data, f, indent=4)
 
-    print("Data saved to nfl_data_all_years.json")
+    print(f"Data saved to {output_file}")
 
 # Main function to fetch data for a range of years and accumulate results
-def extract_data_for_years(years):
+def extract_data_for_years(years, cache=None, report_dir=None):
     all_teams = set()
     all_seasons = set()
     all_games = []
 
     for year in years:
-        teams, seasons, games = fetch_and_process_games(year)
+        teams, seasons, games = fetch_and_process_games(year, cache=cache, report_dir=report_dir)
         all_teams.update(teams)
         all_seasons.update(seasons)
         all_games.extend(games)
@@ -144,8 +217,260 @@ def extract_data_for_years(years):
     # Save all accumulated data to a single JSON file
     save_to_single_json(all_teams, all_seasons, all_games)
 
-# List of years to fetch data for (1946 to 2024)
-years = list(range(1946, 2025))
+# Function to fetch several seasons through a bounded thread pool.
+# Yields (year, teams, seasons, games) in year order so the output matches the serial path exactly.
+def fetch_years_concurrent(years, max_workers=8, requests_per_second=None, cache=None, report_dir=None,
+                           season_stats=None):
+    session = create_session(pool_size=max_workers)
+    rate_limiter = RateLimiter(requests_per_second)
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                lambda year: fetch_and_process_games(year, session=session, rate_limiter=rate_limiter, cache=cache,
+                                                     report_dir=report_dir, season_stats=season_stats),
+                years
+            )
+            for year, (teams, seasons, games) in zip(years, results):
+                yield year, teams, seasons, games
+    finally:
+        session.close()
+
+    print(f"Fetched {len(years)} seasons in {time.perf_counter() - start:.2f}s with {max_workers} workers")
+
+# Function to fetch several seasons serially or concurrently, yielding (year, teams, seasons, games)
+def fetch_years(years, max_workers=1, requests_per_second=None, cache=None, report_dir=None, season_stats=None):
+    if max_workers > 1:
+        return fetch_years_concurrent(years, max_workers, requests_per_second, cache, report_dir, season_stats)
+    return ((year, *fetch_and_process_games(year, cache=cache, report_dir=report_dir, season_stats=season_stats))
+            for year in years)
+
+# Function to get the partition file holding one season's games
+def season_partition_path(year, data_dir=DATA_DIR):
+    return os.path.join(data_dir, f"season_{year}.ndjson")
+
+# Function to write one season's games as newline-delimited JSON.
+# The file is written to a temporary name and renamed, so a crash never leaves a partial season.
+def write_season_ndjson(year, games, data_dir=DATA_DIR):
+    os.makedirs(data_dir, exist_ok=True)
+    path = season_partition_path(year, data_dir)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        for game in games:
+            f.write(json.dumps(game))
+            f.write("\n")
+    os.replace(tmp_path, path)
+    return path
+
+# Function to read one season's games back from its partition file
+def read_season_ndjson(year, data_dir=DATA_DIR):
+    path = season_partition_path(year, data_dir)
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+# Streaming version of extract_data_for_years: each season is written to its own
+# NDJSON partition as soon as it is fetched, so memory stays flat and a crash only
+# loses the seasons still in flight
+def extract_data_for_years_streaming(years, max_workers=1, requests_per_second=None, cache=None,
+                                     data_dir=DATA_DIR, report_dir=None):
+    total_games = 0
+    for year, _, _, games in fetch_years(years, max_workers, requests_per_second, cache, report_dir):
+        if not games:
+            continue
+        write_season_ndjson(year, games, data_dir)
+        total_games += len(games)
+
+    print(f"Streamed {total_games} games to {data_dir}/")
+
+# Concurrent version of extract_data_for_years using a bounded thread pool
+def extract_data_for_years_concurrent(years, max_workers=8, requests_per_second=None, cache=None,
+                                      report_dir=None):
+    all_teams = set()
+    all_seasons = set()
+    all_games = []
+
+    for _, teams, seasons, games in fetch_years_concurrent(years, max_workers, requests_per_second, cache,
+                                                           report_dir):
+        all_teams.update(teams)
+        all_seasons.update(seasons)
+        all_games.extend(games)
+
+    # Save all accumulated data to a single JSON file
+    save_to_single_json(all_teams, all_seasons, all_games)
+
+# Function to get the season currently being played (or about to be played).
+# Season N runs from September N to the Super Bowl in February N+1.
+def current_season(today=None):
+    today = today or date.today()
+    return today.year if today.month >= 3 else today.year - 1
+
+# Function to decide whether a fetch captured a season in its final state: both payloads (the season's
+# calendar year and the following one, which holds its playoffs) came back 200 and were downloaded
+# after the season ended (the Super Bowl is played by the end of February)
+def season_fetched_final(year, stats):
+    ended = datetime(year + 1, 3, 1).timestamp()
+    return (stats.get("status") == 200 and stats.get("next_year_status") == 200
+            and stats.get("fetched_at", 0) >= ended and stats.get("next_year_fetched_at", 0) >= ended)
+
+# Stable key identifying a game across refreshes
+def game_key(game):
+    return (str(game['season_year']), game['season_type'], str(game['week']), game['home_team'], game['away_team'])
+
+# Function to load the manifest recording which seasons are final
+def load_manifest(manifest_file=MANIFEST_FILE):
+    if not os.path.exists(manifest_file):
+        return {"parser": PARSER_VERSION, "final_seasons": [], "seasons": {}}
+    with open(manifest_file, "r") as f:
+        return json.load(f)
+
+# Function to save the manifest
+def save_manifest(manifest, manifest_file=MANIFEST_FILE):
+    manifest["final_seasons"] = sorted(set(manifest["final_seasons"]))
+    with open(manifest_file, "w") as f:
+        json.dump(manifest, f, indent=4)
+
+# Function to merge freshly fetched games into the existing list by game key.
+# Existing games keep their position and get updated scores; new games are appended.
+def merge_games(existing_games, new_games):
+    positions = {game_key(game): i for i, game in enumerate(existing_games)}
+    added = updated = 0
+
+    for game in new_games:
+        key = game_key(game)
+        if key in positions:
+            index = positions[key]
+            if existing_games[index] != game:
+                existing_games[index] = game
+                updated += 1
+        else:
+            positions[key] = len(existing_games)
+            existing_games.append(game)
+            added += 1
+
+    return added, updated
+
+# Function to refresh only the seasons that can still change (or an explicit list of years)
+# and merge the results into the existing dataset
+def extract_incremental(years=None, first_year=1946, max_workers=1, requests_per_second=None, cache=None,
+                        output_file=OUTPUT_FILE, manifest_file=MANIFEST_FILE, data_dir=None, report_dir=None):
+    manifest = load_manifest(manifest_file)
+    final_seasons = set(manifest["final_seasons"])
+    latest = current_season()
+
+    # Seasons extracted with older round rules are no longer final (their rounds may be wrong)
+    if manifest.get("parser") != PARSER_VERSION:
+        if final_seasons:
+            print(f"Round rules changed since the last extract, re-parsing {len(final_seasons)} final season(s)")
+        final_seasons = set()
+        manifest["parser"] = PARSER_VERSION
+
+    # By default fetch every season not yet marked final (normally just the current one)
+    if years is None:
+        years = [year for year in range(first_year, latest + 1) if year not in final_seasons]
+
+    # With partitioned output only the refreshed seasons' files are read and rewritten
+    all_games = []
+    if data_dir is None and os.path.exists(output_file):
+        with open(output_file, "r") as f:
+            data = json.load(f)
+        all_games = data["games"]
+
+    print(f"Incremental refresh of {len(years)} season(s): {years}")
+
+    total_added = total_updated = 0
+    season_stats = {}
+    for year, _, _, games in fetch_years(years, max_workers, requests_per_second, cache, report_dir, season_stats):
+        if data_dir is not None:
+            season_games = read_season_ndjson(year, data_dir)
+            added, updated = merge_games(season_games, games)
+            if added or updated:
+                write_season_ndjson(year, season_games, data_dir)
+        else:
+            added, updated = merge_games(all_games, games)
+        total_added += added
+        total_updated += updated
+
+        manifest["seasons"][str(year)] = {
+            "games": len(games),
+            "fetched_at": datetime.now().isoformat(timespec="seconds")
+        }
+        # A season is final once its Super Bowl is in the past and both of its payloads were fetched
+        # in full after that; otherwise it stays pending and the next run fetches it again
+        if games and year < latest and season_fetched_final(year, season_stats.get(year, {})):
+            final_seasons.add(year)
+        else:
+            final_seasons.discard(year)
+
+    manifest["final_seasons"] = list(final_seasons)
+    save_manifest(manifest, manifest_file)
+
+    if data_dir is None:
+        # Rebuild the team and season lists from the merged games
+        all_teams = set()
+        all_seasons = set()
+        for game in all_games:
+            all_teams.add(game['home_team'])
+            all_teams.add(game['away_team'])
+            all_seasons.add((game['season_year'], game['season_type']))
+
+        save_to_single_json(all_teams, all_seasons, all_games, output_file)
+    print(f"Incremental refresh complete: {total_added} new games, {total_updated} updated")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch NFL games from the ESPN scoreboard API")
+    parser.add_argument("--start", type=int, default=1946, help="First season to fetch")
+    parser.add_argument("--end", type=int, default=2024, help="Last season to fetch (inclusive)")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Number of seasons to fetch in parallel (1 = serial)")
+    parser.add_argument("--rate-limit", type=float, default=None,
+                        help="Maximum requests per second across all workers")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only refetch seasons that are not final yet and merge them into the existing data")
+    parser.add_argument("--years", type=int, nargs="+", default=None,
+                        help="Explicit list of seasons to refresh in incremental mode")
+    parser.add_argument("--format", choices=["json", "ndjson"], default="json",
+                        help="json: one nfl_data_all_years.json file; ndjson: one file per season in nfl_data/")
+    parser.add_argument("--week-reports", metavar="DIR", default=None,
+                        help="Also write nfl_{year}_game_results_by_week.json reports to DIR from the same parse")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk response cache")
+    parser.add_argument("--offline", action="store_true", help="Only use cached responses, never hit the network")
+    parser.add_argument("--metrics-log", metavar="FILE", default=None,
+                        help="Append structured JSON log lines to FILE ('-' for stderr)")
+    parser.add_argument("--run-summary", metavar="FILE", default="extract_run_summary.json",
+                        help="Where to write the JSON summary of the run")
+    args = parser.parse_args()
+
+    metrics = run_metrics.start_run("extract", args.metrics_log)
+    cache = None if args.no_cache else ResponseCache(offline=args.offline)
+
+    # List of years to fetch data for (1946 to 2024 by default)
+    years = list(range(args.start, args.end + 1))
+
+    try:
+        # Extract data for each year and save it to a single JSON file
+        if args.incremental:
+            extract_incremental(years=args.years, first_year=args.start, max_workers=args.concurrency,
+                                requests_per_second=args.rate_limit, cache=cache,
+                                data_dir=DATA_DIR if args.format == "ndjson" else None, report_dir=args.week_reports)
+        elif args.format == "ndjson":
+            extract_data_for_years_streaming(years, max_workers=args.concurrency,
+                                             requests_per_second=args.rate_limit, cache=cache,
+                                             report_dir=args.week_reports)
+        elif args.concurrency > 1:
+            extract_data_for_years_concurrent(years, max_workers=args.concurrency,
+                                              requests_per_second=args.rate_limit, cache=cache,
+                                              report_dir=args.week_reports)
+        else:
+            extract_data_for_years(years, cache=cache, report_dir=args.week_reports)
 
-# Extract data for each year and save it to a single JSON file
-extract_data_for_years(years)
+        if cache is not None:
+            print(f"Cache: {cache.hits} hits, {cache.misses} downloads, {cache.revalidated} revalidated")
+            metrics.record_step("cache", hits=cache.hits, downloads=cache.misses, revalidated=cache.revalidated)
+    except Exception as e:
+        metrics.error(f"Extract failed: {e}")
+        raise
+    finally:
+        metrics.write_summary(args.run_summary)
@@ -0,0 +1,100 @@
+import json
+import os
+from typing import List, Optional, TypedDict, Union
+
+# Decoding of ESPN scoreboard payloads.
+#
+# A limit=1000 payload is a large nested document, but espn_parser only reads a handful of
+# fields per event. When msgspec is installed the payload is decoded against the TypedDicts
+# below, which skips every other field without building Python objects for it. Without
+# msgspec, orjson is used for a faster full decode, and the standard library json module is
+# the final fallback. All paths return plain dicts/lists, so parse_events works unchanged.
+#
+# Optional speedups: pip install msgspec (or orjson)
+# Force a specific decoder with SCOREBOARD_DECODER=msgspec|orjson|json
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Only the fields read by espn_parser.parse_events / parse_live_events (total=False: every field may be missing)
+class Team(TypedDict, total=False):
+    displayName: str
+
+class Competitor(TypedDict, total=False):
+    team: Team
+    score: Union[str, int]
+
+class Note(TypedDict, total=False):
+    type: str
+    headline: str
+
+class Competition(TypedDict, total=False):
+    competitors: List[Competitor]
+    notes: List[Note]
+
+class Season(TypedDict, total=False):
+    year: int
+    slug: str
+
+class Week(TypedDict, total=False):
+    number: int
+
+class StatusType(TypedDict, total=False):
+    state: str
+    completed: bool
+
+class Status(TypedDict, total=False):
+    type: StatusType
+
+class Event(TypedDict, total=False):
+    id: str
+    date: str
+    status: Status
+    season: Season
+    week: Optional[Week]
+    competitions: List[Competition]
+
+class Scoreboard(TypedDict, total=False):
+    events: List[Event]
+
+# Build the typed decoder once (it is reusable and thread-safe)
+msgspec_decoder = msgspec.json.Decoder(Scoreboard) if msgspec is not None else None
+
+# Typed decode; falls back to a full decode if a payload doesn't match the expected types
+def decode_with_msgspec(body):
+    try:
+        return msgspec_decoder.decode(body)
+    except msgspec.ValidationError:
+        return orjson.loads(body) if orjson is not None else json.loads(body)
+
+def decode_with_orjson(body):
+    return orjson.loads(body)
+
+def decode_with_json(body):
+    return json.loads(body)
+
+DECODERS = {
+    "msgspec": decode_with_msgspec if msgspec is not None else None,
+    "orjson": decode_with_orjson if orjson is not None else None,
+    "json": decode_with_json
+}
+
+# Function to pick the fastest available decoder (or the one forced through SCOREBOARD_DECODER)
+def select_decoder(name=None):
+    name = name or os.getenv("SCOREBOARD_DECODER")
+    if name:
+        if DECODERS.get(name) is None:
+            raise ValueError(f"Scoreboard decoder '{name}' is not available")
+        return name, DECODERS[name]
+    for name in ("msgspec", "orjson", "json"):
+        if DECODERS[name] is not None:
+            return name, DECODERS[name]
+
+DECODER_NAME, decode_scoreboard = select_decoder()
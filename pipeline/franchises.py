@@ -0,0 +1,32 @@
+# Franchise identity for team names.
+#
+# ESPN reports games under the name a team had at the time ("Houston Oilers", "St. Louis Cardinals"),
+# so one franchise shows up under several team names. load.py stores every name in `teams` and links
+# it to a row in `franchises` (named after the franchise's current name); aggregates and the dashboard
+# then group by the integer franchise_id instead of rewriting names.
+# Names that are not listed here are their own franchise.
+
+# Current franchise name -> earlier names it played under
+FRANCHISE_HISTORY = {
+    'Arizona Cardinals': ['Chicago Cardinals', 'St. Louis Cardinals', 'St Louis Cardinals', 'Phoenix Cardinals'],
+    'Indianapolis Colts': ['Baltimore Colts'],
+    'Kansas City Chiefs': ['Dallas Texans'],
+    'Las Vegas Raiders': ['Oakland Raiders', 'Los Angeles Raiders'],
+    'Los Angeles Chargers': ['San Diego Chargers'],
+    'Los Angeles Rams': ['Cleveland Rams', 'St. Louis Rams', 'St Louis Rams'],
+    'New England Patriots': ['Boston Patriots'],
+    'New York Jets': ['New York Titans'],
+    'Tennessee Titans': ['Houston Oilers', 'Tennessee Oilers'],
+    'Washington Commanders': ['Washington Redskins', 'Washington Football Team', 'Washington']
+}
+
+# Team name -> franchise name, for every listed name (current names map to themselves)
+TEAM_FRANCHISES = {
+    name: franchise
+    for franchise, names in FRANCHISE_HISTORY.items()
+    for name in [franchise] + names
+}
+
+# Function to get the franchise a team name belongs to
+def franchise_for(team_name):
+    return TEAM_FRANCHISES.get(team_name, team_name)
@@ -0,0 +1,363 @@
+import os
+import time
+import hashlib
+import argparse
+import requests
+import run_metrics
+from extract import SCOREBOARD_URL, create_session, fetch_url
+from espn_parser import parse_live_events, game_to_dict, result_string
+from fast_decode import decode_scoreboard
+
+# Live scorigami watcher for game days.
+#
+# Polls the current week's scoreboard every --interval seconds. Polls are conditional
+# (If-None-Match / If-Modified-Since with the validators of the last response), so an unchanged
+# scoreboard costs a 304 and no parsing; a 200 whose body is byte-identical to the last one is
+# skipped as well. Otherwise the events are diffed against the previous poll, and every game whose
+# score or status changed is checked against the set of known final scorelines:
+#   LIVE  -> the game would be a scorigami if it ended now
+#   FINAL -> the game just finished as a scorigami
+# Games that just went final are appended to the database in one small transaction (upsert on the
+# natural key, scoreline_counts refreshed, data_version bumped so dashboards pick them up
+# incrementally). The franchise aggregates don't matter mid-game, so their refresh is deferred
+# until the week is final or the watcher stops.
+#
+# Try it against the local stand-in:
+#   python ../tests/stub_scoreboard_server.py --live --tick 2
+#   ESPN_SCOREBOARD_URL=http://127.0.0.1:8765/scoreboard python live_watcher.py --snapshot nfl_snapshot --interval 1 --until-final
+
+# ESPN season type codes used by the seasontype query parameter
+SEASON_TYPE_CODES = {"regular-season": 2, "post-season": 3}
+
+# Function to build the URL of one week's scoreboard (without a week, ESPN returns the current week)
+def build_live_url(year=None, season_type=None, week=None):
+    url = f"{SCOREBOARD_URL}?limit=1000"
+    if year is not None:
+        url += f"&dates={year}"
+    if season_type is not None:
+        url += f"&seasontype={SEASON_TYPE_CODES[season_type]}"
+    if week is not None:
+        url += f"&week={week}"
+    return url
+
+# Function to map a final score onto a scoreline (winning/losing score when normalized)
+def score_cell(home_score, away_score, normalized=False):
+    home_score, away_score = int(home_score), int(away_score)
+    if normalized:
+        return max(home_score, away_score), min(home_score, away_score)
+    return home_score, away_score
+
+# Function to collect the known scorelines from an iterable of game dicts (extract.py layout)
+def known_scorelines_from_games(games, normalized=False):
+    return {score_cell(game['home_score'], game['away_score'], normalized) for game in games
+            if game['home_score'] not in (None, "") and game['away_score'] not in (None, "")}
+
+# Function to collect the known scorelines from a columnar snapshot (see snapshot.py)
+def known_scorelines_from_snapshot(snapshot_dir, normalized=False):
+    import numpy as np
+    from snapshot import load_snapshot
+    columns, _ = load_snapshot(snapshot_dir)
+    home, away = np.asarray(columns["home_score"]), np.asarray(columns["away_score"])
+    scored = (home >= 0) & (away >= 0)
+    return {score_cell(h, a, normalized) for h, a in zip(home[scored].tolist(), away[scored].tolist())}
+
+# Function to collect the known scorelines from the database
+def known_scorelines_from_db(cursor, normalized=False):
+    cursor.execute("""
+        SELECT DISTINCT home_score, away_score FROM games
+        WHERE home_score IS NOT NULL AND away_score IS NOT NULL;
+    """)
+    return {score_cell(home, away, normalized) for home, away in cursor.fetchall()}
+
+# Aggregate views refreshed with every appended batch; the rest wait for refresh_deferred_aggregates
+LIVE_VIEWS = ["scoreline_counts"]
+
+# Function to append finished games to the database in one transaction; returns the number of changed rows
+def append_final_games(conn, games):
+    from load import (insert_teams_bulk, insert_seasons_bulk, insert_games_bulk, refresh_aggregates,
+                      mark_rows_changed, bump_data_version)
+
+    rows = [dict(game_to_dict(game.record), date=game.date or '1970-01-01') for game in games]
+    teams = {row['home_team'] for row in rows} | {row['away_team'] for row in rows}
+    seasons = {(row['season_year'], row['season_type']) for row in rows}
+
+    cursor = conn.cursor()
+    try:
+        team_ids, relinked = insert_teams_bulk(teams, cursor)
+        season_ids = insert_seasons_bulk([{"year": year, "type": season_type} for year, season_type in seasons], cursor)
+        inserted, updated = insert_games_bulk(rows, cursor, season_ids, team_ids, step="live_games")
+        changed = inserted + updated
+        if updated or relinked:
+            mark_rows_changed(cursor)
+        if changed or relinked:
+            refresh_aggregates(cursor, LIVE_VIEWS)
+            bump_data_version(cursor)
+        conn.commit()
+        return changed
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+# Function to refresh the aggregate views skipped by append_final_games and publish them
+def refresh_deferred_aggregates(conn):
+    from load import AGGREGATE_VIEWS, refresh_aggregates, bump_data_version
+
+    cursor = conn.cursor()
+    try:
+        refresh_aggregates(cursor, [view for view in AGGREGATE_VIEWS if view not in LIVE_VIEWS])
+        bump_data_version(cursor)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+# Polls one scoreboard URL and keeps the state needed to diff consecutive polls.
+# A poll is a single request with a short timeout (no retries), so it never blocks much longer
+# than the timeout; a failed poll is only counted as a warning and the next interval tries again.
+# Only max_failures failed polls in a row are recorded as a run error.
+class LiveWatcher:
+    def __init__(self, url, known_scorelines, normalized=False, session=None, conn=None, timeout=0.8,
+                 max_failures=5):
+        self.url = url
+        self.known = known_scorelines
+        self.normalized = normalized
+        self.session = session or create_session(pool_size=1)
+        self.conn = conn
+        self.timeout = timeout
+        self.max_failures = max_failures
+        self.failures = 0       # failed polls in a row
+
+        # Validators and body digest of the last 200 response
+        self.etag = None
+        self.last_modified = None
+        self.digest = None
+
+        self.games = {}         # event_id -> LiveGame as of the last processed payload
+        self.finalized = set()  # event_ids of final games already handled
+        self.pending = []       # final games whose database append failed (retried every poll)
+        self.deferred = False   # appended games not yet reflected in the deferred aggregate views
+        self.poll_seconds = []
+
+    # Headers that let the server answer 304 when nothing changed
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    # Function to poll once; returns a dict describing what happened
+    def poll(self):
+        start = time.perf_counter()
+        result = {"status": None, "processed": False, "changed": 0, "alerts": [], "finalized": 0}
+
+        # A connection error, timeout or error status only costs this poll; the next interval tries again
+        try:
+            response = fetch_url(self.url, session=self.session, retries=0, timeout=self.timeout,
+                                 headers=self.conditional_headers())
+        except requests.RequestException as e:
+            response = None
+            self.poll_failed(f"Scoreboard poll failed: {e}", error_type=type(e).__name__)
+        else:
+            result["status"] = response.status_code
+
+        if response is not None and response.status_code == 200:
+            self.failures = 0
+            self.etag = response.headers.get("ETag", self.etag)
+            self.last_modified = response.headers.get("Last-Modified", self.last_modified)
+            digest = hashlib.sha256(response.content).hexdigest()
+            if digest != self.digest:
+                self.digest = digest
+                self.process(decode_scoreboard(response.content), result)
+        elif response is not None and response.status_code == 304:
+            self.failures = 0
+        elif response is not None:
+            self.poll_failed(f"Scoreboard poll failed with status {response.status_code}",
+                             status=response.status_code)
+
+        if self.pending and self.conn is not None:
+            self.append_pending(result)
+
+        elapsed = time.perf_counter() - start
+        result["seconds"] = round(elapsed, 4)
+        self.poll_seconds.append(elapsed)
+        run_metrics.active.count(polls=1, not_modified=int(result["status"] == 304),
+                                 changed_games=result["changed"], alerts=len(result["alerts"]),
+                                 finalized=result["finalized"])
+        run_metrics.active.log("poll", status=result["status"], processed=result["processed"],
+                               changed=result["changed"], alerts=len(result["alerts"]),
+                               finalized=result["finalized"], seconds=result["seconds"])
+        return result
+
+    # Function to count a failed poll as a warning; only a run of max_failures in a row fails the run
+    def poll_failed(self, message, **fields):
+        self.failures += 1
+        run_metrics.active.count(failed_polls=1)
+        run_metrics.active.warning(message, url=self.url, in_a_row=self.failures, **fields)
+        if self.failures == self.max_failures:
+            run_metrics.active.error(f"{message} ({self.failures} polls in a row)", url=self.url, **fields)
+
+    # Function to diff a payload against the previous poll and flag scorigami candidates
+    def process(self, data, result):
+        result["processed"] = True
+        for game in parse_live_events(data):
+            # Pro Bowl games are not part of the scorigami record (extract.py skips them too)
+            if game.record.round_type == 'Pro Bowl':
+                continue
+
+            previous = self.games.get(game.event_id)
+            self.games[game.event_id] = game
+            if game.state == 'pre' or game.event_id in self.finalized:
+                continue
+            if previous is not None and (previous.state, previous.completed, previous.record.home_score,
+                                         previous.record.away_score) == (game.state, game.completed,
+                                                                         game.record.home_score,
+                                                                         game.record.away_score):
+                continue
+            result["changed"] += 1
+
+            cell = score_cell(game.record.home_score, game.record.away_score, self.normalized)
+            if cell not in self.known:
+                label = "FINAL" if game.completed else "LIVE"
+                print(f"{label} scorigami: {result_string(game.record)}")
+                result["alerts"].append({"event_id": game.event_id, "final": game.completed,
+                                         "home_team": game.record.home_team, "away_team": game.record.away_team,
+                                         "home_score": int(game.record.home_score),
+                                         "away_score": int(game.record.away_score)})
+                run_metrics.active.log("scorigami", **result["alerts"][-1])
+
+            if game.completed:
+                # From now on this score is no longer a scorigami for the other games
+                self.known.add(cell)
+                self.finalized.add(game.event_id)
+                result["finalized"] += 1
+                if self.conn is not None:
+                    self.pending.append(game)
+
+    # Function to write the pending final games to the database (kept for the next poll on failure)
+    def append_pending(self, result):
+        try:
+            append_final_games(self.conn, self.pending)
+        except Exception as e:
+            print(f"Appending {len(self.pending)} final games failed, retrying next poll: {e}")
+            run_metrics.active.error(f"Live append failed: {e}", games=len(self.pending))
+            return
+        print(f"Appended {len(self.pending)} final games to the database")
+        result["appended"] = len(self.pending)
+        self.pending = []
+        self.deferred = True
+
+    # Function to bring the deferred aggregate views up to date once games were appended
+    def refresh_deferred(self):
+        if not self.deferred or self.conn is None:
+            return
+        try:
+            refresh_deferred_aggregates(self.conn)
+        except Exception as e:
+            print(f"Refreshing the deferred aggregates failed: {e}")
+            run_metrics.active.error(f"Deferred aggregate refresh failed: {e}")
+            return
+        self.deferred = False
+
+    # True once every game of the week is final and stored
+    def week_final(self):
+        return bool(self.games) and all(game.completed for game in self.games.values()) and not self.pending
+
+    # Function to poll every `interval` seconds until max_polls is reached (or the week is final).
+    # The deferred aggregate views are refreshed as soon as every game of the week is stored.
+    def run(self, interval=30, max_polls=None, until_final=False):
+        polls = 0
+        while True:
+            started = time.monotonic()
+            self.poll()
+            polls += 1
+            if self.week_final():
+                self.refresh_deferred()
+            if (max_polls and polls >= max_polls) or (until_final and self.week_final()):
+                return
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+    # Poll latency summary (seconds)
+    def latency_summary(self):
+        if not self.poll_seconds:
+            return {}
+        seconds = sorted(self.poll_seconds)
+        return {
+            "polls": len(seconds),
+            "p50_seconds": round(seconds[len(seconds) // 2], 4),
+            "p95_seconds": round(seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))], 4),
+            "max_seconds": round(seconds[-1], 4)
+        }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Watch the current week's scoreboard for scorigamis")
+    parser.add_argument("--url", default=None, help="Scoreboard URL to poll (default: built from the options below)")
+    parser.add_argument("--year", type=int, default=None, help="Season to poll (default: ESPN's current week)")
+    parser.add_argument("--season-type", choices=sorted(SEASON_TYPE_CODES), default=None)
+    parser.add_argument("--week", type=int, default=None, help="Week to poll")
+    parser.add_argument("--interval", type=float, default=30.0, help="Seconds between polls")
+    parser.add_argument("--max-polls", type=int, default=None, help="Stop after this many polls")
+    parser.add_argument("--until-final", action="store_true", help="Stop once every game of the week is final")
+    parser.add_argument("--normalized", action="store_true",
+                        help="Compare winning/losing scores and ignore which side was home")
+    parser.add_argument("--snapshot", default=None, help="Read the known scorelines from a snapshot directory")
+    parser.add_argument("--input", default=None,
+                        help="Read the known scorelines from a JSON file or NDJSON directory written by extract.py")
+    parser.add_argument("--db", action="store_true",
+                        help="Append final games to PostgreSQL (and read the known scorelines from it by default)")
+    parser.add_argument("--metrics-log", metavar="FILE", default=None,
+                        help="Append structured JSON log lines to FILE ('-' for stderr)")
+    parser.add_argument("--run-summary", metavar="FILE", default="live_run_summary.json",
+                        help="Where to write the JSON summary of the run")
+    args = parser.parse_args()
+
+    if not (args.snapshot or args.input or args.db):
+        parser.error("give --snapshot, --input or --db as the source of known scorelines")
+
+    metrics = run_metrics.start_run("live", args.metrics_log)
+    conn = None
+    watcher = None
+    try:
+        if args.db:
+            from load import get_db_connection
+            conn = get_db_connection()
+
+        if args.snapshot:
+            known = known_scorelines_from_snapshot(args.snapshot, args.normalized)
+        elif args.input and os.path.isdir(args.input):
+            from load import iter_games_from_ndjson
+            known = known_scorelines_from_games(iter_games_from_ndjson(args.input), args.normalized)
+        elif args.input:
+            from load import load_data_from_json
+            known = known_scorelines_from_games(load_data_from_json(args.input)["games"], args.normalized)
+        else:
+            cursor = conn.cursor()
+            known = known_scorelines_from_db(cursor, args.normalized)
+            cursor.close()
+            conn.rollback()
+        print(f"{len(known)} known scorelines")
+
+        url = args.url or build_live_url(args.year, args.season_type, args.week)
+        watcher = LiveWatcher(url, known, normalized=args.normalized, conn=conn)
+        watcher.run(args.interval, args.max_polls, args.until_final)
+    except KeyboardInterrupt:
+        print("Stopped")
+    except Exception as e:
+        metrics.error(f"Live watcher failed: {e}")
+        raise
+    finally:
+        if watcher is not None:
+            watcher.refresh_deferred()
+            latency = watcher.latency_summary()
+            if latency:
+                print(f"{latency['polls']} polls, p50 {latency['p50_seconds'] * 1000:.1f}ms, "
+                      f"max {latency['max_seconds'] * 1000:.1f}ms")
+                metrics.record_step("polls", **latency)
+        if conn is not None:
+            conn.close()
+        metrics.write_summary(args.run_summary)
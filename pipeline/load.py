@@ -1,8 +1,14 @@
 import json
 import psycopg2
 import os
+import time
+import argparse
+from psycopg2.extras import execute_values
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from datetime import datetime
+import run_metrics
+from franchises import franchise_for
 
 # Load environment variables from .env file
 load_dotenv()
@@ -13,20 +19,63 @@ DB_NAME = os.getenv("DB_NAME")
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 
+# Number of game rows sent per INSERT statement in the bulk path
+BATCH_SIZE = 1000
+
+# Seasons that failed in the last partitioned load (read back by --retry-failed)
+FAILED_SEASONS_FILE = "load_failed_seasons.json"
+
+# Conflict target matching the games_natural_key unique index in database/schema.sql
+GAME_NATURAL_KEY = "(season_id, (COALESCE(week, -1)), home_team_id, away_team_id)"
+
+# Function to open a connection using the credentials from the .env file
+def get_db_connection():
+    return psycopg2.connect(
+        host=DB_HOST,
+        dbname=DB_NAME,
+        user=DB_USER,
+        password=DB_PASSWORD
+    )
+
 # Function to load data from the JSON file
 def load_data_from_json(input_file="nfl_data_all_years.json"):
     with open(input_file, "r") as f:
         data = json.load(f)
     return data
 
-# Function to insert teams into the database
+# Function to stream games from a directory of per-season NDJSON files, one game at a time
+def iter_games_from_ndjson(data_dir="nfl_data"):
+    for name in sorted(os.listdir(data_dir)):
+        if not name.endswith(".ndjson"):
+            continue
+        with open(os.path.join(data_dir, name), "r") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+# Function to collect the team and season lists from the NDJSON partitions without keeping the games
+def scan_teams_and_seasons(data_dir="nfl_data"):
+    teams = set()
+    seasons = set()
+    for game in iter_games_from_ndjson(data_dir):
+        teams.add(game['home_team'])
+        teams.add(game['away_team'])
+        seasons.add((game['season_year'], game['season_type']))
+    return list(teams), [{"year": year, "type": season_type} for year, season_type in seasons]
+
+# Function to insert teams into the database, each linked to its franchise
 def insert_teams(teams, cursor):
     for team in teams:
         cursor.execute("""
-            INSERT INTO teams (name)
+            INSERT INTO franchises (name)
             VALUES (%s)
             ON CONFLICT (name) DO NOTHING;
-        """, (team,))
+        """, (franchise_for(team),))
+        cursor.execute("""
+            INSERT INTO teams (name, franchise_id)
+            SELECT %s, franchise_id FROM franchises WHERE name = %s
+            ON CONFLICT (name) DO UPDATE SET franchise_id = EXCLUDED.franchise_id;
+        """, (team, franchise_for(team)))
 
 # Function to insert seasons into the database
 def insert_seasons(seasons, cursor):
@@ -39,7 +88,9 @@ def insert_seasons(seasons, cursor):
 
 # Function to insert games into the database
 def insert_games(games, cursor):
+    count = 0
     for game in games:
+        count += 1
         season_id = get_season_id(game['season_year'], game['season_type'], cursor)
         home_team_id = get_team_id(game['home_team'], cursor)
         away_team_id = get_team_id(game['away_team'], cursor)
@@ -53,7 +104,10 @@ def insert_games(games, cursor):
 
             cursor.execute("""
                 INSERT INTO games (season_id, home_team_id, away_team_id, home_score, away_score, date, week, round)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s);
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT """ + GAME_NATURAL_KEY + """ DO UPDATE
+                SET home_score = EXCLUDED.home_score, away_score = EXCLUDED.away_score,
+                    date = EXCLUDED.date, round = EXCLUDED.round;
             """, (
                 season_id,
                 home_team_id,
@@ -64,6 +118,249 @@ def insert_games(games, cursor):
                 week,  # This will now be None if 'Unknown Week'
                 game['round_type']
             ))
+    return count
+
+# Function to build the database row for a game, or None if its season/teams are unknown
+def build_game_row(game, season_ids, team_ids):
+    season_id = season_ids.get((int(game['season_year']), game['season_type']))
+    home_team_id = team_ids.get(game['home_team'])
+    away_team_id = team_ids.get(game['away_team'])
+
+    if not (season_id and home_team_id and away_team_id):
+        return None
+
+    # Parse the date (assume date is provided in the "YYYY-MM-DD" format)
+    game_date = datetime.strptime(game.get('date', '1970-01-01'), '%Y-%m-%d')
+
+    # Handle 'Unknown Week'
+    week = game['week'] if game['week'] != 'Unknown Week' else None
+
+    return (
+        season_id,
+        home_team_id,
+        away_team_id,
+        game['home_score'],
+        game['away_score'],
+        game_date,
+        week,
+        game['round_type']
+    )
+
+# Function to insert all franchises in one statement and return a name -> franchise_id map
+def insert_franchises_bulk(franchises, cursor):
+    franchises = sorted(set(franchises))
+    execute_values(cursor, """
+        INSERT INTO franchises (name)
+        VALUES %s
+        ON CONFLICT (name) DO NOTHING;
+    """, [(franchise,) for franchise in franchises])
+
+    cursor.execute("SELECT name, franchise_id FROM franchises WHERE name = ANY(%s);", (franchises,))
+    return dict(cursor.fetchall())
+
+# Function to insert all teams in one statement and return a name -> team_id map and the number of
+# existing teams that were re-linked. Every team is linked to its franchise (re-linked if
+# pipeline/franchises.py changed); the caller marks the re-links as changed rows.
+def insert_teams_bulk(teams, cursor):
+    teams = list(teams)
+    franchise_ids = insert_franchises_bulk([franchise_for(team) for team in teams], cursor)
+    # xmax <> 0 identifies existing teams that were re-linked in RETURNING
+    relinked = execute_values(cursor, """
+        INSERT INTO teams (name, franchise_id)
+        VALUES %s
+        ON CONFLICT (name) DO UPDATE SET franchise_id = EXCLUDED.franchise_id
+        WHERE teams.franchise_id IS DISTINCT FROM EXCLUDED.franchise_id
+        RETURNING (xmax <> 0);
+    """, [(team, franchise_ids[franchise_for(team)]) for team in teams], fetch=True)
+
+    # A single SELECT also picks up teams that already existed (RETURNING skips conflicting rows)
+    cursor.execute("SELECT name, team_id FROM teams WHERE name = ANY(%s);", (teams,))
+    return dict(cursor.fetchall()), sum(1 for row in relinked if row[0])
+
+# Function to insert all seasons in one statement and return a (year, type) -> season_id map
+def insert_seasons_bulk(seasons, cursor):
+    rows = [(int(season['year']), season['type']) for season in seasons]
+    execute_values(cursor, """
+        INSERT INTO seasons (year, type)
+        VALUES %s
+        ON CONFLICT (year, type) DO NOTHING;
+    """, rows)
+
+    cursor.execute("SELECT year, type, season_id FROM seasons;")
+    return {(year, season_type): season_id for year, season_type, season_id in cursor.fetchall()}
+
+# Function to load games in batches into a staging table using IDs resolved up front,
+# then merge them into games with one set-based upsert on the natural key.
+# Re-running a load only touches rows whose scores/date/round actually changed.
+def insert_games_bulk(games, cursor, season_ids, team_ids, batch_size=BATCH_SIZE, step="games"):
+    start = time.perf_counter()
+    staged = 0
+    skipped = 0
+    batch = []
+
+    cursor.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS games_staging (
+            staged_order SERIAL,
+            season_id INTEGER NOT NULL,
+            home_team_id INTEGER NOT NULL,
+            away_team_id INTEGER NOT NULL,
+            home_score INTEGER,
+            away_score INTEGER,
+            date TIMESTAMPTZ,
+            week INTEGER,
+            round TEXT NOT NULL
+        ) ON COMMIT DROP;
+        TRUNCATE games_staging;
+    """)
+
+    def flush():
+        nonlocal staged
+        execute_values(cursor, """
+            INSERT INTO games_staging (season_id, home_team_id, away_team_id, home_score, away_score, date, week, round)
+            VALUES %s;
+        """, batch, page_size=batch_size)
+        staged += len(batch)
+        batch.clear()
+
+    for game in games:
+        row = build_game_row(game, season_ids, team_ids)
+        if row is None:
+            skipped += 1
+            continue
+        batch.append(row)
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+
+    # Games without a week share the key of every other unknown-week game between the same teams
+    # in the season, so two of them can't be told apart: report and skip them instead of merging
+    cursor.execute("""
+        DELETE FROM games_staging s
+        USING (
+            SELECT season_id, home_team_id, away_team_id
+            FROM games_staging
+            WHERE week IS NULL
+            GROUP BY season_id, home_team_id, away_team_id
+            HAVING COUNT(*) > 1
+        ) c
+        WHERE s.week IS NULL
+          AND (s.season_id, s.home_team_id, s.away_team_id) = (c.season_id, c.home_team_id, c.away_team_id)
+        RETURNING s.season_id, s.home_team_id, s.away_team_id;
+    """)
+    collisions = cursor.fetchall()
+    if collisions:
+        print(f"Skipped {len(collisions)} unknown-week games that share their natural key: "
+              f"{sorted(set(collisions))}")
+    staged -= len(collisions)
+
+    # DISTINCT ON keeps one row per key so a single statement never updates the same game twice;
+    # the row staged last wins. xmax = 0 identifies freshly inserted rows in RETURNING.
+    cursor.execute("""
+        INSERT INTO games (season_id, home_team_id, away_team_id, home_score, away_score, date, week, round)
+        SELECT DISTINCT ON (season_id, COALESCE(week, -1), home_team_id, away_team_id)
+               season_id, home_team_id, away_team_id, home_score, away_score, date, week, round
+        FROM games_staging
+        ORDER BY season_id, COALESCE(week, -1), home_team_id, away_team_id, staged_order DESC
+        ON CONFLICT """ + GAME_NATURAL_KEY + """ DO UPDATE
+        SET home_score = EXCLUDED.home_score, away_score = EXCLUDED.away_score,
+            date = EXCLUDED.date, round = EXCLUDED.round
+        WHERE (games.home_score, games.away_score, games.date, games.round)
+              IS DISTINCT FROM (EXCLUDED.home_score, EXCLUDED.away_score, EXCLUDED.date, EXCLUDED.round)
+        RETURNING (xmax = 0);
+    """)
+    results = [row[0] for row in cursor.fetchall()]
+    inserted = sum(results)
+    updated = len(results) - inserted
+
+    elapsed = time.perf_counter() - start
+    rate = staged / elapsed if elapsed > 0 else float('inf')
+    print(f"Merged {staged} games in {elapsed:.2f}s ({rate:,.0f} rows/sec): "
+          f"{inserted} inserted, {updated} updated, {staged - inserted - updated} unchanged, "
+          f"{skipped + len(collisions)} skipped")
+    run_metrics.active.record_step(step, rows=staged, inserted=inserted, updated=updated,
+                                   unchanged=staged - inserted - updated, skipped=skipped,
+                                   key_collisions=len(collisions), seconds=round(elapsed, 4),
+                                   rows_per_second=round(rate, 1))
+    return inserted, updated
+
+# Function to link every team already in the database to its franchise from pipeline/franchises.py,
+# the single source of the mapping (database/migrations/005_franchises.sql relies on it).
+# Franchises left without teams are removed. Returns the number of teams whose link changed.
+def link_franchises(cursor):
+    cursor.execute("SELECT name FROM teams;")
+    teams = [row[0] for row in cursor.fetchall()]
+    if not teams:
+        return 0
+    franchise_ids = insert_franchises_bulk([franchise_for(team) for team in teams], cursor)
+    relinked = execute_values(cursor, """
+        UPDATE teams
+        SET franchise_id = v.franchise_id
+        FROM (VALUES %s) AS v (name, franchise_id)
+        WHERE teams.name = v.name AND teams.franchise_id IS DISTINCT FROM v.franchise_id
+        RETURNING teams.team_id;
+    """, [(team, franchise_ids[franchise_for(team)]) for team in teams], fetch=True)
+    if relinked:
+        mark_rows_changed(cursor)
+    cursor.execute("""
+        DELETE FROM franchises f
+        WHERE NOT EXISTS (SELECT 1 FROM teams t WHERE t.franchise_id = f.franchise_id);
+    """)
+    return len(relinked)
+
+# Function to (re)link all teams to their franchises and refresh the aggregates in one transaction
+def link_franchises_in_db():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        relinked = link_franchises(cursor)
+        print(f"Re-linked {relinked} teams to their franchises")
+        run_metrics.active.record_step("link_franchises", rows=relinked)
+        refresh_aggregates(cursor)
+        bump_data_version(cursor)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"Error while linking franchises: {e}")
+        run_metrics.active.error(f"Error while linking franchises: {e}", error_type=type(e).__name__)
+    finally:
+        cursor.close()
+        conn.close()
+
+# Materialized aggregates read by the dashboard (see database/schema.sql)
+AGGREGATE_VIEWS = ["franchise_season_records", "scoreline_counts", "franchise_playoff_records"]
+
+# Function to refresh the aggregate views (all of them by default) after a load.
+# CONCURRENTLY lets dashboard queries keep reading the old contents while the refresh runs.
+def refresh_aggregates(cursor, views=AGGREGATE_VIEWS):
+    for view in views:
+        start = time.perf_counter()
+        cursor.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view};")
+        elapsed = time.perf_counter() - start
+        print(f"Refreshed {view} in {elapsed:.2f}s")
+        run_metrics.active.record_step(f"refresh_{view}", seconds=round(elapsed, 4))
+
+# Function to flag that existing rows changed (updated scores, re-linked teams), so the next
+# version bump tells the dashboard to rebuild its incremental structures instead of appending.
+# It locks the single data_version row, so keep it out of transactions that run in parallel.
+def mark_rows_changed(cursor):
+    cursor.execute("UPDATE data_version SET rows_changed = TRUE WHERE NOT rows_changed;")
+
+# Function to bump the data version stamp so dashboard caches pick up the new data.
+# Also records the highest game_id and, if existing rows changed since the last bump, the new
+# version as rebuild_version (see database/schema.sql).
+def bump_data_version(cursor):
+    cursor.execute("""
+        UPDATE data_version
+        SET version = version + 1, updated_at = now(),
+            max_game_id = (SELECT MAX(game_id) FROM games),
+            rebuild_version = CASE WHEN rows_changed THEN version + 1 ELSE rebuild_version END,
+            rows_changed = FALSE
+        RETURNING version;
+    """)
+    result = cursor.fetchone()
+    return result[0] if result else None
 
 # Function to get the team ID by team name
 def get_team_id(team_name, cursor):
@@ -82,46 +379,246 @@ def get_season_id(year, season_type, cursor):
     return result[0] if result else None
 
 # Main function to load data into the database
-def load_data_to_db(input_file="nfl_data_all_years.json"):
+# (input_file may also be a directory of per-season NDJSON files written by extract.py --format ndjson)
+# bulk=False keeps the original row-by-row path for comparison.
+def load_data_to_db(input_file="nfl_data_all_years.json", bulk=True, batch_size=BATCH_SIZE):
     # Connect to the PostgreSQL database using credentials from the .env file
-    conn = psycopg2.connect(
-        host=DB_HOST,
-        dbname=DB_NAME,
-        user=DB_USER,
-        password=DB_PASSWORD
-    )
+    conn = get_db_connection()
     cursor = conn.cursor()
 
     try:
-        # Load the data from the JSON file
-        data = load_data_from_json(input_file)
+        # Load the data from the JSON file, or stream it from the NDJSON partitions
+        if os.path.isdir(input_file):
+            teams, seasons = scan_teams_and_seasons(input_file)
+            games = iter_games_from_ndjson(input_file)
+        else:
+            data = load_data_from_json(input_file)
+            teams, seasons, games = data['teams'], data['seasons'], data['games']
 
-        # Insert teams into the database
-        print("Inserting teams...")
-        insert_teams(data['teams'], cursor)
+        metrics = run_metrics.active
+        if bulk:
+            # Resolve every team and season ID once, then stream games in batches
+            print("Inserting teams...")
+            start = time.perf_counter()
+            team_ids, relinked = insert_teams_bulk(teams, cursor)
+            metrics.record_step("teams", rows=len(team_ids), relinked=relinked,
+                                seconds=round(time.perf_counter() - start, 4))
 
-        # Insert seasons into the database
-        print("Inserting seasons...")
-        insert_seasons(data['seasons'], cursor)
+            print("Inserting seasons...")
+            start = time.perf_counter()
+            season_ids = insert_seasons_bulk(seasons, cursor)
+            metrics.record_step("seasons", rows=len(season_ids), seconds=round(time.perf_counter() - start, 4))
+
+            print("Inserting games...")
+            _, updated = insert_games_bulk(games, cursor, season_ids, team_ids, batch_size)
+            if updated or relinked:
+                mark_rows_changed(cursor)
+        else:
+            # Insert teams into the database
+            print("Inserting teams...")
+            insert_teams(teams, cursor)
+
+            # Insert seasons into the database
+            print("Inserting seasons...")
+            insert_seasons(seasons, cursor)
+
+            # Insert games into the database
+            print("Inserting games...")
+            start = time.perf_counter()
+            rows = insert_games(games, cursor)
+            elapsed = time.perf_counter() - start
+            metrics.record_step("games", rows=rows, seconds=round(elapsed, 4),
+                                rows_per_second=round(rows / elapsed, 1) if elapsed > 0 else None)
+            # The row-by-row upsert can't tell updates from inserts
+            mark_rows_changed(cursor)
 
-        # Insert games into the database
-        print("Inserting games...")
-        insert_games(data['games'], cursor)
+        # Rebuild the aggregates and publish the new data to the dashboard in the same transaction
+        print("Refreshing aggregates...")
+        refresh_aggregates(cursor)
+        version = bump_data_version(cursor)
 
         # Commit the changes to the database
+        start = time.perf_counter()
         conn.commit()
+        metrics.record_step("commit", data_version=version, seconds=round(time.perf_counter() - start, 4))
         print("Data successfully inserted into the database.")
 
     except Exception as e:
         # Rollback in case of error
         conn.rollback()
         print(f"Error during data insertion: {e}")
+        run_metrics.active.error(f"Error during data insertion: {e}", error_type=type(e).__name__)
 
     finally:
         # Close the cursor and connection
         cursor.close()
         conn.close()
 
+# Function to read the teams and seasons plus the per-season game sources of the input:
+# {year: list of games} for a JSON file, {year: NDJSON partition path} for a directory
+def season_partitions(input_file):
+    partitions = {}
+    if os.path.isdir(input_file):
+        teams, seasons = scan_teams_and_seasons(input_file)
+        for name in sorted(os.listdir(input_file)):
+            if name.startswith("season_") and name.endswith(".ndjson"):
+                partitions[int(name[len("season_"):-len(".ndjson")])] = os.path.join(input_file, name)
+    else:
+        data = load_data_from_json(input_file)
+        teams, seasons = data['teams'], data['seasons']
+        for game in data['games']:
+            partitions.setdefault(int(game['season_year']), []).append(game)
+    return teams, seasons, partitions
+
+# Function to read one season's games from a partition (a list, or an NDJSON file streamed line by line)
+def iter_partition_games(partition):
+    if isinstance(partition, list):
+        yield from partition
+        return
+    with open(partition, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+# Function to load one season on its own connection and in its own transaction.
+# Returns (error, rows_changed): error is None on success or the error message (the season's
+# transaction is rolled back), rows_changed tells whether existing games were updated.
+# data_version is left alone so the seasons' transactions never wait on each other.
+def load_season(year, partition, season_ids, team_ids, batch_size=BATCH_SIZE):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        _, updated = insert_games_bulk(iter_partition_games(partition), cursor, season_ids, team_ids, batch_size,
+                                       step=f"season_{year}")
+        conn.commit()
+        return None, updated > 0
+    except Exception as e:
+        conn.rollback()
+        print(f"Error loading season {year}: {e}")
+        run_metrics.active.error(f"Error loading season {year}: {e}", year=year, error_type=type(e).__name__)
+        return str(e), False
+    finally:
+        cursor.close()
+        conn.close()
+
+# Function to read the failed seasons recorded by earlier partitioned loads ({year: error})
+def load_failed_seasons(failed_file=FAILED_SEASONS_FILE):
+    if not os.path.exists(failed_file):
+        return {}
+    with open(failed_file, "r") as f:
+        return {int(year): error for year, error in json.load(f)["failed"].items()}
+
+# Function to update the failed seasons file after a load: seasons that were attempted are
+# replaced by their new outcome, failures from earlier runs that weren't retried are kept
+def save_failed_seasons(input_file, attempted, failed, failed_file=FAILED_SEASONS_FILE):
+    remaining = {year: error for year, error in load_failed_seasons(failed_file).items() if year not in attempted}
+    remaining.update(failed)
+
+    if not remaining:
+        if os.path.exists(failed_file):
+            os.remove(failed_file)
+        return
+    with open(failed_file, "w") as f:
+        json.dump({"input": input_file, "failed": {str(year): error for year, error in sorted(remaining.items())}},
+                  f, indent=4)
+    print(f"{len(remaining)} season(s) failed, retry them with --retry-failed (see {failed_file})")
+
+# Partitioned version of load_data_to_db: teams and seasons are upserted first in one short
+# transaction, then every season's games are merged by a small worker pool, each worker using
+# its own connection and one transaction per season. A bad season only rolls back itself.
+# Seasons never share a natural key, so the result matches the serial load.
+# `years` restricts the load to some seasons (e.g. the ones that failed last time).
+def load_data_partitioned(input_file="nfl_data_all_years.json", workers=4, batch_size=BATCH_SIZE, years=None,
+                          failed_file=FAILED_SEASONS_FILE):
+    metrics = run_metrics.active
+    teams, seasons, partitions = season_partitions(input_file)
+    if years is not None:
+        partitions = {year: partitions[year] for year in years if year in partitions}
+
+    # Resolve every team and season ID once, shared read-only by the workers
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        print("Inserting teams...")
+        team_ids, relinked = insert_teams_bulk(teams, cursor)
+        print("Inserting seasons...")
+        season_ids = insert_seasons_bulk(seasons, cursor)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        cursor.close()
+        conn.close()
+        raise
+
+    print(f"Loading {len(partitions)} season(s) with {workers} workers...")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            year: executor.submit(load_season, year, partition, season_ids, team_ids, batch_size)
+            for year, partition in sorted(partitions.items())
+        }
+        results = {year: future.result() for year, future in futures.items()}
+    failed = {year: error for year, (error, _) in results.items() if error is not None}
+    elapsed = time.perf_counter() - start
+    metrics.record_step("partitioned_load", seasons=len(partitions), failed=len(failed), workers=workers,
+                        seconds=round(elapsed, 4))
+    print(f"Loaded {len(partitions) - len(failed)}/{len(partitions)} season(s) in {elapsed:.2f}s")
+
+    # Rebuild the aggregates once and publish whatever was committed (re-linked teams were
+    # committed with the setup transaction above)
+    try:
+        if relinked or len(failed) < len(partitions):
+            if relinked or any(rows_changed for _, rows_changed in results.values()):
+                mark_rows_changed(cursor)
+            print("Refreshing aggregates...")
+            refresh_aggregates(cursor)
+            bump_data_version(cursor)
+            conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+    save_failed_seasons(input_file, set(partitions), failed, failed_file)
+    return failed
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load extracted NFL data into PostgreSQL")
+    parser.add_argument("--input", default="nfl_data_all_years.json",
+                        help="JSON file or directory of per-season NDJSON files")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Game rows per INSERT batch")
+    parser.add_argument("--row-by-row", action="store_true", help="Use the original one-row-at-a-time inserts")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Load seasons in parallel, one transaction per season (1 = single transaction)")
+    parser.add_argument("--seasons", type=int, nargs="+", default=None,
+                        help="Only load these seasons (partitioned mode)")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help=f"Only reload the seasons recorded in {FAILED_SEASONS_FILE} by the last partitioned load")
+    parser.add_argument("--link-franchises", action="store_true",
+                        help="Only link the existing teams to their franchises (run after migration 005)")
+    parser.add_argument("--metrics-log", metavar="FILE", default=None,
+                        help="Append structured JSON log lines to FILE ('-' for stderr)")
+    parser.add_argument("--run-summary", metavar="FILE", default="load_run_summary.json",
+                        help="Where to write the JSON summary of the run")
+    args = parser.parse_args()
+
+    metrics = run_metrics.start_run("load", args.metrics_log)
+
     # Call the function to load data into the database
-    load_data_to_db()
+    try:
+        if args.link_franchises:
+            link_franchises_in_db()
+        elif args.workers > 1 or args.seasons or args.retry_failed:
+            years = sorted(load_failed_seasons()) if args.retry_failed else args.seasons
+            load_data_partitioned(args.input, workers=args.workers, batch_size=args.batch_size, years=years)
+        else:
+            load_data_to_db(args.input, bulk=not args.row_by_row, batch_size=args.batch_size)
+    except Exception as e:
+        metrics.error(f"Load failed: {e}")
+        raise
+    finally:
+        summary = metrics.write_summary(args.run_summary)
+
+    # Exit non-zero when the load was rolled back so schedulers notice
+    if summary["status"] != "ok":
+        raise SystemExit(1)
+
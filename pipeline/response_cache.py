@@ -0,0 +1,155 @@
+import json
+import os
+import time
+import hashlib
+import threading
+from datetime import date
+
+import requests
+
+# Default location of the on-disk scoreboard cache (shared by extract.py and season_results.py)
+CACHE_DIR = os.getenv(
+    "SCOREBOARD_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".scoreboard_cache")
+)
+
+# How long a payload for a calendar year that is still in progress is trusted before revalidating
+CURRENT_TTL_SECONDS = int(os.getenv("SCOREBOARD_CACHE_TTL", 15 * 60))
+
+# Function to decide whether a dates={year} payload can no longer change.
+# A calendar year's payload holds that year's games only, so it is final once the year is over.
+def is_final_dates(dates):
+    return int(dates) < date.today().year
+
+# Content-addressed cache of raw scoreboard responses.
+#   index/<sha256(url)>.json  -> metadata (url, etag, fetched_at, final, object hash)
+#   objects/<sha256(body)>    -> raw response body
+# Finished years are kept forever; the current year is revalidated after the TTL
+# using the stored ETag / Last-Modified headers.
+class ResponseCache:
+    def __init__(self, cache_dir=CACHE_DIR, ttl=CURRENT_TTL_SECONDS, offline=False):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.offline = offline
+        self.index_dir = os.path.join(cache_dir, "index")
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        os.makedirs(self.index_dir, exist_ok=True)
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        # One lock per URL so concurrent workers asking for the same payload download it once
+        self.locks = {}
+        self.locks_guard = threading.Lock()
+
+        # Counters for the run summary
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    def url_lock(self, url):
+        with self.locks_guard:
+            return self.locks.setdefault(url, threading.Lock())
+
+    def index_path(self, url):
+        return os.path.join(self.index_dir, hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest)
+
+    # Write a file atomically so a crash never leaves a half-written entry behind
+    def write_atomic(self, path, content):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def read_entry(self, url):
+        path = self.index_path(url)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            entry = json.load(f)
+        if not os.path.exists(self.object_path(entry["sha256"])):
+            return None
+        return entry
+
+    def read_body(self, entry):
+        with open(self.object_path(entry["sha256"]), "rb") as f:
+            return f.read()
+
+    def store(self, url, response, final):
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        object_path = self.object_path(digest)
+        if not os.path.exists(object_path):
+            self.write_atomic(object_path, body)
+
+        entry = {
+            "url": url,
+            "sha256": digest,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "final": final
+        }
+        self.write_atomic(self.index_path(url), json.dumps(entry).encode())
+        return body
+
+    def touch(self, url, entry, final):
+        entry["fetched_at"] = time.time()
+        entry["final"] = final
+        self.write_atomic(self.index_path(url), json.dumps(entry).encode())
+
+    # Function to get the raw body for a URL, downloading it only if needed.
+    # `fetcher(url, headers)` performs the actual request and returns a requests.Response.
+    # Returns (status_code, body) where body is None if nothing usable is available.
+    def fetch(self, url, fetcher, final=False):
+        with self.url_lock(url):
+            entry = self.read_entry(url)
+
+            if entry is not None:
+                # Only an entry stored as final is trusted forever. A copy cached while the year was still
+                # in progress may miss its last games, so once the caller says the year is final it is
+                # revalidated once and then rewritten with final=True.
+                if entry["final"]:
+                    fresh = True
+                else:
+                    fresh = not final and (time.time() - entry["fetched_at"]) < self.ttl
+                if fresh or self.offline:
+                    self.hits += 1
+                    return 200, self.read_body(entry)
+            elif self.offline:
+                print(f"Offline and no cached response for {url}")
+                return None, None
+
+            # Conditional request when we already hold a (stale) copy
+            headers = {}
+            if entry is not None:
+                if entry.get("etag"):
+                    headers["If-None-Match"] = entry["etag"]
+                if entry.get("last_modified"):
+                    headers["If-Modified-Since"] = entry["last_modified"]
+
+            try:
+                response = fetcher(url, headers)
+            except requests.RequestException as e:
+                if entry is not None:
+                    print(f"Network error for {url} ({e}), serving cached copy")
+                    self.hits += 1
+                    return 200, self.read_body(entry)
+                raise
+
+            if response.status_code == 304 and entry is not None:
+                self.revalidated += 1
+                self.touch(url, entry, final)
+                return 200, self.read_body(entry)
+
+            if response.status_code == 200:
+                self.misses += 1
+                return 200, self.store(url, response, final)
+
+            # Upstream error: fall back to the stale copy if we have one
+            if entry is not None:
+                print(f"Got {response.status_code} for {url}, serving cached copy")
+                self.hits += 1
+                return 200, self.read_body(entry)
+            return response.status_code, None
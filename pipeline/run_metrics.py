@@ -0,0 +1,139 @@
+import json
+import os
+import sys
+import time
+import uuid
+import threading
+from datetime import datetime
+
+# Structured metrics for extract.py and load.py runs.
+#
+# Every measurement is emitted as one JSON object per line (to a log file, or stderr with "-")
+# so production runs can be grepped and shipped to a log pipeline, and the whole run is
+# summarized into a single JSON file at the end:
+#
+#   {"run_id": ..., "stage": "extract", "status": "ok", "duration_seconds": ...,
+#    "totals": {"requests": ..., "retries": ..., "bytes": ..., "games": ...},
+#    "years": {"2023": {"fetch_seconds": ..., "bytes": ..., "events": ..., "kept": ..., ...}},
+#    "slowest_years": [...], "steps": {"games": {"rows_per_second": ...}}, "errors": [...]}
+#
+# The extract/load functions report to `active`, which start_run() replaces at the start of a
+# run. Without start_run() the default collector only accumulates in memory.
+
+# Numeric per-year fields that are also summed into the run totals
+YEAR_TOTALS = ("requests", "retries", "bytes", "events", "kept")
+
+# Collector for one pipeline run (thread-safe: the concurrent fetcher reports from worker threads)
+class RunMetrics:
+    def __init__(self, stage="pipeline", log_file=None):
+        self.stage = stage
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.start = time.perf_counter()
+        self.lock = threading.Lock()
+
+        self.log_stream = None
+        if log_file == "-":
+            self.log_stream = sys.stderr
+        elif log_file:
+            self.log_stream = open(log_file, "a")
+
+        self.years = {}
+        self.steps = {}
+        self.totals = {}
+        self.errors = []
+
+    # Write one structured log line
+    def log(self, event, **fields):
+        if self.log_stream is None:
+            return
+        line = json.dumps({
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "run_id": self.run_id,
+            "stage": self.stage,
+            "event": event,
+            **fields
+        }, default=str)
+        with self.lock:
+            self.log_stream.write(line + "\n")
+            self.log_stream.flush()
+
+    # Add to run-wide counters
+    def count(self, **counts):
+        with self.lock:
+            for name, value in counts.items():
+                self.totals[name] = self.totals.get(name, 0) + value
+
+    # Record the fetch/parse metrics of one season
+    def record_year(self, year, **fields):
+        with self.lock:
+            self.years[str(year)] = fields
+        self.count(**{name: fields[name] for name in YEAR_TOTALS if name in fields})
+        self.log("year", year=year, **fields)
+
+    # Record the metrics of one named step (e.g. a load phase)
+    def record_step(self, name, **fields):
+        with self.lock:
+            self.steps[name] = fields
+        self.log("step", name=name, **fields)
+
+    # Record a transient problem that doesn't fail the run (counted in totals["warnings"])
+    def warning(self, message, **fields):
+        self.count(warnings=1)
+        self.log("warning", message=message, **fields)
+
+    # Record a failure that the pipeline handled without stopping
+    def error(self, message, **fields):
+        with self.lock:
+            self.errors.append({"message": message, **fields})
+        self.log("error", message=message, **fields)
+
+    # Function to build the run summary
+    def summary(self, slowest=5):
+        with self.lock:
+            years = dict(self.years)
+            slowest_years = sorted(
+                ({"year": year, "fetch_seconds": fields["fetch_seconds"]}
+                 for year, fields in years.items() if "fetch_seconds" in fields),
+                key=lambda entry: entry["fetch_seconds"], reverse=True
+            )[:slowest]
+            return {
+                "run_id": self.run_id,
+                "stage": self.stage,
+                "status": "failed" if self.errors else "ok",
+                "started_at": self.started_at,
+                "finished_at": datetime.now().isoformat(timespec="seconds"),
+                "duration_seconds": round(time.perf_counter() - self.start, 3),
+                "totals": dict(self.totals),
+                "years": years,
+                "slowest_years": slowest_years,
+                "steps": dict(self.steps),
+                "errors": list(self.errors)
+            }
+
+    # Function to write the run summary (atomically) and close the log
+    def write_summary(self, path):
+        summary = self.summary()
+        self.log("run_finished", status=summary["status"], duration_seconds=summary["duration_seconds"],
+                 totals=summary["totals"])
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(summary, f, indent=4)
+        os.replace(tmp_path, path)
+        print(f"Run summary saved to {path}")
+
+        if self.log_stream is not None and self.log_stream is not sys.stderr:
+            self.log_stream.close()
+        self.log_stream = None
+        return summary
+
+# Collector the pipeline currently reports to
+active = RunMetrics()
+
+# Function to start a new run and make it the active collector
+def start_run(stage, log_file=None):
+    global active
+    active = RunMetrics(stage, log_file)
+    active.log("run_started")
+    return active
@@ -0,0 +1,230 @@
+import re
+import json
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+from franchises import franchise_for
+
+# Columnar snapshot of all games for offline analytics and read-only dashboards.
+#
+# A snapshot is a directory holding one .npy file per column plus meta.json with the
+# lookup tables for the integer-coded columns. Columns are opened with np.load(mmap_mode='r'),
+# so a cold start maps the files instead of parsing JSON or querying PostgreSQL, and
+# several worker processes share the same pages through the OS page cache.
+#
+#   game_id       int32   database game_id (or row number when exported from JSON)
+#   season_year   int16
+#   season_type   int8    index into meta["season_types"]
+#   week          int8    -1 when unknown
+#   round         int8    index into meta["rounds"]
+#   home_team_id  int16   index into meta["teams"]
+#   away_team_id  int16   index into meta["teams"]
+#   home_score    int16   -1 when missing
+#   away_score    int16   -1 when missing
+#
+# meta["team_franchises"][team_id] is the index of the team's franchise in meta["franchises"].
+#
+# Every snapshot is written to its own versioned directory next to SNAPSHOT_DIR, and SNAPSHOT_DIR
+# itself is a symlink that is switched to the new version with os.replace (an atomic rename), so a
+# reader sees either the old or the new snapshot, never a mix. load_snapshot resolves the link once.
+
+SNAPSHOT_DIR = "nfl_snapshot"
+SNAPSHOT_FORMAT = 2  # 2: 'Conference Championship' dropped from ROUNDS (espn_parser files it as 'Championship Round')
+
+# Versioned directories kept after a switch (the new one and the previous one, which readers may
+# still be opening)
+KEEP_VERSIONS = 2
+
+COLUMN_TYPES = {
+    "game_id": np.int32,
+    "season_year": np.int16,
+    "season_type": np.int8,
+    "week": np.int8,
+    "round": np.int8,
+    "home_team_id": np.int16,
+    "away_team_id": np.int16,
+    "home_score": np.int16,
+    "away_score": np.int16
+}
+
+SEASON_TYPES = ["regular-season", "post-season"]
+ROUNDS = ["Regular Season", "Wild Card Round", "Divisional Round", "Championship Round", "Super Bowl", "Pro Bowl"]
+
+# Function to turn a score/week value into an int, using -1 for missing values
+def to_int(value):
+    if value is None or value == "" or value == "Unknown Week":
+        return -1
+    return int(value)
+
+# Function to write a snapshot from an iterable of game dicts.
+# Games use the extract.py layout (season_year, season_type, home_team, away_team,
+# home_score, away_score, week, round_type) plus an optional game_id.
+def write_snapshot(games, output_dir=SNAPSHOT_DIR, source=None):
+    start = time.perf_counter()
+    team_codes = {}
+    season_type_codes = {name: i for i, name in enumerate(SEASON_TYPES)}
+    round_codes = {name: i for i, name in enumerate(ROUNDS)}
+    columns = {name: [] for name in COLUMN_TYPES}
+
+    def code(codes, value):
+        if value not in codes:
+            codes[value] = len(codes)
+        return codes[value]
+
+    for row_number, game in enumerate(games):
+        columns["game_id"].append(game.get("game_id", row_number))
+        columns["season_year"].append(int(game["season_year"]))
+        columns["season_type"].append(code(season_type_codes, game["season_type"]))
+        columns["week"].append(to_int(game["week"]))
+        columns["round"].append(code(round_codes, game["round_type"]))
+        columns["home_team_id"].append(code(team_codes, game["home_team"]))
+        columns["away_team_id"].append(code(team_codes, game["away_team"]))
+        columns["home_score"].append(to_int(game["home_score"]))
+        columns["away_score"].append(to_int(game["away_score"]))
+
+    # Sort chronologically (season, regular season before playoffs, week with unknown weeks last,
+    # then game_id) so consumers can rely on row order
+    arrays = {name: np.asarray(values, dtype=COLUMN_TYPES[name]) for name, values in columns.items()}
+    weeks = np.where(arrays["week"] < 0, np.iinfo(arrays["week"].dtype).max, arrays["week"])
+    order = np.lexsort((arrays["game_id"], weeks, arrays["season_type"], arrays["season_year"]))
+    arrays = {name: values[order] for name, values in arrays.items()}
+
+    teams = sorted(team_codes, key=team_codes.get)
+    franchises = sorted({franchise_for(team) for team in teams})
+    franchise_codes = {name: i for i, name in enumerate(franchises)}
+
+    meta = {
+        "format": SNAPSHOT_FORMAT,
+        "version": int(time.time()),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "source": source,
+        "rows": int(len(order)),
+        "teams": teams,
+        "franchises": franchises,
+        "team_franchises": [franchise_codes[franchise_for(team)] for team in teams],
+        "season_types": sorted(season_type_codes, key=season_type_codes.get),
+        "rounds": sorted(round_codes, key=round_codes.get)
+    }
+
+    # Write a new versioned directory, then point the output_dir symlink at it
+    output_dir = os.path.normpath(output_dir)
+    name = os.path.basename(output_dir)
+    version_dir = tempfile.mkdtemp(prefix=f"{name}.{meta['version']}.", dir=os.path.dirname(output_dir) or ".")
+    os.chmod(version_dir, 0o755)
+    for column, values in arrays.items():
+        np.save(os.path.join(version_dir, f"{column}.npy"), values)
+    with open(os.path.join(version_dir, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=4)
+    publish_snapshot(version_dir, output_dir)
+
+    print(f"Snapshot of {meta['rows']} games written to {output_dir}/ in {time.perf_counter() - start:.2f}s")
+    return meta
+
+# Function to switch the output_dir symlink to a versioned snapshot directory (in the same parent)
+# and delete the versions before the previous one
+def publish_snapshot(version_dir, output_dir=SNAPSHOT_DIR):
+    parent, name = os.path.split(os.path.normpath(output_dir))
+    parent = parent or "."
+    link_tmp = f"{output_dir}.{os.getpid()}.link"
+    if os.path.lexists(link_tmp):
+        os.remove(link_tmp)
+    os.symlink(os.path.basename(version_dir), link_tmp)
+
+    # A snapshot written before versioning is a plain directory: move it aside once so the link can
+    # take its place (readers can miss the snapshot for that one upgrade only)
+    if os.path.isdir(output_dir) and not os.path.islink(output_dir):
+        os.rename(output_dir, tempfile.mkdtemp(prefix=f"{name}.0.", dir=parent))
+    os.replace(link_tmp, output_dir)
+
+    # Versioned directories, newest first (mkdtemp names start with the version stamp)
+    pattern = re.compile(rf"^{re.escape(name)}\.(\d+)\.[^.]+$")
+    versions = sorted((entry for entry in os.listdir(parent) if pattern.match(entry)),
+                      key=lambda entry: (int(pattern.match(entry).group(1)),
+                                         os.path.getmtime(os.path.join(parent, entry))), reverse=True)
+    current = os.path.basename(version_dir)
+    for stale in [entry for entry in versions if entry != current][KEEP_VERSIONS - 1:]:
+        shutil.rmtree(os.path.join(parent, stale), ignore_errors=True)
+
+# Function to read a snapshot; columns are memory-mapped unless mmap=False.
+# A symlinked snapshot is resolved once, so every column comes from the same version.
+def load_snapshot(snapshot_dir=SNAPSHOT_DIR, mmap=True):
+    snapshot_dir = os.path.realpath(snapshot_dir)
+    with open(os.path.join(snapshot_dir, "meta.json"), "r") as f:
+        meta = json.load(f)
+    if meta.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported snapshot format {meta.get('format')} in {snapshot_dir}")
+
+    columns = {
+        name: np.load(os.path.join(snapshot_dir, f"{name}.npy"), mmap_mode="r" if mmap else None)
+        for name in COLUMN_TYPES
+    }
+    return columns, meta
+
+# Function to build a pandas DataFrame of games from a snapshot.
+# Team, season type and round columns are categoricals over the snapshot's lookup tables.
+# The integer columns stay views of the (memory-mapped) arrays; only week and the scores are
+# materialized, as floats with NaN for missing values.
+def snapshot_to_frame(columns, meta):
+    import pandas as pd
+
+    frame = pd.DataFrame({name: np.asarray(values) for name, values in columns.items()}, copy=False)
+    frame["season_type"] = pd.Categorical.from_codes(frame["season_type"], meta["season_types"])
+    frame["round"] = pd.Categorical.from_codes(frame["round"], meta["rounds"])
+    frame["home_team"] = pd.Categorical.from_codes(frame["home_team_id"], meta["teams"])
+    frame["away_team"] = pd.Categorical.from_codes(frame["away_team_id"], meta["teams"])
+
+    # Restore missing values
+    frame["week"] = frame["week"].where(frame["week"] >= 0)
+    frame["home_score"] = frame["home_score"].where(frame["home_score"] >= 0)
+    frame["away_score"] = frame["away_score"].where(frame["away_score"] >= 0)
+    return frame
+
+# Function to read games out of the database in the extract.py layout
+def iter_games_from_db(cursor):
+    cursor.execute("""
+        SELECT g.game_id, s.year, s.type, ht.name, at.name, g.home_score, g.away_score, g.week, g.round
+        FROM games g
+        JOIN seasons s ON s.season_id = g.season_id
+        JOIN teams ht ON ht.team_id = g.home_team_id
+        JOIN teams at ON at.team_id = g.away_team_id
+        ORDER BY s.year, CASE s.type WHEN 'regular-season' THEN 0 ELSE 1 END, g.week NULLS LAST, g.game_id
+    """)
+    for game_id, year, season_type, home_team, away_team, home_score, away_score, week, round_type in cursor:
+        yield {
+            "game_id": game_id,
+            "season_year": year,
+            "season_type": season_type,
+            "home_team": home_team,
+            "away_team": away_team,
+            "home_score": home_score,
+            "away_score": away_score,
+            "week": week,
+            "round_type": round_type
+        }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a memory-mappable columnar snapshot of all games")
+    parser.add_argument("--input", default="nfl_data_all_years.json",
+                        help="JSON file or directory of per-season NDJSON files written by extract.py")
+    parser.add_argument("--from-db", action="store_true", help="Export from PostgreSQL instead (keeps database game IDs)")
+    parser.add_argument("--output", default=SNAPSHOT_DIR, help="Snapshot directory")
+    args = parser.parse_args()
+
+    if args.from_db:
+        from load import get_db_connection
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            write_snapshot(iter_games_from_db(cursor), args.output, source="postgres")
+        finally:
+            cursor.close()
+            conn.close()
+    elif os.path.isdir(args.input):
+        from load import iter_games_from_ndjson
+        write_snapshot(iter_games_from_ndjson(args.input), args.output, source=args.input)
+    else:
+        from load import load_data_from_json
+        write_snapshot(load_data_from_json(args.input)["games"], args.output, source=args.input)
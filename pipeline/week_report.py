@@ -0,0 +1,34 @@
+import json
+import os
+from espn_parser import result_string
+
+# Per-week / per-round results report (nfl_{year}_game_results_by_week.json), built from GameRecords
+
+PLAYOFF_ROUNDS = ["Wild Card Round", "Divisional Round", "Championship Round", "Super Bowl", "Pro Bowl"]
+
+# Function to group records into regular season weeks and playoff rounds
+def build_week_report(records):
+    week_results = {}
+    playoff_results = {round_name: [] for round_name in PLAYOFF_ROUNDS}
+
+    for record in records:
+        if record.season_type == 'regular-season':
+            week_results.setdefault(record.week, []).append(result_string(record))
+        elif record.round_type in playoff_results:
+            playoff_results[record.round_type].append(result_string(record))
+
+    sorted_week_results = dict(sorted(week_results.items(), key=lambda x: (x[0] if isinstance(x[0], int) else float('inf'))))
+
+    return {
+        "Regular Season": sorted_week_results,
+        "Playoffs": playoff_results
+    }
+
+# Function to write the report for one season
+def save_week_report(year, records, output_dir="."):
+    path = os.path.join(output_dir, f"nfl_{year}_game_results_by_week.json")
+    with open(path, "w") as f:
+        json.dump(build_week_report(records), f, indent=4)
+
+    print(f"Data saved to {path}")
+    return path
@@ -1,105 +1,154 @@
-import requests
-import json
-
-# Function to fetch and process the games for a given year
-def fetch_and_process_games(year):
-    # Initialize dictionaries to store results by week and playoff rounds
-    week_results = {}
-    playoff_results = {
-        "Wild Card Round": [],
-        "Divisional Round": [],
-        "Championship Round": [],
-        "Super Bowl": [],
-        "Pro Bowl": []  # Added Pro Bowl section
-    }
-
-    # Base URL for fetching data for the given year (2022)
-    url = f"https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard?limit=1000&dates={year}"
-
-    # Function to process data and append to the dictionary
-    def process_game_data(data):
-        nonlocal week_results, playoff_results
-
-        # Iterate over the games data
-        for game in data.get('events', []):
-            # Extract the basic game information
-            season = game.get('season', {})
-
-            # Only include the game if the season year matches the year we want
-            if str(season.get('year')) != str(year):
-                continue  # Skip if the season year does not match the current year
-
-            # Check if the game is regular season or post-season (exclude preseason)
-            if season.get('slug') not in ['regular-season', 'post-season']:
-                continue  # Skip if it's not a regular season or post-season game
-            
-            # Extract the week number from the game data
-            if 'week' in game and 'number' in game['week']:
-                week_number = game['week']['number']
-            else:
-                week_number = 'Unknown Week'
-
-            # Home and away teams
-            competition = game['competitions'][0]
-            home_team = competition['competitors'][0]['team']['displayName']
-            away_team = competition['competitors'][1]['team']['displayName']
-            
-            # Scores for both teams
-            home_score = competition['competitors'][0]['score']
-            away_score = competition['competitors'][1]['score']
-            
-            # Format the game result as "Home Team Score - Away Team Score"
-            result_string = f"{home_team} {home_score} - {away_score} {away_team}"
-
-            if season.get('slug') == 'regular-season':
-                if week_number not in week_results:
-                    week_results[week_number] = []
-                week_results[week_number].append(result_string)
-            elif season.get('slug') == 'post-season':
-                if 'week' in game and 'number' in game['week']:
-                    playoff_week = game['week']['number']
-                    if playoff_week == 1:
-                        playoff_results["Wild Card Round"].append(result_string)
-                    elif playoff_week == 2:
-                        playoff_results["Divisional Round"].append(result_string)
-                    elif playoff_week == 3:
-                        playoff_results["Championship Round"].append(result_string)
-                    elif playoff_week == 4:
-                        playoff_results["Super Bowl"].append(result_string)
-                    elif playoff_week == 5:  # This assumes Pro Bowl is considered as week 5 of the playoffs
-                        playoff_results["Pro Bowl"].append(result_string)
-
-    response = requests.get(url)
-
-    if response.status_code == 200:
-        data = response.json()
-        process_game_data(data)
-
-        next_year = str(year + 1)
-        next_url = f"https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard?limit=1000&dates={next_year}"
-
-        response = requests.get(next_url)
-
-        if response.status_code == 200:
-            data = response.json()
-            process_game_data(data)
-
-        sorted_week_results = dict(sorted(week_results.items(), key=lambda x: (x[0] if isinstance(x[0], int) else float('inf'))))
-
-        final_results = {
-            "Regular Season": sorted_week_results,
-            "Playoffs": playoff_results
-        }
-
-        with open(f"nfl_{year}_game_results_by_week.json", "w") as f:
-            json.dump(final_results, f, indent=4)
-
-        print(f"Data saved to nfl_{year}_game_results_by_week.json")
-
-    else:
-        print(f"Error fetching data for {year}: {response.status_code}")
-
-years = [2022, 2023, 2024]
-
-for year in years:
-    fetch_and_process_games(year)
+import os
+import sys
+import time
+import argparse
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+# Share the parser's record type, the report writer and the database/snapshot readers with the pipeline
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "pipeline"))
+from espn_parser import GameRecord
+from week_report import save_week_report
+
+# Writes nfl_{year}_game_results_by_week.json for any range of seasons from data that is already
+# local: the loaded database (one grouped query that returns one row per season, streamed through
+# a server-side cursor) or a columnar snapshot. Each season's report is written as soon as its
+# games are read, and --workers splits the seasons over parallel readers. No network access is
+# needed; --from-espn keeps the old refetch-from-ESPN behaviour.
+#
+# The database does not store Pro Bowl games, so their list stays empty unless --from-espn is used.
+
+FIRST_SEASON = 1946
+LAST_SEASON = 2024
+
+# Function to build the GameRecord of one stored game (week None = unknown, scores None = missing)
+def to_record(year, season_type, week, home_team, away_team, home_score, away_score, round_type):
+    return GameRecord(
+        str(year),
+        season_type,
+        week if week is not None else 'Unknown Week',
+        home_team,
+        away_team,
+        home_score if home_score is not None else '',
+        away_score if away_score is not None else '',
+        round_type
+    )
+
+# Generator yielding (year, records) per season from the database with one grouped query.
+# The named (server-side) cursor hands seasons over one at a time instead of buffering the result.
+def iter_seasons_from_db(conn, years):
+    cursor = conn.cursor(name="season_results")
+    cursor.itersize = 1
+    try:
+        cursor.execute("""
+            SELECT s.year,
+                   json_agg(json_build_array(s.type, g.week, ht.name, at.name, g.home_score, g.away_score, g.round)
+                            ORDER BY CASE s.type WHEN 'regular-season' THEN 0 ELSE 1 END, g.week NULLS LAST,
+                                     g.game_id)
+            FROM games g
+            JOIN seasons s ON s.season_id = g.season_id
+            JOIN teams ht ON ht.team_id = g.home_team_id
+            JOIN teams at ON at.team_id = g.away_team_id
+            WHERE s.year = ANY(%s)
+            GROUP BY s.year
+            ORDER BY s.year;
+        """, (list(years),))
+        for year, games in cursor:
+            yield year, [to_record(year, *game) for game in games]
+    finally:
+        cursor.close()
+
+# Generator yielding (year, records) per season from a snapshot (see pipeline/snapshot.py)
+def iter_seasons_from_snapshot(columns, meta, years):
+    season_years = np.asarray(columns["season_year"])
+    rows = np.flatnonzero(np.isin(season_years, list(years)))
+    rows = rows[np.argsort(season_years[rows], kind="stable")]  # seasons in order, games in stored order
+    if not rows.size:
+        return
+
+    teams, season_types, rounds = meta["teams"], meta["season_types"], meta["rounds"]
+    values = {name: np.asarray(columns[name])[rows].tolist() for name in
+              ("season_year", "season_type", "week", "home_team_id", "away_team_id", "home_score", "away_score",
+               "round")}
+    bounds = (np.flatnonzero(np.diff(values["season_year"])) + 1).tolist()
+
+    for start, end in zip([0, *bounds], [*bounds, len(rows)]):
+        year = values["season_year"][start]
+        yield year, [
+            to_record(year, season_types[values["season_type"][i]],
+                      values["week"][i] if values["week"][i] >= 0 else None,
+                      teams[values["home_team_id"][i]], teams[values["away_team_id"][i]],
+                      values["home_score"][i] if values["home_score"][i] >= 0 else None,
+                      values["away_score"][i] if values["away_score"][i] >= 0 else None,
+                      rounds[values["round"][i]])
+            for i in range(start, end)
+        ]
+
+# Generator yielding (year, records) per season by refetching the ESPN payloads (the original behaviour)
+def iter_seasons_from_espn(years, cache=None):
+    from extract import fetch_season_records
+    for year in years:
+        records = fetch_season_records(year, cache=cache)
+        if records is not None:
+            yield year, records
+
+# Function to write the report of every season a source yields; returns the years written
+def write_reports(seasons, output_dir="."):
+    written = []
+    for year, records in seasons:
+        save_week_report(year, records, output_dir)
+        written.append(year)
+    return written
+
+# Function to generate the reports for `years` from the database, a snapshot or ESPN.
+# With several workers the seasons are dealt round-robin (so old, small seasons and recent,
+# large ones are spread evenly) and each worker streams its share through its own reader.
+def generate_reports(years, output_dir=".", snapshot_dir=None, from_espn=False, workers=1):
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    years = sorted(set(years))
+
+    if snapshot_dir:
+        from snapshot import load_snapshot
+        columns, meta = load_snapshot(snapshot_dir)
+
+    def run(chunk):
+        if snapshot_dir:
+            return write_reports(iter_seasons_from_snapshot(columns, meta, chunk), output_dir)
+        if from_espn:
+            from response_cache import ResponseCache
+            return write_reports(iter_seasons_from_espn(chunk, ResponseCache()), output_dir)
+
+        from load import get_db_connection
+        conn = get_db_connection()
+        try:
+            return write_reports(iter_seasons_from_db(conn, chunk), output_dir)
+        finally:
+            conn.close()
+
+    workers = max(1, min(workers, len(years)))
+    chunks = [years[i::workers] for i in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        written = sorted(year for chunk_years in executor.map(run, chunks) for year in chunk_years)
+
+    missing = sorted(set(years) - set(written))
+    print(f"Wrote {len(written)} season reports to {output_dir} in {time.perf_counter() - start:.2f}s")
+    if missing:
+        print(f"No games found for {len(missing)} seasons: {', '.join(map(str, missing))}")
+    return written
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write per-week / per-round results reports for a range of seasons")
+    parser.add_argument("--start", type=int, default=FIRST_SEASON, help="First season")
+    parser.add_argument("--end", type=int, default=LAST_SEASON, help="Last season (inclusive)")
+    parser.add_argument("--years", type=int, nargs="+", default=None, help="Explicit list of seasons instead")
+    parser.add_argument("--snapshot", default=None, help="Read games from a snapshot directory instead of the database")
+    parser.add_argument("--from-espn", action="store_true",
+                        help="Refetch the ESPN payloads instead (needs network access unless cached)")
+    parser.add_argument("--workers", type=int, default=1, help="Number of seasons read and written in parallel")
+    parser.add_argument("--output-dir", default=".", help="Directory for the report files")
+    args = parser.parse_args()
+
+    years = args.years or list(range(args.start, args.end + 1))
+    generate_reports(years, args.output_dir, snapshot_dir=args.snapshot, from_espn=args.from_espn,
+                     workers=args.workers)
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+# The pipeline and analytics modules import each other by bare name, like the scripts do
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(os.path.join(ROOT, "pipeline"))
+sys.path.append(os.path.join(ROOT, "analytics"))
+
+import extract
+from stub_scoreboard_server import start_server
+
+
+# Start a local stand-in for the ESPN scoreboard and point extract.py at it.
+# Yields a function taking the stub server's options and returning its URL.
+@pytest.fixture
+def scoreboard(monkeypatch):
+    servers = []
+
+    def start(**options):
+        server, url = start_server(**options)
+        servers.append(server)
+        monkeypatch.setattr(extract, "SCOREBOARD_URL", url)
+        return url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,319 @@
+import json
+import os
+import random
+import time
+import hashlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# Local stand-in for the ESPN scoreboard endpoint.
+# Serves recorded payloads from a directory (scoreboard_{year}.json) when present,
+# otherwise generates a deterministic synthetic payload with the same shape
+# (with --detailed, padded with the fields the real endpoint returns).
+#
+# Point the pipeline at it with:
+#   ESPN_SCOREBOARD_URL=http://127.0.0.1:8765/scoreboard python extract.py
+#
+# With --live it also simulates a game day for live_watcher.py: requests without dates (or with
+# a week parameter) get the current week, whose games kick off, score and go final as the
+# simulated clock ticks (every --tick seconds).
+
+TEAMS = [
+    "Arizona Cardinals", "Atlanta Falcons", "Baltimore Ravens", "Buffalo Bills",
+    "Carolina Panthers", "Chicago Bears", "Cincinnati Bengals", "Cleveland Browns",
+    "Dallas Cowboys", "Denver Broncos", "Detroit Lions", "Green Bay Packers",
+    "Houston Texans", "Indianapolis Colts", "Jacksonville Jaguars", "Kansas City Chiefs",
+    "Las Vegas Raiders", "Los Angeles Chargers", "Los Angeles Rams", "Miami Dolphins",
+    "Minnesota Vikings", "New England Patriots", "New Orleans Saints", "New York Giants",
+    "New York Jets", "Philadelphia Eagles", "Pittsburgh Steelers", "San Francisco 49ers",
+    "Seattle Seahawks", "Tampa Bay Buccaneers", "Tennessee Titans", "Washington Commanders"
+]
+
+# Function to build a single ESPN-shaped event
+def make_event(event_id, season_year, slug, week, date, home, away, home_score, away_score, headline=None):
+    competition = {
+        "competitors": [
+            {"homeAway": "home", "team": {"displayName": home}, "score": str(home_score)},
+            {"homeAway": "away", "team": {"displayName": away}, "score": str(away_score)}
+        ]
+    }
+    if headline:
+        competition["notes"] = [{"type": "event", "headline": headline}]
+    return {
+        "id": str(event_id),
+        "date": date,
+        "season": {"year": season_year, "slug": slug},
+        "week": {"number": week},
+        "competitions": [competition]
+    }
+
+# Function to pad an event with the kind of fields the real endpoint returns but the pipeline never reads
+# (status, venue, broadcasts, links, team branding, records, statistics, leaders), so payload sizes
+# and decode costs are realistic
+def add_event_details(event):
+    competition = event["competitions"][0]
+    event.update({
+        "uid": f"s:20~l:28~e:{event['id']}",
+        "name": f"{competition['competitors'][1]['team']['displayName']} at {competition['competitors'][0]['team']['displayName']}",
+        "status": {"clock": 0.0, "displayClock": "0:00", "period": 4,
+                   "type": {"id": "3", "name": "STATUS_FINAL", "state": "post", "completed": True,
+                            "description": "Final", "detail": "Final", "shortDetail": "Final"}},
+        "links": [{"language": "en-US", "rel": ["summary", "desktop", "event"],
+                   "href": f"https://www.espn.com/nfl/game/_/gameId/{event['id']}", "text": text,
+                   "isExternal": False, "isPremium": False} for text in ("Gamecast", "Box Score", "Highlights")]
+    })
+    competition.update({
+        "id": event["id"],
+        "attendance": 65000,
+        "venue": {"id": "3622", "fullName": "Stadium", "address": {"city": "City", "state": "ST"}, "indoor": False},
+        "broadcasts": [{"market": "national", "names": ["CBS"]}],
+        "geoBroadcasts": [{"type": {"id": "1", "shortName": "TV"}, "market": {"id": "1", "type": "National"},
+                           "media": {"shortName": "CBS"}, "lang": "en", "region": "us"}],
+        "odds": [{"provider": {"id": "58", "name": "ESPN BET", "priority": 1}, "details": "TEAM -3.5",
+                  "overUnder": 44.5, "spread": -3.5}]
+    })
+    for order, competitor in enumerate(competition["competitors"]):
+        name = competitor["team"]["displayName"]
+        competitor.update({
+            "id": str(TEAMS.index(name) + 1) if name in TEAMS else "0",
+            "type": "team",
+            "order": order,
+            "winner": False,
+            "records": [{"name": "overall", "abbreviation": "Game", "type": "total", "summary": "9-8"},
+                        {"name": "Home", "type": "home", "summary": "5-4"},
+                        {"name": "Road", "type": "road", "summary": "4-4"}],
+            "statistics": [{"name": stat, "abbreviation": stat[:3].upper(), "displayValue": "123"}
+                           for stat in ("totalYards", "passingYards", "rushingYards", "turnovers", "firstDowns")],
+            "leaders": [{"name": category, "displayName": category.title(),
+                         "leaders": [{"displayValue": "20/30, 250 YDS", "value": 250.0,
+                                      "athlete": {"id": "1", "fullName": "Player Name", "jersey": "12",
+                                                  "position": {"abbreviation": "QB"}}}]}
+                        for category in ("passingYards", "rushingYards", "receivingYards")]
+        })
+        competitor["team"].update({
+            "id": competitor["id"], "abbreviation": name[:3].upper(), "shortDisplayName": name.split()[-1],
+            "color": "002244", "alternateColor": "b0b7bc", "isActive": True,
+            "logo": f"https://a.espncdn.com/i/teamlogos/nfl/500/{name[:3].lower()}.png",
+            "links": [{"rel": ["clubhouse", "desktop", "team"], "href": "https://www.espn.com/nfl/team"}]
+        })
+    return event
+
+# Function to generate a synthetic scoreboard payload for one calendar year.
+# A calendar year holds the previous season's playoffs and the current season's
+# preseason and regular season, just like the real endpoint.
+# detailed=True adds the fields the real endpoint returns that the pipeline ignores.
+def generate_payload(year, games_per_week=16, regular_weeks=17, detailed=False):
+    rng = random.Random(year)
+    events = []
+    event_id = year * 10000
+
+    def score():
+        return rng.choice([0, 3, 7, 10, 13, 14, 17, 20, 21, 23, 24, 27, 28, 31, 34, 35, 38, 41, 45])
+
+    def pairings(count):
+        teams = TEAMS[:]
+        rng.shuffle(teams)
+        return [(teams[2 * i], teams[2 * i + 1]) for i in range(count)]
+
+    # Previous season's playoffs (January/February)
+    playoff_weeks = [(1, 6, None), (2, 4, None), (3, 2, "AFC Conference Championship"),
+                     (4, 1, "Pro Bowl" if year - 1 >= 2009 else "Super Bowl"),
+                     (5, 1, "Super Bowl" if year - 1 >= 2009 else "Pro Bowl")]
+    for week, count, headline in playoff_weeks:
+        for home, away in pairings(count):
+            event_id += 1
+            events.append(make_event(event_id, year - 1, "post-season", week,
+                                     f"{year}-01-{10 + week:02d}T18:00Z", home, away,
+                                     score(), score(), headline))
+
+    # Preseason (should be skipped by the pipeline)
+    for home, away in pairings(4):
+        event_id += 1
+        events.append(make_event(event_id, year, "preseason", 1, f"{year}-08-10T00:00Z",
+                                 home, away, score(), score()))
+
+    # Regular season
+    for week in range(1, regular_weeks + 1):
+        for home, away in pairings(games_per_week):
+            event_id += 1
+            events.append(make_event(event_id, year, "regular-season", week,
+                                     f"{year}-09-{week:02d}T17:00Z", home, away, score(), score()))
+
+    if detailed:
+        events = [add_event_details(event) for event in events]
+
+    return {"events": events}
+
+# Simulated live week: one week of games that kick off in waves, score and go final as advance() is called
+class LiveWeek:
+    def __init__(self, season_year=2024, week=1, games=16, slug="regular-season", ticks_per_game=8, seed=None):
+        self.rng = random.Random(seed if seed is not None else season_year * 100 + week)
+        self.season_year = season_year
+        self.week = week
+        self.slug = slug
+        self.ticks_per_game = ticks_per_game
+        self.tick = 0
+        self.lock = threading.Lock()
+        self.cached = None
+
+        teams = TEAMS[:]
+        self.rng.shuffle(teams)
+        self.games = [{
+            "id": season_year * 10000 + 9000 + week * 100 + i,
+            "home": teams[2 * i % len(teams)],
+            "away": teams[(2 * i + 1) % len(teams)],
+            "kickoff": (i % 3) * 2,  # three kickoff windows
+            "played": 0,
+            "scores": [0, 0],
+            "state": "pre"
+        } for i in range(games)]
+
+    # Move the simulated clock forward: started games may score, games that reach their length go final
+    def advance(self, ticks=1):
+        with self.lock:
+            for _ in range(ticks):
+                self.tick += 1
+                for game in self.games:
+                    if game["state"] == "pre" and self.tick > game["kickoff"]:
+                        game["state"] = "in"
+                    if game["state"] != "in":
+                        continue
+                    if self.rng.random() < 0.6:
+                        game["scores"][self.rng.randrange(2)] += self.rng.choice([2, 3, 3, 6, 7, 7, 8])
+                    game["played"] += 1
+                    if game["played"] >= self.ticks_per_game:
+                        game["state"] = "post"
+            self.cached = None
+
+    # True once every game is final
+    def finished(self):
+        return all(game["state"] == "post" for game in self.games)
+
+    # Current payload body and its ETag (rebuilt only after the clock moved)
+    def body(self):
+        with self.lock:
+            if self.cached is None:
+                events = []
+                for game in self.games:
+                    event = make_event(game["id"], self.season_year, self.slug, self.week,
+                                       f"{self.season_year}-09-{self.week:02d}T17:00Z", game["home"], game["away"],
+                                       game["scores"][0], game["scores"][1])
+                    event["status"] = {"type": {"state": game["state"], "completed": game["state"] == "post"}}
+                    events.append(event)
+                body = json.dumps({"events": events}).encode()
+                self.cached = (body, '"' + hashlib.sha256(body).hexdigest()[:16] + '"')
+            return self.cached
+
+class ScoreboardHandler(BaseHTTPRequestHandler):
+    fixtures_dir = None
+    detailed = False
+    latency = 0.0
+    error_rate = 0.0
+    live = None
+    payload_cache = {}
+    lock = threading.Lock()
+
+    def load_payload(self, dates):
+        with self.lock:
+            if dates not in self.payload_cache:
+                path = os.path.join(self.fixtures_dir, f"scoreboard_{dates}.json") if self.fixtures_dir else None
+                if path and os.path.exists(path):
+                    with open(path, "rb") as f:
+                        body = f.read()
+                else:
+                    body = json.dumps(generate_payload(int(dates), detailed=self.detailed)).encode()
+                etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+                self.payload_cache[dates] = (body, etag)
+            return self.payload_cache[dates]
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error_rate and random.random() < self.error_rate:
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        query = parse_qs(urlparse(self.path).query)
+        dates = query.get("dates", [None])[0]
+        if self.live is not None and (not dates or "week" in query):
+            self.send_payload(*self.live.body())
+            return
+        if not dates or not dates.isdigit():
+            self.send_response(400)
+            self.end_headers()
+            return
+
+        self.send_payload(*self.load_payload(dates))
+
+    # Send a payload, or 304 if the client already has this version
+    def send_payload(self, body, etag):
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+# Function to create the stand-in server and its scoreboard URL
+# (pass a LiveWeek as `live` to also serve a simulated current week)
+def create_server(port=0, fixtures_dir=None, latency=0.0, error_rate=0.0, detailed=False, live=None):
+    handler = type("Handler", (ScoreboardHandler,), {
+        "fixtures_dir": fixtures_dir,
+        "detailed": detailed,
+        "latency": latency,
+        "error_rate": error_rate,
+        "live": live,
+        "payload_cache": {}
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    return server, f"http://127.0.0.1:{server.server_address[1]}/scoreboard"
+
+# Function to start the stand-in server in a background thread (handy for scripts and benchmarks)
+def start_server(port=0, fixtures_dir=None, latency=0.0, error_rate=0.0, detailed=False, live=None):
+    server, url = create_server(port, fixtures_dir, latency, error_rate, detailed, live)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, url
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the ESPN scoreboard endpoint")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default=None, help="Directory of recorded scoreboard_{year}.json payloads")
+    parser.add_argument("--latency", type=float, default=0.0, help="Artificial per-request latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that return 503")
+    parser.add_argument("--detailed", action="store_true", help="Pad synthetic payloads with realistic unused fields")
+    parser.add_argument("--live", action="store_true", help="Also serve a simulated live week")
+    parser.add_argument("--live-year", type=int, default=2024, help="Season of the simulated live week")
+    parser.add_argument("--live-week", type=int, default=1, help="Week number of the simulated live week")
+    parser.add_argument("--tick", type=float, default=5.0, help="Seconds between simulated clock ticks in --live mode")
+    args = parser.parse_args()
+
+    live = LiveWeek(args.live_year, args.live_week) if args.live else None
+    server, url = create_server(args.port, args.fixtures, args.latency, args.error_rate, args.detailed, live)
+    print(f"Serving scoreboard stand-in at {url}")
+
+    # Advance the simulated week in the background until every game is final
+    def run_clock():
+        while not live.finished():
+            time.sleep(args.tick)
+            live.advance()
+        print("Simulated week is final")
+
+    if live is not None:
+        threading.Thread(target=run_clock, daemon=True).start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scorigami_matrix import ScorigamiMatrix
+from scorigami_timeline import ScorigamiTimeline
+from matchup_index import MatchupIndex
+from team_stats import TeamStats
+
+TEAMS = ["Bears", "Lions", "Packers", "Vikings"]
+
+
+# Random games in chronological order (game_id increasing), a few without a final score
+def make_games(seasons=range(2000, 2006), per_season=30, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for season_year in seasons:
+        for _ in range(per_season):
+            home, away = rng.choice(TEAMS, 2, replace=False)
+            rows.append({"game_id": len(rows) + 1, "season_year": season_year, "round": "Regular Season",
+                         "home_team": home, "away_team": away,
+                         "home_score": float(rng.integers(0, 35)), "away_score": float(rng.integers(0, 35))})
+    games = pd.DataFrame(rows)
+    games.loc[[5, 50], ["home_score", "away_score"]] = np.nan
+    return games
+
+
+def test_matrix_counts_and_first_games():
+    games = pd.DataFrame({"game_id": [10, 11, 12, 13], "home_score": [7.0, 3.0, 7.0, np.nan],
+                          "away_score": [3.0, 7.0, 3.0, 0.0]})
+    matrix = ScorigamiMatrix.from_games(games)
+
+    assert matrix.count(7, 3) == 2 and matrix.count(3, 7) == 1
+    assert matrix.is_scorigami(0, 0) and matrix.is_scorigami(100, 100)
+    assert (matrix.first_game(7, 3), matrix.last_game(7, 3)) == (10, 12)
+    assert list(matrix.game_ids_for(7, 3)) == [10, 12]
+    assert list(matrix.rows_for(3, 7)) == [1]
+    assert matrix.top_scorelines(2) == [(7, 3, 2), (3, 7, 1)]
+
+    normalized = ScorigamiMatrix.from_games(games, normalized=True)
+    assert normalized.count(3, 7) == normalized.count(7, 3) == 3
+    assert normalized.first_game(3, 7) == 10
+
+
+def test_matrix_lookup_many_matches_single_lookups():
+    games = make_games()
+    matrix = ScorigamiMatrix.from_games(games)
+    home, away = [7, 0, 80, -1, 14], [3, 0, 2, 5, 14]
+
+    counts, first, last = matrix.lookup_many(home, away)
+    assert counts.tolist() == [matrix.count(h, a) for h, a in zip(home, away)]
+    for position, h, a in zip(first, home, away):
+        game = matrix.first_game(h, a)
+        assert (game is None) if position < 0 else matrix.game_ids[position] == game
+    assert (last[counts == 0] == -1).all()
+
+
+def test_timeline_append_matches_full_replay():
+    games = make_games()
+    full = ScorigamiTimeline.from_games(games)
+
+    timeline = ScorigamiTimeline.from_games(games[games["season_year"] < 2003])
+    new = timeline.append_games(games[games["season_year"] >= 2003])
+
+    pd.testing.assert_frame_equal(timeline.games(), full.games())
+    pd.testing.assert_frame_equal(timeline.season_table(), full.season_table())
+    assert new == [game_id for game_id in full.game_ids if full.was_scorigami(game_id) and game_id > 90]
+    assert timeline.last_game_id == games["game_id"].max()
+
+    # Re-appending is harmless, older seasons need a rebuild
+    assert timeline.append_games(games.tail(5)) == []
+    with pytest.raises(ValueError):
+        timeline.append([2001], [99], [98], [1000])
+
+
+def test_timeline_first_occurrence_is_scorigami():
+    games = pd.DataFrame({"game_id": [1, 2, 3], "season_year": [2000, 2000, 2001],
+                          "home_score": [7, 3, 7], "away_score": [3, 7, 3]})
+    timeline = ScorigamiTimeline.from_games(games, normalized=True)
+
+    assert [timeline.was_scorigami(game_id) for game_id in (1, 2, 3)] == [True, False, False]
+    assert timeline.unique_scorelines == 1
+    assert timeline.season_table()["scorigamis"].tolist() == [1, 0]
+
+
+def test_matchup_index_append_matches_full_build():
+    games = make_games()
+    full = MatchupIndex.from_games(games)
+
+    index = MatchupIndex.from_games(games[games["season_year"] < 2003])
+    index.append_games(games[games["season_year"] >= 2003])
+
+    assert index.teams == full.teams == TEAMS
+    for team in TEAMS:
+        pd.testing.assert_frame_equal(index.opponents_of(team), full.opponents_of(team))
+        for opponent in TEAMS:
+            if opponent != team:
+                pd.testing.assert_frame_equal(index.games_between(team, opponent),
+                                              full.games_between(team, opponent))
+
+
+def test_matchup_index_record():
+    games = make_games()
+    index = MatchupIndex.from_games(games)
+    scored = games.dropna(subset=["home_score", "away_score"])
+
+    pair = scored[((scored["home_team"] == "Bears") & (scored["away_team"] == "Lions"))
+                  | ((scored["home_team"] == "Lions") & (scored["away_team"] == "Bears"))]
+    bears = np.where(pair["home_team"] == "Bears", pair["home_score"], pair["away_score"])
+    lions = np.where(pair["home_team"] == "Bears", pair["away_score"], pair["home_score"])
+
+    record = index.record("Bears", "Lions")
+    assert record == {"games": len(pair), "wins": int((bears > lions).sum()), "losses": int((bears < lions).sum()),
+                      "ties": int((bears == lions).sum()), "points_for": int(bears.sum()),
+                      "points_against": int(lions.sum()), "point_differential": int(bears.sum() - lions.sum())}
+    assert index.record("Lions", "Bears")["wins"] == record["losses"]
+    assert index.games_between("Bears", "Lions")["game_id"].tolist() == pair["game_id"].tolist()
+    assert index.record("Bears", "Nobody")["games"] == 0
+
+
+# Emulate the franchise_season_records / franchise_playoff_records views from team-perspective rows
+def franchise_records(games):
+    scored = games.dropna(subset=["home_score", "away_score"])
+    sides = [scored.assign(franchise_id=scored[f"{side}_franchise_id"], points_for=scored[f"{side}_score"],
+                           points_against=scored[f"{other}_score"])
+             for side, other in (("home", "away"), ("away", "home"))]
+    rows = pd.concat(sides)
+    rows = rows.assign(season_type=np.where(rows["round"] == "Regular Season", "regular-season", "post-season"),
+                       win=rows["points_for"] > rows["points_against"],
+                       loss=rows["points_for"] < rows["points_against"],
+                       tie=rows["points_for"] == rows["points_against"])
+    season_records = rows.groupby(["franchise_id", "season_year", "season_type"]).agg(
+        games=("win", "size"), wins=("win", "sum"), losses=("loss", "sum"), ties=("tie", "sum"),
+        points_for=("points_for", "sum"), points_against=("points_against", "sum")).reset_index()
+
+    super_bowls = rows[rows["round"] == "Super Bowl"]
+    playoff_records = pd.DataFrame({
+        "super_bowl_years": super_bowls.groupby("franchise_id")["season_year"].apply(list),
+        "super_bowl_win_years": super_bowls[super_bowls["win"]].groupby("franchise_id")["season_year"].apply(list)
+    }).reset_index()
+    playoff_records["super_bowl_win_years"] = [years if isinstance(years, list) else []
+                                               for years in playoff_records["super_bowl_win_years"]]
+    return season_records, playoff_records
+
+
+def test_team_stats_from_records_matches_from_games():
+    games = make_games()
+    games.loc[games.index % 10 == 0, "round"] = "Super Bowl"
+    franchise_ids = {team: franchise_id for franchise_id, team in enumerate(TEAMS, start=1)}
+    games["home_franchise_id"] = games["home_team"].map(franchise_ids)
+    games["away_franchise_id"] = games["away_team"].map(franchise_ids)
+
+    stats = TeamStats.from_games(games)
+    pd.testing.assert_frame_equal(TeamStats.from_records(*franchise_records(games)).table, stats.table)
+
+    assert stats.franchise_ids == [1, 2, 3, 4]
+    bears = games[(games["home_franchise_id"] == 1) | (games["away_franchise_id"] == 1)].dropna(
+        subset=["home_score", "away_score"])
+    assert stats.summary_for(1)["games"] == len(bears)
+    assert stats.seasons_for(1).index.tolist() == sorted(bears["season_year"].unique())
+    super_bowls = bears[bears["round"] == "Super Bowl"]
+    assert stats.super_bowl_years(1) == sorted(super_bowls["season_year"].unique().tolist())
@@ -0,0 +1,56 @@
+from collections import Counter
+
+import pytest
+
+from espn_parser import classify_round, parse_events, game_to_dict
+from stub_scoreboard_server import make_event, generate_payload
+
+
+@pytest.mark.parametrize("year, slug, week, headline, expected", [
+    (2020, "regular-season", 5, None, "Regular Season"),
+    (2020, "post-season", 1, None, "Wild Card Round"),
+    (2020, "post-season", 2, None, "Divisional Round"),
+    (2020, "post-season", 3, None, "Championship Round"),
+    (2020, "post-season", 3, "AFC Conference Championship", "Championship Round"),
+    # From 2009 the Pro Bowl is played the week before the Super Bowl...
+    (2009, "post-season", 4, None, "Pro Bowl"),
+    (2009, "post-season", 5, None, "Super Bowl"),
+    # ...and up to 2008 the week after
+    (2008, "post-season", 4, None, "Super Bowl"),
+    (2008, "post-season", 5, None, "Pro Bowl"),
+    # Event notes win over the week
+    (2020, "post-season", 2, "NFC Conference Championship", "Championship Round"),
+])
+def test_classify_round(year, slug, week, headline, expected):
+    competition = make_event(1, year, slug, week, "2021-01-01T00:00Z", "A", "B", 0, 0, headline)["competitions"][0]
+    assert classify_round(year, slug, week, competition) == expected
+
+
+@pytest.mark.parametrize("season", [2008, 2010])
+def test_parse_events_rounds(season):
+    # A season's playoffs are in the following calendar year's payload
+    skipped = {}
+    records = list(parse_events(generate_payload(season + 1), season, skipped))
+    rounds = Counter(record.round_type for record in records)
+
+    assert rounds == {"Wild Card Round": 6, "Divisional Round": 4, "Championship Round": 2,
+                      "Super Bowl": 1, "Pro Bowl": 1}
+    assert all(record.season_type == "post-season" and record.season_year == str(season) for record in records)
+    assert skipped == {"other_season": 16 * 17 + 4}
+
+
+def test_parse_events_skips_preseason():
+    skipped = {}
+    records = list(parse_events(generate_payload(2015), 2015, skipped))
+
+    assert len(records) == 16 * 17
+    assert {record.round_type for record in records} == {"Regular Season"}
+    assert skipped == {"preseason": 4, "other_season": 14}
+
+
+def test_game_to_dict():
+    event = make_event(1, 2020, "regular-season", 3, "2020-09-20T17:00Z", "Home", "Away", 24, 17)
+    game = game_to_dict(next(parse_events({"events": [event]}, 2020)))
+
+    assert game == {"season_year": "2020", "season_type": "regular-season", "week": 3, "home_team": "Home",
+                    "away_team": "Away", "home_score": "24", "away_score": "17", "round_type": "Regular Season"}
@@ -0,0 +1,103 @@
+import json
+import random
+
+import extract
+
+YEARS = [2008, 2009, 2010, 2011]
+
+
+# Collect fetch_years output as comparable lists (teams and seasons are sets)
+def fetch_all(years, max_workers=1, season_stats=None):
+    return [(year, sorted(teams), sorted(seasons), games)
+            for year, teams, seasons, games in extract.fetch_years(years, max_workers, season_stats=season_stats)]
+
+
+def test_concurrent_fetch_matches_serial(scoreboard):
+    scoreboard()
+    serial = fetch_all(YEARS)
+    concurrent = fetch_all(YEARS, max_workers=4)
+
+    assert [year for year, *_ in concurrent] == YEARS
+    assert concurrent == serial
+    assert all(games for _, _, _, games in serial)
+
+
+def test_fetch_retries_injected_503s(scoreboard, monkeypatch):
+    scoreboard()
+    expected = fetch_all(YEARS)
+
+    # Requests are made one at a time, so the seeded error draws are the same on every run
+    scoreboard(error_rate=0.3)
+    random.seed(3)
+    monkeypatch.setattr(extract.time, "sleep", lambda seconds: None)
+    season_stats = {}
+    assert fetch_all(YEARS, season_stats=season_stats) == expected
+    assert sum(stats["retries"] for stats in season_stats.values()) > 0
+    assert all(stats["status"] == 200 and stats["next_year_status"] == 200 for stats in season_stats.values())
+
+
+# Run an incremental refresh into tmp_path and return the manifest it wrote
+def refresh(tmp_path, years):
+    extract.extract_incremental(years, output_file=str(tmp_path / "games.json"),
+                                manifest_file=str(tmp_path / "manifest.json"))
+    with open(tmp_path / "manifest.json") as f:
+        return json.load(f)
+
+
+def test_incremental_marks_past_seasons_final(scoreboard, tmp_path):
+    scoreboard()
+    manifest = refresh(tmp_path, [2019, extract.current_season()])
+
+    assert manifest["final_seasons"] == [2019]
+    assert manifest["seasons"]["2019"]["games"] > 0
+    with open(tmp_path / "games.json") as f:
+        assert {game["season_year"] for game in json.load(f)["games"]} >= {"2019"}
+
+
+def test_incremental_keeps_season_pending_when_playoffs_fail(scoreboard, tmp_path, monkeypatch):
+    scoreboard()
+    fetch_scoreboard = extract.fetch_scoreboard
+
+    def failing_playoffs(dates, **kwargs):
+        if int(dates) == 2021:
+            return 503, None
+        return fetch_scoreboard(dates, **kwargs)
+
+    monkeypatch.setattr(extract, "fetch_scoreboard", failing_playoffs)
+    assert refresh(tmp_path, [2020])["final_seasons"] == []
+
+    # Once both payloads come back the season is final
+    monkeypatch.setattr(extract, "fetch_scoreboard", fetch_scoreboard)
+    assert refresh(tmp_path, [2020])["final_seasons"] == [2020]
+
+
+def test_merge_games_updates_in_place():
+    game = {"season_year": "2020", "season_type": "regular-season", "week": 1, "home_team": "A",
+            "away_team": "B", "home_score": "7", "away_score": "3", "round_type": "Regular Season"}
+    games = [dict(game)]
+
+    assert extract.merge_games(games, [dict(game, home_score="10"), dict(game, week=2)]) == (1, 1)
+    assert [(g["week"], g["home_score"]) for g in games] == [(1, "10"), (2, "7")]
+
+
+def test_incremental_reparses_final_seasons_when_round_rules_change(scoreboard, tmp_path, monkeypatch):
+    scoreboard()
+    refresh(tmp_path, [2019])
+    fetched = []
+    fetch_years = extract.fetch_years
+    monkeypatch.setattr(extract, "fetch_years", lambda years, *args: fetched.extend(years) or fetch_years([], *args))
+
+    # Final seasons are skipped by default...
+    extract.extract_incremental(first_year=2019, output_file=str(tmp_path / "games.json"),
+                                manifest_file=str(tmp_path / "manifest.json"))
+    assert 2019 not in fetched
+
+    # ...unless they were extracted under older round rules
+    with open(tmp_path / "manifest.json") as f:
+        manifest = json.load(f)
+    manifest["parser"] = extract.PARSER_VERSION - 1
+    with open(tmp_path / "manifest.json", "w") as f:
+        json.dump(manifest, f)
+    extract.extract_incremental(first_year=2019, output_file=str(tmp_path / "games.json"),
+                                manifest_file=str(tmp_path / "manifest.json"))
+    assert 2019 in fetched
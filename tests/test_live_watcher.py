@@ -0,0 +1,25 @@
+import run_metrics
+from live_watcher import LiveWatcher
+
+
+def test_failed_polls_are_warnings_until_max_failures(scoreboard, monkeypatch):
+    metrics = run_metrics.RunMetrics(stage="live")
+    monkeypatch.setattr(run_metrics, "active", metrics)
+    url = scoreboard(error_rate=1.0)
+    watcher = LiveWatcher(f"{url}?limit=1000&dates=2009", set(), max_failures=3)
+
+    for _ in range(2):
+        assert watcher.poll()["status"] == 503
+    assert metrics.totals["warnings"] == 2
+    assert metrics.errors == []
+
+    watcher.poll()
+    watcher.poll()
+    assert metrics.totals["failed_polls"] == 4
+    assert len(metrics.errors) == 1
+
+    # A successful poll ends the run of failures
+    watcher.url = f"{scoreboard()}?limit=1000&dates=2009"
+    result = watcher.poll()
+    assert result["status"] == 200 and result["processed"]
+    assert watcher.failures == 0
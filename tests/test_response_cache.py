@@ -0,0 +1,59 @@
+import extract
+from response_cache import ResponseCache
+
+
+# Fetcher that goes to the stub server and remembers the conditional headers of every request
+class RecordingFetcher:
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, url, headers):
+        self.requests.append(headers)
+        return extract.fetch_url(url, headers=headers, retries=0)
+
+
+def test_final_entry_is_served_without_requests(scoreboard, tmp_path):
+    scoreboard()
+    cache = ResponseCache(str(tmp_path))
+    fetcher = RecordingFetcher()
+    url = extract.build_scoreboard_url(2015)
+
+    status, body = cache.fetch(url, fetcher, final=True)
+    assert status == 200 and body
+    assert cache.fetch(url, fetcher, final=True) == (200, body)
+    assert len(fetcher.requests) == 1
+
+
+def test_entry_within_ttl_is_not_revalidated(scoreboard, tmp_path):
+    scoreboard()
+    cache = ResponseCache(str(tmp_path), ttl=3600)
+    fetcher = RecordingFetcher()
+    url = extract.build_scoreboard_url(2015)
+
+    cache.fetch(url, fetcher)
+    cache.fetch(url, fetcher)
+    assert len(fetcher.requests) == 1
+
+
+def test_non_final_entry_is_revalidated_once_when_year_becomes_final(scoreboard, tmp_path):
+    scoreboard()
+    cache = ResponseCache(str(tmp_path), ttl=3600)
+    fetcher = RecordingFetcher()
+    url = extract.build_scoreboard_url(2015)
+
+    # Cached while the year was still in progress
+    status, body = cache.fetch(url, fetcher, final=False)
+    assert not cache.read_entry(url)["final"]
+
+    # The year is now over: one conditional request (answered 304), then the entry is trusted
+    assert cache.fetch(url, fetcher, final=True) == (200, body)
+    assert cache.fetch(url, fetcher, final=True) == (200, body)
+    assert len(fetcher.requests) == 2
+    assert "If-None-Match" in fetcher.requests[1]
+    assert cache.read_entry(url)["final"]
+    assert cache.revalidated == 1
+
+
+def test_offline_cache_without_entry(tmp_path):
+    cache = ResponseCache(str(tmp_path), offline=True)
+    assert cache.fetch(extract.build_scoreboard_url(2015), RecordingFetcher()) == (None, None)
@@ -0,0 +1,49 @@
+import os
+
+import numpy as np
+
+from snapshot import write_snapshot, load_snapshot, snapshot_to_frame
+
+
+def make_games(count, home_score=7):
+    return [{"game_id": i + 1, "season_year": 2000 + i % 3, "season_type": "regular-season", "week": i % 17 + 1,
+             "home_team": "Bears", "away_team": "Lions", "home_score": home_score, "away_score": "",
+             "round_type": "Regular Season"} for i in range(count)]
+
+
+def test_snapshot_switches_versions_through_a_symlink(tmp_path):
+    output_dir = str(tmp_path / "nfl_snapshot")
+    for home_score in (7, 10, 14):
+        write_snapshot(make_games(5, home_score), output_dir)
+
+    assert os.path.islink(output_dir)
+    columns, meta = load_snapshot(output_dir)
+    assert meta["rows"] == 5
+    assert set(np.asarray(columns["home_score"]).tolist()) == {14}
+
+    # The current and the previous version are kept, older ones are removed
+    versions = [entry for entry in os.listdir(tmp_path) if entry != "nfl_snapshot"]
+    assert len(versions) == 2
+    assert os.readlink(output_dir) in versions
+
+
+def test_snapshot_replaces_an_unversioned_directory(tmp_path):
+    output_dir = tmp_path / "nfl_snapshot"
+    output_dir.mkdir()
+    (output_dir / "meta.json").write_text("{}")
+
+    write_snapshot(make_games(3), str(output_dir))
+    assert os.path.islink(output_dir)
+    assert load_snapshot(str(output_dir))[1]["rows"] == 3
+
+
+def test_snapshot_frame_keeps_columns_as_views(tmp_path):
+    output_dir = str(tmp_path / "nfl_snapshot")
+    write_snapshot(make_games(6), output_dir)
+    columns, meta = load_snapshot(output_dir)
+    frame = snapshot_to_frame(columns, meta)
+
+    for name in ("game_id", "season_year", "home_team_id", "away_team_id"):
+        assert np.shares_memory(frame[name].to_numpy(), columns[name])
+    assert list(frame["home_team"].unique()) == ["Bears"]
+    assert frame["away_score"].isna().all() and (frame["home_score"] == 7).all()